@@ -1,11 +1,20 @@
 """
 OpenAI Agents SDK integration for AI Book Platform.
+Exports load on first access: the Agents SDK is only imported once a
+request actually needs the agent (the RAG fast path never does).
 """
-from app.agents.book_agent import run_book_agent
-from app.agents.tools import search_book, get_chapter_content
-
-__all__ = [
-    "run_book_agent",
-    "search_book",
-    "get_chapter_content",
-]
+import importlib
+
+_EXPORTS = {
+    "run_book_agent": "app.agents.book_agent",
+    "search_book": "app.agents.tools",
+    "get_chapter_content": "app.agents.tools",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,7 +6,6 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from agents import Agent, Runner, function_tool, set_tracing_disabled, ModelSettings
 from agents.run import RunConfig
 from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
@@ -17,7 +16,14 @@ load_dotenv(BACKEND_DIR / ".env")
 
 # Import core components
 from app.core.config import settings
-from app.agents.tools import search_book, get_chapter_content, list_chapters, explain_concept
+from app.agents.tools import search_book, get_chapter_content, list_chapters, explain_concept, load_book_outline
+from app.agents.prompt_cache import PromptCacheClient
+from app.agents.context import BookAgentContext
+from app.agents.hooks import AgentTraceHooks
+from app.core.token_budget import TokenBudget, truncate_to_tokens
+from app.core.metrics import record_llm_usage
+from app.core.timing import span
+from app.infrastructure.llm_client import get_llm_client
 
 
 # ==================== CONFIGURATION ====================
@@ -29,16 +35,9 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", settings.OPENROUTER_API_KEY
 # Examples: openai/gpt-4o, anthropic/claude-3.5-sonnet, google/gemini-2.0-flash-exp, meta-llama/llama-3.1-70b-instruct
 OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", settings.OPENROUTER_MODEL)
 
-# Create AsyncOpenAI client pointing to OpenRouter's API
+# Shared AsyncOpenAI client pointing to OpenRouter's API (goes through the upstream limiter)
 # Reference: https://openrouter.ai/docs
-external_client = AsyncOpenAI(
-    api_key=OPENROUTER_API_KEY,
-    base_url=settings.OPENROUTER_BASE_URL,
-    default_headers={
-        "HTTP-Referer": os.getenv("OPENROUTER_REFERER", "http://localhost:3000"),
-        "X-Title": os.getenv("OPENROUTER_APP_TITLE", "AI Book Assistant"),
-    }
-)
+external_client, _ = get_llm_client("agent", provider="openrouter")
 
 # Create the model using OpenAIChatCompletionsModel for compatibility
 # Set max_tokens low to stay within OpenRouter free tier limits
@@ -89,30 +88,36 @@ BOOK_ASSISTANT_INSTRUCTIONS = """You are an AI-powered learning assistant for an
 """
 
 
+def book_assistant_instructions() -> str:
+    """
+    Instructions plus the book outline: identical bytes on every run.
+
+    Together with the tool schemas this static prefix is about 1.4k tokens,
+    above the 1024-token minimum Anthropic and OpenAI need before they cache.
+    """
+    outline = load_book_outline()
+    if not outline:
+        return BOOK_ASSISTANT_INSTRUCTIONS
+    return f"{BOOK_ASSISTANT_INSTRUCTIONS}\n## Sections by Chapter:\n{outline}\n"
+
+
 def get_book_assistant():
     """Get the Book Assistant Agent with current configuration."""
-    # Recreate the model with current settings
-    from openai import AsyncOpenAI
-    from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-
-    openrouter_client = AsyncOpenAI(
-        api_key=settings.OPENROUTER_API_KEY,
-        base_url=settings.OPENROUTER_BASE_URL,
-        default_headers={
-            "HTTP-Referer": os.getenv("OPENROUTER_REFERER", "http://localhost:3000"),
-            "X-Title": os.getenv("OPENROUTER_APP_TITLE", "AI Book Assistant"),
-        }
-    )
+    # Recreate the model with current settings, reusing the pooled OpenRouter client
+    openrouter_client, openrouter_model = get_llm_client("agent", provider="openrouter")
+    if openrouter_model.startswith("anthropic/"):
+        # Anthropic only caches up to an explicit breakpoint (placed after tools + instructions)
+        openrouter_client = PromptCacheClient(openrouter_client)
 
     current_model = OpenAIChatCompletionsModel(
-        model=settings.OPENROUTER_MODEL,
+        model=openrouter_model,
         openai_client=openrouter_client,
     )
     # Note: max_tokens is controlled via RunConfig
 
     return Agent(
         name="BookAssistant",
-        instructions=BOOK_ASSISTANT_INSTRUCTIONS,
+        instructions=book_assistant_instructions(),
         model=current_model,
         tools=[search_book, get_chapter_content, list_chapters, explain_concept],
     )
@@ -124,6 +129,7 @@ async def run_book_agent(
     chapter_filter: Optional[str] = None,
     user_profile: Optional[Dict[str, Any]] = None,
     conversation_history: Optional[list] = None,
+    conversation_summary: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Run the Book Assistant Agent with a user query.
@@ -134,30 +140,37 @@ async def run_book_agent(
         chapter_filter: Optional chapter to focus on
         user_profile: Optional user profile for personalization
         conversation_history: Optional list of previous messages for memory
+        conversation_summary: Optional rolling summary of turns older than the history
 
     Returns:
-        Dict with answer and metadata
+        Dict with answer, metadata and the run trace
     """
     # Get the current agent with updated configuration
     book_assistant = get_book_assistant()
 
-    # Build conversation context from history
-    context_parts = []
-
-    if conversation_history:
-        # Add previous conversation for memory (limit to last 6 messages to save tokens)
-        recent_history = conversation_history[-6:]
-        history_text = "\n".join([
-            f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content'][:300]}"
-            for msg in recent_history
-        ])
-        context_parts.append(f"Previous conversation:\n{history_text}")
+    # Fit history and selected text into the prompt token budget
+    budget = TokenBudget().allocate(
+        history=conversation_history,
+        selected_text=selected_text,
+    )
 
-    if selected_text:
-        context_parts.append(f"The user has selected this text for context:\n\"{selected_text[:500]}\"")
+    # Prompt layout keeps the cacheable prefix stable across requests:
+    # static instructions + tool schemas (same bytes for everyone), then this
+    # session's summary and history as separate messages, then the per-request turn.
+    input_items = []
+    if conversation_summary:
+        summary = truncate_to_tokens(conversation_summary, settings.CHAT_SUMMARY_MAX_TOKENS)
+        input_items.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+
+    input_items.extend(
+        {
+            "role": "user" if item.payload["role"] == "user" else "assistant",
+            "content": item.text,
+        }
+        for item in budget.history
+    )
 
-    if chapter_filter:
-        context_parts.append(f"Focus on: {chapter_filter}")
+    context_parts = []
 
     if user_profile:
         level = user_profile.get("experience_level", "beginner")
@@ -166,34 +179,63 @@ async def run_book_agent(
         if languages:
             context_parts.append(f"Known languages: {', '.join(languages)}")
 
+    if chapter_filter:
+        context_parts.append(f"Focus on: {chapter_filter}")
+
+    if budget.selected_text:
+        context_parts.append(f"The user has selected this text for context:\n\"{budget.selected_text}\"")
+
     context_parts.append(f"Current question: {query}")
 
-    full_input = "\n\n".join(context_parts)
+    input_items.append({"role": "user", "content": "\n\n".join(context_parts)})
 
-    # Run the agent with token limit to stay within OpenRouter free tier
-    result = await Runner.run(
-        book_assistant,
-        input=full_input,
-        max_turns=5,  # Limit turns to save tokens
-        run_config=RunConfig(
-            model_settings=ModelSettings(max_tokens=600)  # Stay within free tier limits
-        )
-    )
+    # Run-scoped state: memoizes tool results so repeated searches are free
+    run_context = BookAgentContext()
 
-    # Extract tool calls made for transparency
-    tool_calls = []
-    for item in result.raw_responses:
-        if hasattr(item, 'output') and item.output:
-            for output in item.output:
-                if hasattr(output, 'type') and output.type == 'function_call':
-                    tool_calls.append({
-                        "tool": output.name if hasattr(output, 'name') else "unknown",
-                        "status": "completed"
-                    })
+    # Run the agent with token limit to stay within OpenRouter free tier
+    hooks = AgentTraceHooks()
+    try:
+        with span("agent"):
+            result = await Runner.run(
+                book_assistant,
+                input=input_items,
+                context=run_context,
+                max_turns=5,  # Limit turns to save tokens
+                run_config=RunConfig(
+                    model_settings=ModelSettings(max_tokens=600)  # Stay within free tier limits
+                ),
+                hooks=hooks,
+            )
+    finally:
+        # Failed runs (max turns, provider or tool errors) are traced too
+        trace = hooks.finish(run_context.memo.hits_by_call)
+
+    # Tool calls made, for transparency (full timings live in the trace)
+    tool_calls = [
+        {
+            "tool": call.tool,
+            "status": call.status,
+            "memo_hits": call.memo_hits,
+            "duration_ms": call.duration_ms,
+            "arguments_bytes": call.arguments_bytes,
+            "output_bytes": call.output_bytes,
+        }
+        for call in trace.tool_calls
+    ]
+
+    usage = result.context_wrapper.usage
+    usage_summary = {
+        "prompt_tokens": usage.input_tokens,
+        "completion_tokens": usage.output_tokens,
+        "cached_tokens": usage.input_tokens_details.cached_tokens or 0,
+    }
+    record_llm_usage("agent", usage_summary)
 
     return {
         "answer": result.final_output,
         "tool_calls": tool_calls,
         "model": settings.OPENROUTER_MODEL,
         "agent": "BookAssistant",
+        "usage": usage_summary,
+        "trace": trace.to_dict(),
     }
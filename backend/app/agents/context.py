@@ -0,0 +1,80 @@
+"""
+Run-scoped context shared by the Book Assistant tools.
+An instance is passed to Runner.run and reaches every tool through RunContextWrapper.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+MemoKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def normalize_args(args: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """Normalize tool arguments so equivalent calls share a memo key."""
+    normalized = []
+    for name, value in sorted(args.items()):
+        if isinstance(value, str):
+            value = " ".join(value.casefold().split())
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+class ToolMemo:
+    """Memoizes tool results for the lifetime of a single agent run."""
+
+    def __init__(self):
+        self._results: Dict[MemoKey, Any] = {}
+        self._key_locks: Dict[MemoKey, threading.Lock] = {}
+        self._lock = threading.Lock()  # Sync tools run in worker threads
+        self.hits_by_call: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        compute: Callable[[], T],
+        call_id: Optional[str] = None,
+    ) -> T:
+        """
+        Return the memoized result for (tool_name, args), computing it once.
+
+        Args:
+            tool_name: Name of the tool whose result is cached
+            args: Tool arguments, including defaults
+            compute: Zero-argument callable producing the result on a miss
+            call_id: Tool call that triggered the lookup, for hit attribution
+        """
+        key = (tool_name, normalize_args(args))
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent callers of the same key wait for the first one
+        with key_lock:
+            with self._lock:
+                if key in self._results:
+                    self.hits += 1
+                    if call_id:
+                        self.hits_by_call[call_id] = self.hits_by_call.get(call_id, 0) + 1
+                    metrics.inc("agent_tool_memo_total", tool=tool_name, result="hit")
+                    return self._results[key]
+
+            result = compute()
+
+            with self._lock:
+                self._results[key] = result
+                self.misses += 1
+            metrics.inc("agent_tool_memo_total", tool=tool_name, result="miss")
+            return result
+
+
+@dataclass
+class BookAgentContext:
+    """Per-run state for the Book Assistant Agent."""
+
+    memo: ToolMemo = field(default_factory=ToolMemo)
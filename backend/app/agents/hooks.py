@@ -0,0 +1,136 @@
+"""
+Run hooks for the Book Assistant.
+Builds a per-run trace (LLM turn latency and tokens, tool timings and sizes),
+feeds tool spans into the request's Server-Timing breakdown and aggregates
+the trace into metrics.
+"""
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from agents import RunHooks
+
+from app.core.metrics import metrics
+from app.core.timing import record_span
+
+# Tool argument/output sizes in bytes
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536)
+TURN_BUCKETS = (1, 2, 3, 4, 5, 8)
+
+
+@dataclass
+class LLMTurnTrace:
+    """One model call of an agent run."""
+    turn: int
+    latency_ms: float
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+
+
+@dataclass
+class ToolCallTrace:
+    """One tool invocation of an agent run."""
+    tool: str
+    call_id: Optional[str]
+    turn: int
+    arguments_bytes: int
+    duration_ms: float = 0.0
+    output_bytes: int = 0
+    memo_hits: int = 0
+    status: str = "running"
+
+
+@dataclass
+class AgentTrace:
+    """Everything the hooks observed during one Runner.run."""
+    turns: int = 0
+    duration_ms: float = 0.0
+    llm_turns: List[LLMTurnTrace] = field(default_factory=list)
+    tool_calls: List[ToolCallTrace] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _utf8_len(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(value.encode("utf-8") if isinstance(value, str) else str(value).encode("utf-8"))
+
+
+class AgentTraceHooks(RunHooks):
+    """Collects an AgentTrace; pass to Runner.run(hooks=...)."""
+
+    def __init__(self):
+        self.trace = AgentTrace()
+        self._started = time.perf_counter()
+        self._llm_started: Optional[float] = None
+        self._tool_started: Dict[str, tuple] = {}
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self._llm_started = time.perf_counter()
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        started, self._llm_started = self._llm_started, None
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "input_tokens_details", None)
+        self.trace.turns += 1
+        self.trace.llm_turns.append(LLMTurnTrace(
+            turn=self.trace.turns,
+            latency_ms=round((time.perf_counter() - started) * 1000, 1) if started else 0.0,
+            prompt_tokens=getattr(usage, "input_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cached_tokens=(getattr(details, "cached_tokens", 0) or 0) if details else 0,
+        ))
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        # Tool hooks get a ToolContext carrying the call ID; parallel calls of one tool stay apart
+        call_id = getattr(context, "tool_call_id", None)
+        record = ToolCallTrace(
+            tool=tool.name,
+            call_id=call_id,
+            turn=self.trace.turns,
+            arguments_bytes=_utf8_len(getattr(context, "tool_arguments", None)),
+        )
+        self.trace.tool_calls.append(record)
+        self._tool_started[call_id or tool.name] = (time.perf_counter(), record)
+
+    async def on_tool_end(self, context, agent, tool, result: Any) -> None:
+        call_id = getattr(context, "tool_call_id", None)
+        started, record = self._tool_started.pop(call_id or tool.name, (None, None))
+        if record is None:
+            return
+        duration = time.perf_counter() - started
+        record.duration_ms = round(duration * 1000, 1)
+        record.output_bytes = _utf8_len(result)
+        record.status = "completed"
+        record_span(f"tool_{tool.name}", duration)
+
+    def finish(self, memo_hits_by_call: Optional[Dict[str, int]] = None) -> AgentTrace:
+        """Close the trace, attribute memo hits and record it into metrics; safe after a failed run."""
+        self.trace.duration_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        for record in self.trace.tool_calls:
+            if memo_hits_by_call and record.call_id:
+                record.memo_hits = memo_hits_by_call.get(record.call_id, 0)
+            if record.status == "running":
+                # The run ended (raised) before this tool returned
+                record.status = "error"
+        record_trace_metrics(self.trace)
+        return self.trace
+
+
+def record_trace_metrics(trace: AgentTrace):
+    """Aggregate a run's trace into per-turn and per-tool metrics."""
+    metrics.observe("agent_run_turns", trace.turns, buckets=TURN_BUCKETS)
+    metrics.observe("agent_run_seconds", trace.duration_ms / 1000)
+    for turn in trace.llm_turns:
+        # Turn index is bounded by max_turns, so it is safe as a label
+        metrics.observe("agent_llm_turn_seconds", turn.latency_ms / 1000, turn=turn.turn)
+        metrics.inc("agent_llm_turn_tokens_total", turn.prompt_tokens, turn=turn.turn, kind="prompt")
+        metrics.inc("agent_llm_turn_tokens_total", turn.completion_tokens, turn=turn.turn, kind="completion")
+    for call in trace.tool_calls:
+        metrics.inc("agent_tool_calls_total", tool=call.tool, status=call.status)
+        metrics.observe("agent_tool_seconds", call.duration_ms / 1000, tool=call.tool)
+        metrics.observe("agent_tool_arguments_bytes", call.arguments_bytes, buckets=SIZE_BUCKETS, tool=call.tool)
+        metrics.observe("agent_tool_output_bytes", call.output_bytes, buckets=SIZE_BUCKETS, tool=call.tool)
@@ -0,0 +1,63 @@
+"""
+Anthropic prompt-cache breakpoint for agent runs.
+Anthropic models behind OpenRouter only cache a prompt prefix that ends in an
+explicit cache_control marker. The Agents SDK sends the instructions as a plain
+system string, so this client wrapper turns that first system message into a
+text part carrying the marker. Tool schemas come before the system prompt in
+Anthropic's cache order, so the cached prefix covers tools plus instructions.
+"""
+from typing import Any, Dict, List
+
+CACHE_BREAKPOINT = {"type": "ephemeral"}
+
+
+def with_cache_breakpoint(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy of messages whose leading system prompt ends the cached prefix."""
+    if not messages or messages[0].get("role") != "system" or not isinstance(messages[0].get("content"), str):
+        return messages
+    system = {
+        **messages[0],
+        "content": [{"type": "text", "text": messages[0]["content"], "cache_control": CACHE_BREAKPOINT}],
+    }
+    return [system, *messages[1:]]
+
+
+class _Completions:
+    def __init__(self, completions):
+        self._completions = completions
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+    async def create(self, **kwargs):
+        kwargs["messages"] = with_cache_breakpoint(list(kwargs["messages"]))
+        return await self._completions.create(**kwargs)
+
+
+class _Chat:
+    def __init__(self, chat):
+        self._chat = chat
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+    @property
+    def completions(self):
+        return _Completions(self._chat.completions)
+
+
+class PromptCacheClient:
+    """AsyncOpenAI wrapper adding the cache breakpoint to every chat completion."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    @property
+    def chat(self):
+        return _Chat(self._client.chat)
+
+    def with_options(self, **options):
+        return PromptCacheClient(self._client.with_options(**options))
@@ -0,0 +1,174 @@
+"""
+Query router that sends simple lookups to the single-shot RAG path.
+Multi-step or conversational requests still go through the Book Assistant Agent.
+"""
+import re
+import time
+from typing import Optional, Dict, Any, List
+
+from openai import RateLimitError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+AGENT_ROUTE = "agent"
+RAG_ROUTE = "rag"
+
+# Plain factual lookups a single retrieval + completion can answer
+SIMPLE_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in [
+        r"^(what|who|when|where|which)\s+(is|are|was|were|does|do)\b",
+        r"^what'?s\b",
+        r"^(define|definition of)\b",
+        r"^(explain|describe)\s+(what|the|a|an)\b",
+        r"\bmeaning of\b",
+        r"\bstand for\b",
+    ]
+]
+
+# Requests that need tools, planning or several retrieval steps
+COMPLEX_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in [
+        r"\blearning path\b",
+        r"\b(study|learning) plan\b",
+        r"\broadmap\b",
+        r"\bcompare\b",
+        r"\bdifference(s)? between\b",
+        r"\bvs\.?\b|\bversus\b",
+        r"\bstep[- ]by[- ]step\b",
+        r"\b(list|show|which) (all )?(the )?chapters\b",
+        r"\bchapters?\s+(\d|one|two|three|four|five|six)\b.*\band\b",
+        r"\b(write|implement|build|debug|fix|refactor)\b",
+        r"\bexercises?\b",
+        r"\bsummari[sz]e\b",
+    ]
+]
+
+# Follow-ups that only make sense with the previous conversation
+FOLLOW_UP_PATTERN = re.compile(
+    r"\b(it|this|that|these|those|they|them|above|previous|earlier|again|more)\b",
+    re.IGNORECASE,
+)
+
+MAX_SIMPLE_WORDS = 25
+
+
+def _question_text(query: str) -> str:
+    """Strip the selected-text preamble the chat widget prepends to queries."""
+    if query.lstrip().lower().startswith("regarding this text:"):
+        return query.strip().split("\n\n")[-1]
+    return query.strip()
+
+
+def classify_query(
+    query: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """
+    Classify a chat query as a simple lookup or a complex request.
+
+    Args:
+        query: The user's question
+        conversation_history: Previous messages, if any
+
+    Returns:
+        RAG_ROUTE for single-shot lookups, AGENT_ROUTE otherwise
+    """
+    if not settings.QUERY_ROUTER_ENABLED:
+        return AGENT_ROUTE
+
+    text = _question_text(query)
+    if not text:
+        return AGENT_ROUTE
+
+    if len(text.split()) > MAX_SIMPLE_WORDS or text.count("?") > 1:
+        return AGENT_ROUTE
+
+    if any(p.search(text) for p in COMPLEX_PATTERNS):
+        return AGENT_ROUTE
+
+    if conversation_history and FOLLOW_UP_PATTERN.search(text):
+        return AGENT_ROUTE
+
+    if any(p.search(text) for p in SIMPLE_PATTERNS):
+        return RAG_ROUTE
+
+    return AGENT_ROUTE
+
+
+def _record_route(route: str, started: float, usage: Optional[Dict[str, int]]):
+    """Record per-route latency and token counts."""
+    metrics.inc("chat_route_requests_total", route=route)
+    metrics.observe("chat_route_latency_seconds", time.perf_counter() - started, route=route)
+    if usage:
+        metrics.inc("chat_route_tokens_total", usage.get("prompt_tokens", 0), route=route, kind="prompt")
+        metrics.inc("chat_route_tokens_total", usage.get("completion_tokens", 0), route=route, kind="completion")
+
+
+async def answer_query(
+    query: str,
+    selected_text: Optional[str] = None,
+    chapter_filter: Optional[str] = None,
+    user_profile: Optional[Dict[str, Any]] = None,
+    conversation_history: Optional[list] = None,
+    conversation_summary: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Answer a chat query via the cheapest path that can handle it.
+
+    Simple lookups use RAGService.query (one embedding, one search, one completion).
+    Everything else, and any fast-path miss, runs the Book Assistant Agent.
+
+    Returns:
+        Dict in the run_book_agent shape, plus "route" and "citations"
+    """
+    route = classify_query(query, conversation_history)
+
+    if route == RAG_ROUTE:
+        from app.services.rag_service import rag_service
+
+        started = time.perf_counter()
+        try:
+            result = await rag_service.query(
+                query=query,
+                selected_text=selected_text,
+                chapter_filter=chapter_filter,
+                user_profile=user_profile,
+            )
+        except RateLimitError:
+            raise  # The agent would hit the same saturated upstream
+        except Exception as e:
+            print(f"Fast path failed, falling back to agent: {e}")
+            metrics.inc("chat_route_fallbacks_total", reason="error")
+        else:
+            if result.get("citations"):
+                _record_route(RAG_ROUTE, started, result.get("usage"))
+                return {
+                    "answer": result["answer"],
+                    "tool_calls": [],
+                    "citations": result["citations"],
+                    "model": result.get("model", "unknown"),
+                    "agent": "RAGService",
+                    "route": RAG_ROUTE,
+                    "usage": result.get("usage"),
+                }
+            # Nothing retrieved: let the agent decide how to answer
+            metrics.inc("chat_route_fallbacks_total", reason="no_context")
+
+    from app.agents.book_agent import run_book_agent
+
+    started = time.perf_counter()
+    result = await run_book_agent(
+        query=query,
+        selected_text=selected_text,
+        chapter_filter=chapter_filter,
+        user_profile=user_profile,
+        conversation_history=conversation_history,
+        conversation_summary=conversation_summary,
+    )
+    _record_route(AGENT_ROUTE, started, result.get("usage"))
+    result["route"] = AGENT_ROUTE
+    return result
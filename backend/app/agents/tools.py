@@ -2,30 +2,72 @@
 Function tools for the Book Assistant Agent with enhanced context management.
 """
 import asyncio
-from typing import Optional, List, Dict, Any
-from agents import function_tool
-
-import cohere
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable
+from agents import function_tool, RunContextWrapper
 
 from app.core.config import settings
+from app.core.metrics import upstream_call
+from app.agents.context import BookAgentContext
+from app.core.token_budget import TokenBudget, truncate_to_tokens
+from app.infrastructure.vector_store import chapter_filter as qdrant_chapter_filter
+from app.services.embedding_service import embedding_service
 
-
-# Initialize Cohere client for embeddings
-cohere_client = cohere.Client(api_key=settings.COHERE_API_KEY)
+# Sync Qdrant client for the tools (they run in worker threads), built on first search
+_qdrant = None
 
 
 def get_embedding(text: str) -> List[float]:
-    """Get embedding for text using Cohere."""
-    response = cohere_client.embed(
-        texts=[text],
-        model=settings.COHERE_EMBEDDING_MODEL,
-        input_type="search_query",
-    )
+    """Get embedding for text using Cohere (shares the embedding service's client)."""
+    with upstream_call("cohere_embed", "agent"):
+        response = embedding_service.client.embed(
+            texts=[text],
+            model=settings.COHERE_EMBEDDING_MODEL,
+            input_type="search_query",
+        )
     return response.embeddings[0]
 
 
+def _memoized(
+    ctx: RunContextWrapper[BookAgentContext],
+    tool_name: str,
+    args: Dict[str, Any],
+    compute: Callable[[], str],
+) -> str:
+    """Serve a tool result from the run-scoped memo when the run provides one."""
+    context = getattr(ctx, "context", None)
+    if not isinstance(context, BookAgentContext):
+        return compute()
+    return context.memo.get_or_compute(
+        tool_name,
+        args,
+        compute,
+        call_id=getattr(ctx, "tool_call_id", None),
+    )
+
+
+def _cached_search(
+    ctx: RunContextWrapper[BookAgentContext],
+    query: str,
+    chapter_filter: Optional[str] = None,
+    context_window: int = 5,
+) -> str:
+    """Run search_book through the memo so nested and direct calls share results."""
+    return _memoized(
+        ctx,
+        "search_book",
+        {"query": query, "chapter_filter": chapter_filter, "context_window": context_window},
+        lambda: _search_book(query, chapter_filter, context_window),
+    )
+
+
 @function_tool
-def search_book(query: str, chapter_filter: Optional[str] = None, context_window: int = 5) -> str:
+def search_book(
+    ctx: RunContextWrapper[BookAgentContext],
+    query: str,
+    chapter_filter: Optional[str] = None,
+    context_window: int = 5,
+) -> str:
     """
     Search the book content using semantic search with enhanced context management.
 
@@ -37,63 +79,72 @@ def search_book(query: str, chapter_filter: Optional[str] = None, context_window
     Returns:
         Relevant excerpts from the book with source information and context
     """
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import Filter, FieldCondition, MatchValue
+    return _cached_search(ctx, query, chapter_filter, context_window)
 
-    # Initialize Qdrant client
-    client = QdrantClient(
-        url=settings.QDRANT_URL,
-        api_key=settings.QDRANT_API_KEY,
-    )
 
-    # Get query embedding
-    query_embedding = get_embedding(query)
+def get_qdrant_client():
+    """Shared sync Qdrant client for the tools, built on first use."""
+    global _qdrant
+    if _qdrant is None:
+        from qdrant_client import QdrantClient
 
-    # Build filter if chapter specified
-    search_filter = None
-    if chapter_filter:
-        search_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="chapter_id",
-                    match=MatchValue(value=chapter_filter)
-                )
-            ]
+        _qdrant = QdrantClient(
+            url=settings.QDRANT_URL,
+            api_key=settings.QDRANT_API_KEY,
         )
+    return _qdrant
+
+
+def _vector_search(query_embedding: List[float], chapter_filter: Optional[str], limit: int) -> list:
+    """Search Qdrant for the nearest book chunks (hits expose .payload and .score)."""
+    # Build filter if chapter specified
+    search_filter = qdrant_chapter_filter(chapter_filter) if chapter_filter else None
 
     # Search Qdrant
-    results = client.search(
-        collection_name=settings.QDRANT_COLLECTION,
-        query_vector=query_embedding,
-        limit=context_window,
-        query_filter=search_filter,
-    )
+    with upstream_call("qdrant_search", "agent"):
+        return get_qdrant_client().search(
+            collection_name=settings.QDRANT_COLLECTION,
+            query_vector=query_embedding,
+            limit=limit,
+            query_filter=search_filter,
+        )
+
+
+def _search_book(query: str, chapter_filter: Optional[str], context_window: int) -> str:
+    """Embed the query, search Qdrant and format the hits."""
+    query_embedding = get_embedding(query)
+    results = _vector_search(query_embedding, chapter_filter, context_window)
 
     if not results:
         return "No relevant content found in the book for this query."
 
+    # Keep the best hits that fit the retrieval share of the prompt budget
+    retrieval_tokens = settings.PROMPT_CONTEXT_TOKEN_BUDGET * settings.PROMPT_BUDGET_RETRIEVED_SHARE
+    allocation = TokenBudget(total_tokens=retrieval_tokens).allocate(
+        retrieved=[((r.payload or {}).get("text", ""), r.score, r) for r in results]
+    )
+
     # Format results with enhanced context
     formatted_results = []
-    for i, result in enumerate(results, 1):
-        payload = result.payload or {}
-        text = payload.get("text", "")
+    for i, item in enumerate(allocation.retrieved, 1):
+        payload = item.payload.payload or {}
         chapter = payload.get("chapter_id", "unknown")
-        source = payload.get("source", "Book Content")
-        score = result.score
+        score = item.score
         page_number = payload.get("page_number", "N/A")
 
         # Enhanced context with page numbers and more metadata
-        formatted_result = (
-            f"[{i}] (Chapter: {chapter}, Page: {page_number}, Relevance: {score:.2f})\n"
-            f"{text[:500]}..." if len(text) > 500 else f"[{i}] (Chapter: {chapter}, Page: {page_number}, Relevance: {score:.2f})\n{text}"
-        )
+        formatted_result = f"[{i}] (Chapter: {chapter}, Page: {page_number}, Relevance: {score:.2f})\n{item.text}"
         formatted_results.append(formatted_result)
 
     return "\n\n---\n\n".join(formatted_results)
 
 
 @function_tool
-def get_chapter_content(chapter_id: str, include_context: bool = True) -> str:
+def get_chapter_content(
+    ctx: RunContextWrapper[BookAgentContext],
+    chapter_id: str,
+    include_context: bool = True,
+) -> str:
     """
     Get the full content of a specific chapter with enhanced context management.
 
@@ -104,20 +155,62 @@ def get_chapter_content(chapter_id: str, include_context: bool = True) -> str:
     Returns:
         The chapter content or an error message if not found
     """
-    import os
-
-    # Map chapter_id to file path
-    docs_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-        "..", "frontend", "docs", chapter_id
+    return _memoized(
+        ctx,
+        "get_chapter_content",
+        {"chapter_id": chapter_id, "include_context": include_context},
+        lambda: _get_chapter_content(chapter_id, include_context),
     )
 
-    overview_path = os.path.join(docs_path, "overview.mdx")
 
-    if os.path.exists(overview_path):
-        with open(overview_path, "r", encoding="utf-8") as f:
-            content = f.read()
+# Chapter overviews from the frontend docs, read once per process (see load_chapter_index)
+DOCS_DIR = Path(__file__).resolve().parents[3] / "frontend" / "docs"
+_chapter_index: Optional[Dict[str, str]] = None
+
 
+def load_chapter_index() -> Dict[str, str]:
+    """Map chapter IDs to their overview.mdx text, reading the docs on first call."""
+    global _chapter_index
+    if _chapter_index is None:
+        _chapter_index = {
+            path.parent.name: path.read_text(encoding="utf-8")
+            for path in sorted(DOCS_DIR.glob("*/overview.mdx"))
+        }
+    return _chapter_index
+
+
+# Pages whose section headings make up the book outline in the agent instructions
+OUTLINE_PAGES = ("concepts", "examples")
+_book_outline: Optional[str] = None
+
+
+def load_book_outline() -> str:
+    """Section headings of each chapter's concepts and examples pages, read on first call."""
+    global _book_outline
+    if _book_outline is None:
+        lines = []
+        for chapter_dir in sorted(DOCS_DIR.glob("chapter-*")):
+            for page in OUTLINE_PAGES:
+                path = chapter_dir / f"{page}.mdx"
+                if not path.exists():
+                    continue
+                headings, in_code = [], False
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    if line.startswith("```"):
+                        in_code = not in_code  # "# ..." inside code blocks are comments
+                    elif not in_code and line.startswith("## "):
+                        headings.append(line[3:].strip())
+                if headings:
+                    lines.append(f"- {chapter_dir.name} {page}: {'; '.join(headings)}")
+        _book_outline = "\n".join(lines)
+    return _book_outline
+
+
+def _get_chapter_content(chapter_id: str, include_context: bool) -> str:
+    """Format a chapter overview from the frontend docs."""
+    content = load_chapter_index().get(chapter_id)
+
+    if content is not None:
         # Enhanced context with chapter summary
         chapter_info = {
             "chapter-1": {"title": "AI Foundations", "objectives": ["Understand AI history", "Learn types of AI", "Grasp ML basics"]},
@@ -129,6 +222,7 @@ def get_chapter_content(chapter_id: str, include_context: bool = True) -> str:
         }
 
         chapter_details = chapter_info.get(chapter_id, {"title": chapter_id, "objectives": []})
+        excerpt = truncate_to_tokens(content, settings.CHAPTER_CONTENT_TOKEN_LIMIT)
 
         if include_context:
             context_section = f"Learning Objectives for {chapter_details['title']}:\n"
@@ -136,9 +230,9 @@ def get_chapter_content(chapter_id: str, include_context: bool = True) -> str:
                 context_section += f"- {obj}\n"
             context_section += "\n"
 
-            return f"{context_section}Chapter Overview for {chapter_id} ({chapter_details['title']}):\n\n{content[:2000]}..."
+            return f"{context_section}Chapter Overview for {chapter_id} ({chapter_details['title']}):\n\n{excerpt}"
         else:
-            return f"Chapter Overview for {chapter_id} ({chapter_details['title']}):\n\n{content[:2000]}..."
+            return f"Chapter Overview for {chapter_id} ({chapter_details['title']}):\n\n{excerpt}"
 
     return f"Chapter {chapter_id} not found. Available chapters: chapter-1 through chapter-6."
 
@@ -200,7 +294,12 @@ def list_chapters() -> str:
 
 
 @function_tool
-def explain_concept(concept: str, experience_level: str = "beginner", include_examples: bool = True) -> str:
+def explain_concept(
+    ctx: RunContextWrapper[BookAgentContext],
+    concept: str,
+    experience_level: str = "beginner",
+    include_examples: bool = True,
+) -> str:
     """
     Get a detailed explanation of a concept adapted to the user's level with examples.
 
@@ -212,8 +311,8 @@ def explain_concept(concept: str, experience_level: str = "beginner", include_ex
     Returns:
         An explanation tailored to the user's experience level with examples
     """
-    # First search for the concept
-    search_results = search_book.func(query=concept)
+    # First search for the concept (shared with direct search_book calls this run)
+    search_results = _cached_search(ctx, concept)
 
     level_context = {
         "beginner": {
@@ -249,7 +348,11 @@ def explain_concept(concept: str, experience_level: str = "beginner", include_ex
 
 
 @function_tool
-def get_learning_path(topic: str, experience_level: str = "beginner") -> str:
+def get_learning_path(
+    ctx: RunContextWrapper[BookAgentContext],
+    topic: str,
+    experience_level: str = "beginner",
+) -> str:
     """
     Generate a personalized learning path for a specific topic based on experience level.
 
@@ -261,7 +364,7 @@ def get_learning_path(topic: str, experience_level: str = "beginner") -> str:
         A structured learning path with recommended chapters and sequence
     """
     # Search for relevant content first
-    search_results = search_book.func(query=topic)
+    search_results = _cached_search(ctx, topic)
 
     # Define learning paths based on experience level
     learning_paths = {
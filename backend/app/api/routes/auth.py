@@ -1,24 +1,46 @@
 """
 Authentication API routes.
 """
-from datetime import timedelta
+import uuid
+from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.responses import ORJSONResponse
+from app.core.security import (
+    PASSWORD_HASH_BUSY_RETRY_AFTER_SECONDS,
+    PasswordHasherBusy,
+    create_access_token,
+    get_password_hash,
+    verify_password,
+)
 from app.core.deps import get_current_user
+from app.core.user_cache import invalidate_user
 from app.infrastructure.database import get_db
-from app.models.user import User, UserProfile
+from app.models.user import ExperienceLevel, HardwareTier, User, UserProfile
 from app.schemas.auth import UserCreate, UserLogin, UserResponse, ProfileUpdate, ProfileResponse
 
 router = APIRouter()
 
 
+async def _hash_or_busy(operation):
+    """Await a password hash/verify, turning a full hashing queue into a 503."""
+    try:
+        return await operation
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please try again shortly",
+            headers={"Retry-After": str(PASSWORD_HASH_BUSY_RETRY_AFTER_SECONDS)},
+        )
+
+
 def user_to_response(user: User) -> dict:
     """Convert User ORM object to response dict (avoids async serialization issues)."""
     profile_data = None
@@ -38,6 +60,43 @@ def user_to_response(user: User) -> dict:
     }
 
 
+def _column_values(obj) -> dict:
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+
+
+async def _insert_user_with_profile(db: AsyncSession, user: User):
+    """
+    Insert a fully populated, transient user and its profile.
+
+    On PostgreSQL this is a single statement: the profile INSERT selects the
+    user ID from a data-modifying CTE. Other databases (SQLite in tests) get
+    two INSERTs in the same transaction.
+    """
+    user_values = _column_values(user)
+    profile_values = _column_values(user.profile)
+
+    if db.bind.dialect.name != "postgresql":
+        await db.execute(insert(User).values(**user_values))
+        await db.execute(insert(UserProfile).values(**profile_values))
+        return
+
+    new_user = insert(User).values(**user_values).returning(User.id).cte("new_user")
+    profile_columns = UserProfile.__table__.c
+    statement = (
+        insert(UserProfile)
+        .from_select(
+            list(profile_values),
+            select(*[
+                new_user.c.id if key == "user_id" else literal(value, profile_columns[key].type)
+                for key, value in profile_values.items()
+            ]),
+        )
+        .add_cte(new_user)
+        .returning(UserProfile.user_id)
+    )
+    (await db.execute(statement)).scalar_one()
+
+
 @router.post("/signup", response_model=UserResponse)
 async def signup(
     user_data: UserCreate,
@@ -45,37 +104,39 @@ async def signup(
     db: AsyncSession = Depends(get_db),
 ):
     """Register a new user."""
-    # Check if user exists
-    result = await db.execute(
-        select(User).where(User.email == user_data.email)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+    # Hash before touching the database so no connection is held while bcrypt runs
+    hashed_password = await _hash_or_busy(get_password_hash(user_data.password))
 
-    # Create user
+    now = datetime.utcnow()
     user = User(
+        id=str(uuid.uuid4()),
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         name=user_data.name,
+        created_at=now,
+        updated_at=now,
     )
-    db.add(user)
-    await db.flush()
-
-    # Create default profile
-    profile = UserProfile(user_id=user.id)
-    db.add(profile)
-    await db.commit()
-
-    # Reload user with profile
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.profile))
-        .where(User.id == user.id)
+    user.profile = UserProfile(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        experience_level=ExperienceLevel.BEGINNER,
+        known_languages=[],
+        hardware_tier=HardwareTier.MEDIUM,
+        goals=[],
+        created_at=now,
+        updated_at=now,
     )
-    user = result.scalar_one()
+
+    # The unique email constraint replaces an existence pre-check
+    try:
+        await _insert_user_with_profile(db, user)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     # Set access token cookie
     access_token = create_access_token(
@@ -109,8 +170,10 @@ async def signin(
         .where(User.email == user_data.email)
     )
     user = result.scalar_one_or_none()
+    # Release the connection while bcrypt runs
+    await db.commit()
 
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    if not user or not await _hash_or_busy(verify_password(user_data.password, user.hashed_password)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -134,14 +197,14 @@ async def signin(
     return user_to_response(user)
 
 
-@router.post("/signout")
+@router.post("/signout", response_class=ORJSONResponse)
 async def signout(response: Response):
     """Sign out a user."""
     response.delete_cookie(key="access_token")
     return {"message": "Signed out successfully"}
 
 
-@router.get("/me")
+@router.get("/me", response_class=ORJSONResponse)
 async def get_me(
     user: Optional[User] = Depends(get_current_user),
 ):
@@ -186,6 +249,7 @@ async def update_profile(
         profile.goals = profile_data.goals
 
     await db.commit()
+    await invalidate_user(user.id)
 
     # Reload user with updated profile
     result = await db.execute(
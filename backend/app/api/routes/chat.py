@@ -2,21 +2,29 @@
 Chat API routes for RAG-powered Q&A using OpenAI Agents SDK.
 Includes persistent chat history support.
 """
-from typing import Optional, List
+import uuid
+from typing import Optional, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, select
+from sqlalchemy.orm import load_only
 
 from app.core.deps import get_current_user, get_current_user_required
+from app.core.pagination import InvalidCursor, before_cursor, encode_cursor
+from app.core.responses import ORJSONResponse
+from app.infrastructure import llm_client
 from app.infrastructure.database import get_db
+from app.infrastructure.llm_limiter import UPSTREAM_BUSY_RETRY_AFTER_SECONDS
 from app.models.user import User
 from app.models.chat import ChatSession, ChatMessage as ChatMessageModel, MessageRole
+from app.services.chat_history_service import chat_history_service
+from app.services.summary_service import summary_service
 from app.schemas.chat import (
     ChatRequest, ChatResponse, Citation,
-    ChatSessionCreate, ChatSessionResponse, ChatSessionDetail, ChatMessageResponse
+    ChatSessionCreate, ChatSessionResponse, ChatSessionDetail, ChatMessageResponse,
+    ChatMessagePage, ChatSessionPage, ChatSessionBulkDelete,
 )
 
 router = APIRouter()
@@ -27,9 +35,12 @@ class AgentChatResponse(BaseModel):
     """Response from the agent-based chat."""
     answer: str
     tool_calls: List[dict] = []
+    citations: List[Citation] = []
     model: str
     agent: str
+    route: Optional[str] = None  # "rag" (fast path) or "agent"
     session_id: Optional[str] = None  # Return session ID for persistence
+    trace: Optional[dict] = None  # Agent run trace, only when the request sets include_trace
 
 
 # ==================== SESSION MANAGEMENT ====================
@@ -58,41 +69,52 @@ async def create_session(
     )
 
 
-@router.get("/sessions", response_model=List[ChatSessionResponse])
+@router.get("/sessions", response_model=ChatSessionPage)
 async def list_sessions(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user_required),
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
 ):
-    """List all chat sessions for the current user."""
-    # Get sessions with message count
-    result = await db.execute(
-        select(
-            ChatSession,
-            func.count(ChatMessageModel.id).label("message_count")
-        )
-        .outerjoin(ChatMessageModel)
+    """
+    List the current user's chat sessions, most recently updated first.
+
+    Keyset-paginated on (updated_at, id): when more sessions exist,
+    next_cursor loads the next page.
+    """
+    # Counters are denormalized onto the session row; the summary text is never needed here
+    query = (
+        select(ChatSession)
+        .options(load_only(
+            ChatSession.id, ChatSession.title, ChatSession.created_at, ChatSession.updated_at,
+            ChatSession.message_count, ChatSession.last_message_at,
+        ))
         .where(ChatSession.user_id == user.id)
-        .group_by(ChatSession.id)
-        .order_by(ChatSession.updated_at.desc())
-        .limit(limit)
-        .offset(offset)
     )
+    if cursor:
+        query = query.where(_parse_cursor(ChatSession.updated_at, ChatSession.id, cursor))
+    result = await db.execute(
+        query
+        .order_by(ChatSession.updated_at.desc(), ChatSession.id.desc())
+        .limit(limit + 1)
+    )
+    page = list(result.scalars().all())
+    has_more = len(page) > limit
+    page = page[:limit]
 
-    sessions = []
-    for row in result.all():
-        session = row[0]
-        count = row[1]
-        sessions.append(ChatSessionResponse(
+    sessions = [
+        ChatSessionResponse(
             id=session.id,
             title=session.title,
             created_at=session.created_at,
             updated_at=session.updated_at,
-            message_count=count
-        ))
-
-    return sessions
+            message_count=session.message_count,
+            last_message_at=session.last_message_at,
+        )
+        for session in page
+    ]
+    next_cursor = encode_cursor(page[-1].updated_at, page[-1].id) if has_more else None
+    return ChatSessionPage(sessions=sessions, next_cursor=next_cursor)
 
 
 @router.get("/sessions/{session_id}", response_model=ChatSessionDetail)
@@ -100,63 +122,132 @@ async def get_session(
     session_id: str,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user_required),
+    limit: int = Query(50, ge=1, le=200),
 ):
-    """Get a chat session with all messages."""
-    result = await db.execute(
-        select(ChatSession)
-        .options(selectinload(ChatSession.messages))
-        .where(ChatSession.id == session_id, ChatSession.user_id == user.id)
-    )
-    session = result.scalar_one_or_none()
-
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    """Get a chat session with its latest messages (older ones via /messages)."""
+    session = await _get_owned_session(db, session_id, user)
+    messages, next_cursor = await _message_page(db, session.id, limit)
 
     return ChatSessionDetail(
         id=session.id,
         title=session.title,
         created_at=session.created_at,
         updated_at=session.updated_at,
-        messages=[
-            ChatMessageResponse(
-                id=msg.id,
-                role=msg.role.value,
-                content=msg.content,
-                model=msg.model,
-                created_at=msg.created_at
-            )
-            for msg in session.messages
-        ]
+        messages=messages,
+        next_cursor=next_cursor,
     )
 
 
-@router.delete("/sessions/{session_id}")
-async def delete_session(
+@router.get("/sessions/{session_id}/messages", response_model=ChatMessagePage)
+async def list_messages(
     session_id: str,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user_required),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
 ):
-    """Delete a chat session."""
+    """
+    Page backwards through a session's messages.
+
+    Each page is returned oldest first; next_cursor loads the page before it.
+    """
+    session = await _get_owned_session(db, session_id, user)
+    messages, next_cursor = await _message_page(db, session.id, limit, cursor)
+    return ChatMessagePage(messages=messages, next_cursor=next_cursor)
+
+
+def _parse_cursor(timestamp_column, id_column, cursor: str):
+    try:
+        return before_cursor(timestamp_column, id_column, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _get_owned_session(db: AsyncSession, session_id: str, user: User) -> ChatSession:
     result = await db.execute(
         select(ChatSession)
         .where(ChatSession.id == session_id, ChatSession.user_id == user.id)
     )
     session = result.scalar_one_or_none()
-
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+async def _message_page(
+    db: AsyncSession,
+    session_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[ChatMessageResponse], Optional[str]]:
+    """Newest `limit` messages before the cursor, returned oldest first."""
+    query = select(ChatMessageModel).where(ChatMessageModel.session_id == session_id)
+    if cursor:
+        query = query.where(_parse_cursor(ChatMessageModel.created_at, ChatMessageModel.id, cursor))
+    result = await db.execute(
+        query
+        .order_by(ChatMessageModel.created_at.desc(), ChatMessageModel.id.desc())
+        .limit(limit + 1)
+    )
+    rows = list(result.scalars().all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    messages = [
+        ChatMessageResponse(
+            id=msg.id,
+            role=msg.role.value,
+            content=msg.content,
+            model=msg.model,
+            created_at=msg.created_at
+        )
+        for msg in reversed(rows)
+    ]
+    return messages, next_cursor
+
+
+@router.delete("/sessions/{session_id}", response_class=ORJSONResponse)
+async def delete_session(
+    session_id: str,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user_required),
+):
+    """Delete a chat session (its messages go with it via ON DELETE CASCADE)."""
+    result = await db.execute(
+        delete(ChatSession)
+        .where(ChatSession.id == session_id, ChatSession.user_id == user.id)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Session not found")
 
-    await db.delete(session)
     await db.commit()
 
     return {"message": "Session deleted"}
 
 
+@router.post("/sessions/delete", response_class=ORJSONResponse)
+async def delete_sessions(
+    request: ChatSessionBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user_required),
+):
+    """Delete several of the current user's sessions in one statement. Unknown IDs are skipped."""
+    result = await db.execute(
+        delete(ChatSession)
+        .where(ChatSession.id.in_(request.session_ids), ChatSession.user_id == user.id)
+    )
+    await db.commit()
+
+    return {"message": "Sessions deleted", "deleted": result.rowcount}
+
+
 # ==================== CHAT QUERY ====================
 
 @router.post("/query", response_model=AgentChatResponse)
 async def chat_query(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     user: Optional[User] = Depends(get_current_user),
 ):
@@ -165,56 +256,44 @@ async def chat_query(
     Saves messages to session if user is authenticated.
 
     Features:
+    - Fast path: simple lookups answered by a single RAG completion
     - Multi-step reasoning with tool calling
     - Book search using semantic search
     - Chapter content retrieval
     - Concept explanations adapted to user level
-    - Persistent chat history (for authenticated users)
+    - Persistent chat history with rolling summaries (for authenticated users)
     """
     try:
-        from app.agents.book_agent import run_book_agent
+        from app.agents.router import answer_query
 
         session_id = request.session_id
         conversation_history = []
+        conversation_summary = None
+
+        new_session = None
 
         # If authenticated, handle session and get history
         if user:
-            is_new_session = False
-
             # Get or create session
             if session_id:
                 result = await db.execute(
                     select(ChatSession)
-                    .options(selectinload(ChatSession.messages))
                     .where(ChatSession.id == session_id, ChatSession.user_id == user.id)
                 )
                 session = result.scalar_one_or_none()
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
 
-                # Get conversation history from loaded messages
-                if session.messages:
-                    conversation_history = [
-                        {"role": msg.role.value, "content": msg.content}
-                        for msg in session.messages[-10:]  # Last 10 messages
-                    ]
+                # Rolling summary of older turns plus every message not yet folded into it
+                conversation_summary = session.summary
+                conversation_history = await chat_history_service.recent_messages(
+                    db, session.id, limit=summary_service.history_limit(), after=session.summarized_until
+                )
             else:
-                # Create new session with title from first message
-                is_new_session = True
+                # New session (title from first message) is inserted together with its first turn
                 title = request.query[:50] + "..." if len(request.query) > 50 else request.query
-                session = ChatSession(user_id=user.id, title=title)
-                db.add(session)
-                await db.flush()
-                session_id = session.id
-                # New session has no history
-
-            # Save user message
-            user_message = ChatMessageModel(
-                session_id=session.id,
-                role=MessageRole.USER,
-                content=request.query
-            )
-            db.add(user_message)
+                new_session = ChatSession(id=str(uuid.uuid4()), user_id=user.id, title=title)
+                session_id = new_session.id
         else:
             # For unauthenticated users, use provided history
             if request.conversation_history:
@@ -231,36 +310,61 @@ async def chat_query(
                 "goals": user.profile.goals or [],
             }
 
-        # Run the agent
-        result = await run_book_agent(
+        # End the read transaction so no pooled connection is held during the LLM call
+        await db.commit()
+
+        # Route to the RAG fast path or the agent
+        result = await answer_query(
             query=request.query,
             selected_text=request.selected_text,
             chapter_filter=request.chapter_id,
             user_profile=user_profile,
             conversation_history=conversation_history,
+            conversation_summary=conversation_summary,
         )
 
-        # Save assistant response if authenticated
+        # Save the turn in one short write transaction if authenticated
         if user and session_id:
+            if new_session is not None:
+                db.add(new_session)
+            user_message = ChatMessageModel(
+                session_id=session_id,
+                role=MessageRole.USER,
+                content=request.query
+            )
             assistant_message = ChatMessageModel(
                 session_id=session_id,
                 role=MessageRole.ASSISTANT,
                 content=result["answer"],
                 model=result.get("model")
             )
-            db.add(assistant_message)
+            await chat_history_service.append_messages(db, session_id, user_message, assistant_message)
             await db.commit()
 
+            # Compact older turns after the response is sent. The history above holds every
+            # unsummarized message, so no extra query (or connection) is needed to decide
+            if summary_service.needs_compaction(len(conversation_history) + 2):
+                background_tasks.add_task(summary_service.compact_session, session_id)
+
         return AgentChatResponse(
             answer=result["answer"],
             tool_calls=result.get("tool_calls", []),
+            citations=[Citation(**c) for c in result.get("citations", [])],
             model=result.get("model", "unknown"),
             agent=result.get("agent", "BookAssistant"),
-            session_id=session_id
+            route=result.get("route"),
+            session_id=session_id,
+            trace=result.get("trace") if request.include_trace else None,
         )
 
     except HTTPException:
         raise
+    except llm_client.RateLimitError:
+        raise HTTPException(
+            status_code=503,
+            detail="The AI service is busy, please try again shortly",
+            headers={"Retry-After": str(UPSTREAM_BUSY_RETRY_AFTER_SECONDS)},
+        )
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -294,6 +398,9 @@ async def chat_query_legacy(
                 "goals": user.profile.goals or [],
             }
 
+        # No DB work follows: release the connection before the LLM call
+        await db.commit()
+
         # Query RAG service
         result = await rag_service.query(
             query=request.query,
@@ -318,6 +425,12 @@ async def chat_query_legacy(
             citations=citations,
         )
 
+    except llm_client.RateLimitError:
+        raise HTTPException(
+            status_code=503,
+            detail="The AI service is busy, please try again shortly",
+            headers={"Retry-After": str(UPSTREAM_BUSY_RETRY_AFTER_SECONDS)},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -325,7 +438,7 @@ async def chat_query_legacy(
         )
 
 
-@router.get("/health")
+@router.get("/health", response_class=ORJSONResponse)
 async def chat_health():
     """Health check for chat service."""
     return {
@@ -4,11 +4,15 @@ Content API routes for personalization and translation.
 from typing import Optional
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
+from app.core.http_cache import cached_json_response
+from app.core.responses import ORJSONResponse
+from app.infrastructure import llm_client
 from app.infrastructure.database import get_db
+from app.infrastructure.llm_limiter import UPSTREAM_BUSY_RETRY_AFTER_SECONDS
 from app.models.user import User
 from app.schemas.content import PersonalizeRequest, TranslateRequest, ContentResponse
 from app.services.personalization_service import personalization_service
@@ -87,6 +91,12 @@ async def personalize_content(
 
         return ContentResponse(content=personalized, cached=False)
 
+    except llm_client.RateLimitError:
+        raise HTTPException(
+            status_code=503,
+            detail="The AI service is busy, please try again shortly",
+            headers={"Retry-After": str(UPSTREAM_BUSY_RETRY_AFTER_SECONDS)},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -128,15 +138,70 @@ async def translate_content(
 
         return ContentResponse(content=translated, cached=False)
 
+    except llm_client.RateLimitError:
+        raise HTTPException(
+            status_code=503,
+            detail="The AI service is busy, please try again shortly",
+            headers={"Retry-After": str(UPSTREAM_BUSY_RETRY_AFTER_SECONDS)},
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error translating content: {str(e)}",
+        )
+
+
+@router.get("/translate/{chapter_id}", response_class=ORJSONResponse)
+async def get_translation(
+    chapter_id: str,
+    request: Request,
+    target_language: str = "ur",
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Cacheable Urdu translation of a chapter.
+
+    Same translation for every user (cached per source text hash), served
+    with a strong ETag and public Cache-Control so browsers and CDNs can
+    answer repeats; If-None-Match revalidations get a 304.
+    """
+    if target_language != "ur":
+        raise HTTPException(
+            status_code=400,
+            detail="Only Urdu (ur) translation is currently supported",
+        )
+
+    # Unknown IDs would each cost an LLM call and a shared cache row that never expires
+    if chapter_id not in CHAPTER_CONTENT:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+
+    try:
+        original_content = await get_chapter_content(chapter_id)
+        translated = await translation_service.translate_shared(
+            content=original_content,
+            chapter_id=chapter_id,
+            db=db,
+        )
+    except llm_client.RateLimitError:
+        raise HTTPException(
+            status_code=503,
+            detail="The AI service is busy, please try again shortly",
+            headers={"Retry-After": str(UPSTREAM_BUSY_RETRY_AFTER_SECONDS)},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error translating content: {str(e)}",
         )
 
+    return cached_json_response(
+        request,
+        {"chapter_id": chapter_id, "target_language": target_language, "content": translated},
+    )
+
 
-@router.get("/chapter/{chapter_id}")
-async def get_chapter(chapter_id: str):
-    """Get original chapter content."""
+@router.get("/chapter/{chapter_id}", response_class=ORJSONResponse)
+async def get_chapter(chapter_id: str, request: Request):
+    """Get original chapter content (ETag + Cache-Control, 304 when unchanged)."""
     content = await get_chapter_content(chapter_id)
-    return {"chapter_id": chapter_id, "content": content}
+    return cached_json_response(request, {"chapter_id": chapter_id, "content": content})
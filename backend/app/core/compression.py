@@ -0,0 +1,118 @@
+"""
+Response compression for large JSON and text bodies.
+Brotli when the client accepts it and the brotli package is installed,
+gzip otherwise. Bodies under COMPRESSION_MIN_BYTES and streamed responses
+are sent as they are.
+"""
+import gzip
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding in an Accept-Encoding header ("br", "gzip" or None)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    def q(coding: str) -> float:
+        return accepted.get(coding, accepted.get("*", 0.0))
+
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(candidates, key=q)  # Ties keep the order above (br first)
+    return best if q(best) > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "")
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        and not content_type.startswith("text/event-stream")
+        and "content-encoding" not in headers
+    )
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies above a size threshold."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            return await self.app(scope, receive, send)
+
+        accept_encoding = b""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value
+                break
+        encoding = choose_encoding(accept_encoding.decode("latin-1")) if accept_encoding else None
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < settings.COMPRESSION_MIN_BYTES
+                or not _compressible(headers)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            started = time.perf_counter()
+            compressed = compress(body, encoding)
+            metrics.observe("response_compression_seconds", time.perf_counter() - started, encoding=encoding)
+            metrics.inc("response_compression_bytes_in_total", len(body), encoding=encoding)
+            metrics.inc("response_compression_bytes_out_total", len(compressed), encoding=encoding)
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            if headers.get("etag", "").startswith('"'):
+                # A strong ETag promises identical bytes; the encoded copy only matches weakly
+                headers["etag"] = "W/" + headers["etag"]
+            headers.add_vary_header("Accept-Encoding")
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
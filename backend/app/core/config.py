@@ -23,6 +23,14 @@ class Settings(BaseSettings):
 
     # Database - using environment variables for Vercel
     DATABASE_URL: str = ""
+    # "serverless" (NullPool, Vercel), "pooled" (long-lived pool, containers)
+    # or "pgbouncer" (NullPool behind an external pooler, prepared statements off)
+    DB_ENGINE_MODE: str = "serverless"
+    DB_POOL_SIZE: int = 5  # Pooled mode only
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Reconnect before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
 
     @model_validator(mode='after')
     def validate_configs(self):
@@ -66,10 +74,54 @@ class Settings(BaseSettings):
     # LLM Provider choice: "openrouter" or "openai"
     LLM_PROVIDER: str = "openrouter"
 
+    # Adaptive concurrency limit shared by all upstream LLM calls (AIMD on 429s/latency)
+    LLM_INITIAL_CONCURRENCY: int = 8
+    LLM_MIN_CONCURRENCY: int = 1
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_QUEUE: int = 64  # Waiting calls beyond this are rejected with Retry-After
+    LLM_LATENCY_TARGET_SECONDS: float = 20.0  # Slower responses shrink the limit
+
+    # Hedge slow chat completions to the other provider (OpenRouter <-> OpenAI) when both have keys
+    LLM_HEDGING_ENABLED: bool = True
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 8.0  # Used until enough latencies give a p95
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open a provider's circuit
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Per-user/per-IP token buckets on the LLM-backed endpoints (costs in app/core/rate_limit.py).
+    # Shared across workers through Redis when REDIS_URL is set.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BURST: float = 10.0  # Bucket capacity
+    RATE_LIMIT_REFILL_PER_SECOND: float = 0.2  # 12 tokens a minute
+
+    # Send simple lookups to the single-shot RAG path instead of the agent loop
+    QUERY_ROUTER_ENABLED: bool = True
+
+    # Prompt context budget (tokens) shared by history, selected text and retrieved chunks
+    PROMPT_CONTEXT_TOKEN_BUDGET: int = 3000
+    PROMPT_BUDGET_HISTORY_SHARE: float = 0.3
+    PROMPT_BUDGET_SELECTED_TEXT_SHARE: float = 0.2
+    PROMPT_BUDGET_RETRIEVED_SHARE: float = 0.5
+    CHAPTER_CONTENT_TOKEN_LIMIT: int = 500  # Per get_chapter_content tool call
+
+    # Most recent messages of a stored session always kept out of the summary
+    CHAT_HISTORY_MESSAGES: int = 10
+    # Older turns are compacted into ChatSession.summary in the background; each chat turn
+    # loads the summary plus every message after it (at most CHAT_SUMMARY_TRIGGER_MESSAGES)
+    CHAT_SUMMARY_TRIGGER_MESSAGES: int = 20  # Unsummarized messages that trigger a compaction
+    CHAT_SUMMARY_BATCH_MESSAGES: int = 40  # Most messages folded in by one compaction
+    CHAT_SUMMARY_MAX_TOKENS: int = 400
+
     # Authentication
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    # Authenticated user + profile snapshots kept per worker; 0 disables the cache
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_USERS: int = 10000
+    # bcrypt runs on a dedicated thread pool, never on the event loop
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Waiting hashes beyond this get a 503 with Retry-After
 
     # CORS - Allow Vercel preview deployments and production
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001,https://your-frontend.vercel.app"
@@ -77,6 +129,25 @@ class Settings(BaseSettings):
     # Redis (for caching) - external service
     REDIS_URL: str = ""
 
+    # When set, /metrics requires "Authorization: Bearer <token>"
+    METRICS_TOKEN: str = ""
+    # Server-Timing header and a JSON timing log line on chat/content responses
+    SERVER_TIMING_ENABLED: bool = True
+    # Compress JSON/text responses of at least COMPRESSION_MIN_BYTES (brotli if installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 10-11 cost ~50x the CPU for a few % smaller bodies
+    # Cache-Control on chapter and GET translation reads; clients revalidate with the ETag afterwards
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 300
+    HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = 86400
+
+    # Startup warm-up for long-running deployments (DB pool, Qdrant/LLM/Cohere clients, chapter index).
+    # /ready answers 503 until it finishes and a health probe passes; /health stays pure liveness.
+    WARMUP_ENABLED: bool = False
+    WARMUP_STEP_TIMEOUT_SECONDS: float = 20.0
+    WARMUP_PROBE_RETRY_SECONDS: float = 5.0  # Health probe retry interval until it passes
+
     @computed_field
     @property
     def cors_origins_list(self) -> List[str]:
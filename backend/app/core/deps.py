@@ -9,6 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.core.security import decode_token
+from app.core.user_cache import user_cache
 from app.infrastructure.database import get_db
 from app.models.user import User, UserProfile
 
@@ -29,6 +30,11 @@ async def get_current_user(
     if not user_id:
         return None
 
+    # Recently seen token: no database round trip
+    user = user_cache.get(user_id, access_token)
+    if user is not None:
+        return user
+
     # Get user from database with profile
     result = await session.execute(
         select(User)
@@ -36,6 +42,8 @@ async def get_current_user(
         .where(User.id == user_id)
     )
     user = result.scalar_one_or_none()
+    if user is not None:
+        user_cache.set(user_id, access_token, user)
     return user
 
 
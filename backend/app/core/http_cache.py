@@ -0,0 +1,51 @@
+"""
+HTTP caching for content reads: strong ETags from a hash of the response body,
+Cache-Control, and 304 Not Modified for matching If-None-Match requests.
+"""
+import hashlib
+from typing import Any, Optional, Union
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def content_hash(data: Union[str, bytes]) -> str:
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{content_hash(body)[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so W/"x" (a compressed copy) matches "x"."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_control(public: bool) -> str:
+    scope = "public" if public else "private"
+    return (
+        f"{scope}, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, "
+        f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS}"
+    )
+
+
+def cached_json_response(request: Request, content: Any, public: bool = True) -> Response:
+    """JSON response with ETag and Cache-Control; 304 without a body when the client's copy is current."""
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    headers = {"ETag": strong_etag(body), "Cache-Control": cache_control(public)}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,239 @@
+"""
+Lightweight in-process metrics registry.
+Counters, gauges and bucketed histograms keyed by metric name and labels,
+exposed in Prometheus text format at /metrics.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple, Any, Sequence
+
+from app.core.timing import span
+
+# Latency buckets in seconds, sized for HTTP handlers and upstream LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Process-wide store for counters, gauges and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        """Increment a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to an absolute value."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def add_gauge(self, name: str, amount: float, **labels):
+        """Move a gauge up or down by a relative amount."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels):
+        """Record a histogram observation."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time copy of every series."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: {key: value for key, value in series.items()}
+                    for name, series in self._counters.items()
+                },
+                "gauges": {
+                    name: {key: value for key, value in series.items()}
+                    for name, series in self._gauges.items()
+                },
+                "histograms": {
+                    name: {
+                        key: {
+                            "buckets": h.buckets,
+                            "counts": list(h.counts),
+                            "count": h.count,
+                            "sum": h.sum,
+                        }
+                        for key, h in series.items()
+                    }
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def reset(self):
+        """Drop every series (used by tests and benchmarks)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Global instance
+metrics = MetricsRegistry()
+
+
+def completion_usage(response: Any) -> Dict[str, int]:
+    """Extract token usage, including provider prompt-cache hits, from a chat completion."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "completion_tokens": usage.completion_tokens or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0,
+    }
+
+
+def record_llm_usage(service: str, usage: Dict[str, int]):
+    """Record token usage and prompt-cache hits for an LLM call made by a service."""
+    cached = usage.get("cached_tokens", 0)
+    metrics.inc("llm_prompt_tokens_total", usage.get("prompt_tokens", 0), service=service)
+    metrics.inc("llm_completion_tokens_total", usage.get("completion_tokens", 0), service=service)
+    metrics.inc("llm_cached_prompt_tokens_total", cached, service=service)
+    metrics.inc("llm_prompt_cache_requests_total", service=service, result="hit" if cached else "miss")
+
+
+@contextmanager
+def observe_duration(name: str, **labels) -> Iterator[None]:
+    """Time the block into a histogram, labelled outcome="ok" or "error"."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        metrics.observe(name, time.perf_counter() - started, outcome=outcome, **labels)
+
+
+@contextmanager
+def upstream_call(upstream: str, service: str) -> Iterator[None]:
+    """Time a call to an external dependency (cohere_embed, qdrant_search, ...) for a service."""
+    with span(upstream), observe_duration("upstream_request_seconds", upstream=upstream, service=service):
+        yield
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Render a registry snapshot in the Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+    for kind in ("counters", "gauges"):
+        for name, series in sorted(snapshot[kind].items()):
+            lines.append(f"# TYPE {name} {kind[:-1]}")
+            for key, value in series.items():
+                lines.append(f"{name}{_labels(key)} {_number(value)}")
+
+    for name, series in sorted(snapshot["histograms"].items()):
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in series.items():
+            cumulative = 0
+            for bound, count in zip(histogram["buckets"] + (float("inf"),), histogram["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(key, (('le', _number(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(key)} {_number(histogram['sum'])}")
+            lines.append(f"{name}_count{_labels(key)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _route_template(scope) -> str:
+    """Path template of the matched route; templates keep label cardinality bounded."""
+    # Recent FastAPI keeps included routes unprefixed and records the full path separately
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    path = getattr(effective, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        metrics.add_gauge("http_requests_inflight", 1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.add_gauge("http_requests_inflight", -1)
+            metrics.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=_route_template(scope),
+                status=status,
+            )
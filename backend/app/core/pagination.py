@@ -0,0 +1,37 @@
+"""
+Keyset (cursor) pagination helpers.
+A cursor is the (timestamp, id) of the last row on a page, so the next page
+is an index range scan no matter how deep the client has scrolled.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded."""
+
+
+def encode_cursor(timestamp: datetime, id: str) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps({"t": timestamp.isoformat(), "id": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), str(data["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def before_cursor(timestamp_column, id_column, cursor: str) -> ColumnElement:
+    """Filter for rows after the cursor in (timestamp DESC, id DESC) order."""
+    timestamp, id = decode_cursor(cursor)
+    return tuple_(timestamp_column, id_column) < tuple_(timestamp, id)
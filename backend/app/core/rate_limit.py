@@ -0,0 +1,192 @@
+"""
+Token bucket rate limiting for the endpoints that spend LLM budget.
+Runs as ASGI middleware, so over-limit requests are turned away before
+routing, dependency injection, the database or any upstream call.
+"""
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import decode_token
+
+# Tokens each call takes from the caller's bucket, by (method, path).
+# Paths may use {param} segments like the routes they cover.
+ROUTE_COSTS: Dict[Tuple[str, str], float] = {
+    ("POST", "/api/chat/query"): 1.0,
+    ("POST", "/api/chat/query/legacy"): 1.0,
+    ("POST", "/api/content/personalize"): 2.0,
+    ("POST", "/api/content/translate"): 2.0,
+    ("GET", "/api/content/translate/{chapter_id}"): 2.0,
+}
+
+REDIS_KEY_PREFIX = "rate-limit:"
+
+# KEYS[1] bucket hash; ARGV capacity, refill per second, cost.
+# Uses the Redis clock so workers with skewed clocks share one bucket correctly.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class MemoryBucketBackend:
+    """Per-process buckets; each worker enforces the limit on its own."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        """Take cost tokens. Returns 0 if allowed, else seconds until enough have refilled."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            # Least recently seen callers have long since refilled
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisBucketBackend:
+    """Buckets shared by every worker through an atomic Lua script."""
+
+    def __init__(self, redis, fallback: Optional[MemoryBucketBackend] = None):
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._fallback = fallback or MemoryBucketBackend()
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        try:
+            return float(await self._script(keys=[REDIS_KEY_PREFIX + key], args=[capacity, rate, cost]))
+        except Exception as e:
+            # Degrade to per-worker limits rather than failing or dropping protection
+            print(f"Rate limit Redis error, using in-process buckets: {e}")
+            metrics.inc("rate_limit_backend_errors_total")
+            return await self._fallback.take(key, cost, capacity, rate)
+
+
+_backend = None
+
+
+def get_rate_limit_backend():
+    """Get the Redis backend when REDIS_URL is set, else the in-process one."""
+    global _backend
+    if _backend is None:
+        from app.infrastructure.redis_client import get_redis
+
+        redis = get_redis()
+        _backend = RedisBucketBackend(redis) if redis is not None else MemoryBucketBackend()
+    return _backend
+
+
+def _cookie(scope, name: str) -> Optional[str]:
+    for header, value in scope.get("headers", ()):
+        if header == b"cookie":
+            for part in value.decode("latin-1").split(";"):
+                key, _, cookie_value = part.strip().partition("=")
+                if key == name:
+                    return cookie_value
+    return None
+
+
+def client_key(scope) -> str:
+    """Signed-in users get their own bucket; everyone else is keyed by IP."""
+    token = _cookie(scope, "access_token")
+    payload = decode_token(token) if token else None
+    if payload and payload.get("sub"):
+        return f"user:{payload['sub']}"
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def _path_pattern(template: str) -> Pattern:
+    parts = re.split(r"(\{[^/{}]+\})", template)
+    return re.compile("".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts) + "$")
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying ROUTE_COSTS against per-client token buckets."""
+
+    def __init__(self, app, backend=None, route_costs: Optional[Dict[Tuple[str, str], float]] = None):
+        self.app = app
+        self._backend = backend
+        self.route_costs = ROUTE_COSTS if route_costs is None else route_costs
+        self._templated: List[Tuple[str, Pattern, str, float]] = [
+            (method, _path_pattern(path), path, cost)
+            for (method, path), cost in self.route_costs.items()
+            if "{" in path
+        ]
+
+    def route_cost(self, method: str, path: str) -> Tuple[Optional[float], str]:
+        """(cost, route template) for a request; cost is None for unlisted routes."""
+        cost = self.route_costs.get((method, path))
+        if cost is not None:
+            return cost, path
+        for route_method, pattern, template, cost in self._templated:
+            if route_method == method and pattern.match(path):
+                return cost, template
+        return None, path
+
+    @property
+    def backend(self):
+        return self._backend or get_rate_limit_backend()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        # Metrics are labelled with the route template, not the concrete path
+        cost, route = self.route_cost(scope["method"], scope["path"].rstrip("/") or "/")
+        if cost is None:
+            return await self.app(scope, receive, send)
+
+        retry_after = await self.backend.take(
+            client_key(scope),
+            cost,
+            settings.RATE_LIMIT_BURST,
+            settings.RATE_LIMIT_REFILL_PER_SECOND,
+        )
+        if retry_after <= 0:
+            metrics.inc("rate_limit_requests_total", route=route, result="allowed")
+            return await self.app(scope, receive, send)
+
+        metrics.inc("rate_limit_requests_total", route=route, result="limited")
+        body = json.dumps({"detail": "Too many requests, please slow down"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,18 @@
+"""
+JSON response class for routes without a response_model.
+Routes with a response_model are serialized by pydantic-core straight to JSON
+bytes (FastAPI's fast path), which only applies while the route keeps the
+default response class; routes returning plain dicts set
+response_class=ORJSONResponse so they skip the stdlib json module.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (UTF-8 output, no escaping of Urdu text)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
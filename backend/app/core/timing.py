@@ -0,0 +1,120 @@
+"""
+Request-scoped timing breakdown.
+Embedding, vector search, LLM calls, agent tools and DB statements record
+spans into the current request's RequestTiming; ServerTimingMiddleware
+emits the totals as a Server-Timing header and one JSON log line.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Only these requests get a timing context (and pay for span bookkeeping)
+TIMED_PATH_PREFIXES: Tuple[str, ...] = ("/api/chat", "/api/content")
+
+_current: ContextVar[Optional["RequestTiming"]] = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    """Per-request span totals: name -> (seconds, count)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._spans: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()  # Sync agent tools record from worker threads
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            span = self._spans.setdefault(name, [0.0, 0])
+            span[0] += seconds
+            span[1] += 1
+
+    def spans(self) -> Dict[str, Tuple[float, int]]:
+        with self._lock:
+            return {name: (total, int(count)) for name, (total, count) in self._spans.items()}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header_value(self) -> str:
+        """Server-Timing value; spans can overlap (tools contain embeds and searches)."""
+        parts = [
+            f'{name};desc="{count}x";dur={total * 1000:.1f}'
+            for name, (total, count) in self.spans().items()
+        ]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+def record_span(name: str, seconds: float):
+    """Add a span to the current request, if it is being timed."""
+    timing = _current.get()
+    if timing is not None:
+        timing.record(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block into the current request's breakdown."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.record(name, time.perf_counter() - started)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding Server-Timing to chat and content responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.SERVER_TIMING_ENABLED
+            or not scope["path"].startswith(TIMED_PATH_PREFIXES)
+        ):
+            return await self.app(scope, receive, send)
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.header_value().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            # Includes work finished after the headers went out (dependency teardown, background tasks)
+            print(json.dumps({
+                "event": "request_timing",
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "total_ms": round(timing.elapsed() * 1000, 1),
+                "spans": {
+                    name: {"ms": round(total * 1000, 1), "count": count}
+                    for name, (total, count) in timing.spans().items()
+                },
+            }))
@@ -0,0 +1,153 @@
+"""
+Token budget allocation for agent and RAG prompts.
+Splits a fixed context budget between conversation history, selected text
+and retrieved chunks, dropping the lowest-scoring material first.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# Average characters per token for English prose across OpenAI/Anthropic tokenizers.
+# A local estimate keeps budgeting free of network-loaded tokenizer files.
+CHARS_PER_TOKEN = 4
+
+HISTORY = "history"
+SELECTED_TEXT = "selected_text"
+RETRIEVED = "retrieved"
+
+# Selected text is what the user is pointing at, so it outranks everything else
+SELECTED_TEXT_SCORE = 2.0
+# Each step back in the conversation lowers a message's score by this factor
+HISTORY_DECAY = 0.85
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens in text."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, marking the cut with an ellipsis."""
+    if max_tokens <= 0:
+        return ""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[: max(max_chars - 3, 0)] + "..."
+
+
+@dataclass
+class ContextItem:
+    """A candidate piece of prompt context."""
+
+    kind: str
+    text: str
+    score: float
+    position: int
+    payload: Any = None
+    tokens: int = 0
+
+    def __post_init__(self):
+        self.tokens = count_tokens(self.text)
+
+
+@dataclass
+class BudgetAllocation:
+    """Context admitted into the prompt, in original order."""
+
+    history: List[ContextItem] = field(default_factory=list)
+    selected_text: Optional[str] = None
+    retrieved: List[ContextItem] = field(default_factory=list)
+    tokens_used: int = 0
+    dropped: int = 0
+
+
+class TokenBudget:
+    """Allocates a prompt context budget across history, selected text and retrieval."""
+
+    def __init__(
+        self,
+        total_tokens: Optional[int] = None,
+        shares: Optional[Dict[str, float]] = None,
+    ):
+        self.total_tokens = int(total_tokens if total_tokens is not None else settings.PROMPT_CONTEXT_TOKEN_BUDGET)
+        self.shares = shares or {
+            HISTORY: settings.PROMPT_BUDGET_HISTORY_SHARE,
+            SELECTED_TEXT: settings.PROMPT_BUDGET_SELECTED_TEXT_SHARE,
+            RETRIEVED: settings.PROMPT_BUDGET_RETRIEVED_SHARE,
+        }
+
+    def allocate(
+        self,
+        history: Optional[Sequence[Dict[str, str]]] = None,
+        selected_text: Optional[str] = None,
+        retrieved: Optional[Sequence[Tuple[str, float, Any]]] = None,
+    ) -> BudgetAllocation:
+        """
+        Fit context into the budget.
+
+        Args:
+            history: Conversation messages, oldest first ({"role", "content"})
+            selected_text: Text the user selected on the page
+            retrieved: (text, relevance score, payload) tuples from search
+
+        Returns:
+            BudgetAllocation with the admitted items of each kind
+        """
+        sections: Dict[str, List[ContextItem]] = {HISTORY: [], SELECTED_TEXT: [], RETRIEVED: []}
+
+        history = list(history or [])
+        for i, msg in enumerate(history):
+            age = len(history) - 1 - i
+            sections[HISTORY].append(
+                ContextItem(HISTORY, msg.get("content", ""), HISTORY_DECAY ** age, i, payload=msg)
+            )
+        if selected_text:
+            sections[SELECTED_TEXT].append(ContextItem(SELECTED_TEXT, selected_text, SELECTED_TEXT_SCORE, 0))
+        for i, (text, score, payload) in enumerate(retrieved or []):
+            sections[RETRIEVED].append(ContextItem(RETRIEVED, text, float(score or 0), i, payload=payload))
+
+        admitted: List[ContextItem] = []
+        pending: List[ContextItem] = []
+        used = 0
+
+        # Pass 1: each kind fills its own share, best-scoring first
+        for kind, items in sections.items():
+            share = int(self.total_tokens * self.shares.get(kind, 0))
+            section_used = 0
+            for item in sorted(items, key=lambda it: it.score, reverse=True):
+                if section_used + item.tokens <= share:
+                    admitted.append(item)
+                    section_used += item.tokens
+                elif section_used == 0 and share > 0:
+                    # An oversized top item is cut down rather than lost
+                    item.text = truncate_to_tokens(item.text, share)
+                    item.tokens = count_tokens(item.text)
+                    admitted.append(item)
+                    section_used += item.tokens
+                else:
+                    pending.append(item)
+            used += section_used
+
+        # Pass 2: unused budget goes to the best leftovers of any kind
+        dropped = 0
+        for item in sorted(pending, key=lambda it: it.score, reverse=True):
+            if used + item.tokens <= self.total_tokens:
+                admitted.append(item)
+                used += item.tokens
+            else:
+                dropped += 1
+
+        allocation = BudgetAllocation(tokens_used=used, dropped=dropped)
+        for item in sorted(admitted, key=lambda it: (it.kind, it.position)):
+            if item.kind == HISTORY:
+                allocation.history.append(item)
+            elif item.kind == SELECTED_TEXT:
+                allocation.selected_text = item.text
+            else:
+                allocation.retrieved.append(item)
+        return allocation
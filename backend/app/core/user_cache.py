@@ -0,0 +1,149 @@
+"""
+Short-TTL cache of authenticated users and their profiles.
+Saves get_current_user's database lookup on every authenticated request.
+Entries are plain column snapshots; each hit gets its own detached User.
+"""
+import asyncio
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.user import User, UserProfile
+
+# Redis pub/sub channel carrying user IDs whose cached entries must be dropped
+INVALIDATION_CHANNEL = "user-cache:invalidate"
+
+# Never copied into the cache
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+Snapshot = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+def _columns(obj) -> Dict[str, Any]:
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(obj).mapper.column_attrs
+        if attr.key not in EXCLUDED_COLUMNS
+    }
+
+
+def _detached(model, values: Dict[str, Any]):
+    obj = model(**copy.deepcopy(values))  # JSON columns are lists; never share them between requests
+    # Looks persistent to a session (no INSERT if it is ever added), but is bound to none
+    make_transient_to_detached(obj)
+    for key in EXCLUDED_COLUMNS & set(inspect(model).column_attrs.keys()):
+        # Loaded as None instead of expired, so reading it can't try to hit the DB
+        set_committed_value(obj, key, None)
+    return obj
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+class UserCache:
+    """Per-process TTL + LRU cache keyed by user ID and access token."""
+
+    def __init__(self, ttl_seconds: float, max_users: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: "OrderedDict[str, Dict[str, Tuple[float, Snapshot]]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_users > 0
+
+    def get(self, user_id: str, token: str) -> Optional[User]:
+        """Return a fresh detached User (with profile) for a cached token, or None."""
+        if not self.enabled:
+            return None
+        tokens = self._entries.get(user_id)
+        entry = tokens.get(_token_key(token)) if tokens else None
+        if entry is None or entry[0] < time.monotonic():
+            metrics.inc("user_cache_requests_total", result="miss")
+            return None
+
+        self._entries.move_to_end(user_id)
+        metrics.inc("user_cache_requests_total", result="hit")
+        user_values, profile_values = entry[1]
+        user = _detached(User, user_values)
+        profile = _detached(UserProfile, profile_values) if profile_values else None
+        set_committed_value(user, "profile", profile)
+        return user
+
+    def set(self, user_id: str, token: str, user: User):
+        """Snapshot a user whose profile relationship is already loaded."""
+        if not self.enabled:
+            return
+        profile = user.profile
+        snapshot = (_columns(user), _columns(profile) if profile else None)
+        tokens = self._entries.setdefault(user_id, {})
+        tokens[_token_key(token)] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        """Drop every cached token of a user in this process."""
+        if self._entries.pop(user_id, None) is not None:
+            metrics.inc("user_cache_invalidations_total")
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Global instance
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_USERS)
+
+
+async def invalidate_user(user_id: str):
+    """
+    Invalidate a user's cache entries here and, through Redis, in every other worker.
+
+    Without Redis, other workers converge once their entries expire (USER_CACHE_TTL_SECONDS).
+    """
+    from app.infrastructure.redis_client import get_redis
+
+    user_cache.invalidate(user_id)
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.publish(INVALIDATION_CHANNEL, user_id)
+    except Exception as e:
+        print(f"User cache invalidation publish failed: {e}")
+
+
+async def listen_for_invalidations():
+    """Apply invalidations published by other workers. Runs until cancelled."""
+    from app.infrastructure.redis_client import get_redis
+
+    redis = get_redis()
+    if redis is None:
+        return
+
+    while True:
+        try:
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        user_cache.invalidate(message["data"])
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Missed messages are bounded by the TTL; drop everything to be safe and resubscribe
+            print(f"User cache invalidation listener error: {e}")
+            user_cache.clear()
+            await asyncio.sleep(1)
@@ -0,0 +1,163 @@
+"""
+Startup warm-up for long-running deployments (WARMUP_ENABLED).
+Builds the lazily constructed clients and opens their connections before the
+first user request, then runs a health probe; /ready reports 503 until both
+are done. Serverless deployments leave it off and keep their fast cold start.
+"""
+import asyncio
+import importlib
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.infrastructure.database import POOLED_MODE, get_engine
+
+
+class WarmupState:
+    """Progress of the warm-up, as reported by /ready."""
+
+    def __init__(self):
+        self.warm = False
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.probe_error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        # Without a warm-up there is nothing to wait for
+        return self.warm or not settings.WARMUP_ENABLED
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming",
+            "warmup_enabled": settings.WARMUP_ENABLED,
+            "steps": self.steps,
+            "probe_error": self.probe_error,
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def warm_agent():
+    """Import the Agents SDK and build the agent, its model and LLM client."""
+    # Off the event loop so /health keeps answering during the ~1.5 s import
+    await asyncio.to_thread(importlib.import_module, "app.agents.book_agent")
+
+
+async def load_chapters():
+    """Read the chapter overviews the get_chapter_content tool serves, and the agent's book outline."""
+    from app.agents.tools import load_book_outline, load_chapter_index
+
+    load_book_outline()
+    return f"{len(load_chapter_index())} chapters"
+
+
+async def warm_db_pool():
+    """Open the pool's connections (one in NullPool modes, which keep none)."""
+    engine = get_engine()
+    count = settings.DB_POOL_SIZE if settings.DB_ENGINE_MODE == POOLED_MODE else 1
+    # Hold them all at once so the pool really grows to `count`; they return to it on exit
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+    return f"{count} connections"
+
+
+async def warm_vector_store():
+    """Connect the async (RAG) and sync (agent tools) Qdrant clients."""
+    from app.agents.tools import get_qdrant_client
+    from app.infrastructure.vector_store import vector_store
+
+    await vector_store.client.get_collection(vector_store.collection_name)
+    await asyncio.to_thread(get_qdrant_client().get_collection, settings.QDRANT_COLLECTION)
+
+
+async def warm_llm_pools():
+    """Build every service's LLM client and open a connection to each provider."""
+    from app.infrastructure.llm_providers import open_provider_connections
+    from app.services.personalization_service import personalization_service
+    from app.services.rag_service import rag_service
+    from app.services.summary_service import summary_service
+    from app.services.translation_service import translation_service
+
+    for service in (rag_service, personalization_service, translation_service, summary_service):
+        service.client  # noqa: B018  (cached_property: builds the client)
+
+    # All clients share the providers' transports, so one connection each warms every service
+    return f"providers: {', '.join(await open_provider_connections())}"
+
+
+async def warm_embeddings():
+    """Build the Cohere client and open its connection with a one-word embed."""
+    from app.services.embedding_service import embedding_service
+
+    # The Cohere client is synchronous; keep it off the event loop
+    await asyncio.to_thread(
+        embedding_service.client.embed,
+        texts=["warm-up"],
+        model=embedding_service.model,
+        input_type="search_query",
+    )
+
+
+async def health_probe():
+    """Raises unless the database and the vector store answer."""
+    from app.infrastructure.vector_store import vector_store
+
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await vector_store.client.get_collection(vector_store.collection_name)
+
+
+# Run in order; imports come first so the network steps time only the network
+WARMUP_STEPS: List[Tuple[str, Callable[[], Awaitable[Any]]]] = [
+    ("agent", warm_agent),
+    ("chapters", load_chapters),
+    ("db_pool", warm_db_pool),
+    ("vector_store", warm_vector_store),
+    ("llm_pools", warm_llm_pools),
+    ("embeddings", warm_embeddings),
+]
+
+
+async def _run_step(state: WarmupState, name: str, step: Callable[[], Awaitable[Any]]):
+    """Run one step; failures are recorded, not raised (the health probe gates readiness)."""
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(step(), settings.WARMUP_STEP_TIMEOUT_SECONDS)
+        result = {"ok": True}
+        if detail:
+            result["detail"] = detail
+    except Exception as e:
+        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    duration = time.perf_counter() - started
+    result["ms"] = round(duration * 1000, 1)
+    state.steps[name] = result
+    metrics.set_gauge("warmup_step_seconds", duration, step=name)
+    print(f"Warm-up {name}: {'ok' if result['ok'] else result['error']} ({result['ms']} ms)")
+
+
+async def run_warmup(state: WarmupState = warmup_state):
+    """Warm every step, then probe until healthy and mark the worker ready."""
+    started = time.perf_counter()
+    for name, step in WARMUP_STEPS:
+        await _run_step(state, name, step)
+
+    while True:
+        try:
+            await asyncio.wait_for(health_probe(), settings.WARMUP_STEP_TIMEOUT_SECONDS)
+            break
+        except Exception as e:
+            state.probe_error = f"{type(e).__name__}: {e}"
+            print(f"Warm-up health probe failed, retrying in {settings.WARMUP_PROBE_RETRY_SECONDS}s: {state.probe_error}")
+            await asyncio.sleep(settings.WARMUP_PROBE_RETRY_SECONDS)
+
+    state.probe_error = None
+    state.warm = True
+    metrics.set_gauge("warmup_ready", 1)
+    print(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f} ms; ready")
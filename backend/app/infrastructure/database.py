@@ -2,36 +2,148 @@
 Database configuration and session management.
 Optimized for serverless/Vercel deployment.
 """
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import time
+import uuid
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.timing import current_timing, span
 
 # Global engine and session maker for reuse across requests
 _engine = None
 _async_session_maker = None
 
 
+# DB_ENGINE_MODE values
+SERVERLESS_MODE = "serverless"  # NullPool: a fresh connection per request (Vercel)
+POOLED_MODE = "pooled"  # Long-lived pool for container deployments (docker-compose)
+PGBOUNCER_MODE = "pgbouncer"  # NullPool to an external transaction pooler, no prepared statements
+ENGINE_MODES = (SERVERLESS_MODE, POOLED_MODE, PGBOUNCER_MODE)
+
+
+def engine_options(url: str, mode: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the URL and create_async_engine keyword arguments for an engine mode.
+
+    Args:
+        url: Database URL
+        mode: One of ENGINE_MODES
+
+    Returns:
+        Tuple of (url, engine kwargs)
+    """
+    if mode not in ENGINE_MODES:
+        raise ValueError(f"Unknown DB_ENGINE_MODE '{mode}', expected one of {', '.join(ENGINE_MODES)}")
+
+    is_asyncpg = url.startswith("postgresql+asyncpg://")
+    options: Dict[str, Any] = {"echo": settings.DEBUG}
+
+    # asyncpg-only options; other drivers (e.g. aiosqlite in benchmarks) take none
+    connect_args: Dict[str, Any] = {}
+    if is_asyncpg:
+        connect_args["server_settings"] = {
+            "application_name": "ai-book-platform-vercel" if mode == SERVERLESS_MODE else "ai-book-platform",
+        }
+
+    if mode == POOLED_MODE:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    else:
+        # For serverless environments, use NullPool to avoid connection issues;
+        # behind PgBouncer the pooler owns the pooling
+        options["poolclass"] = NullPool
+
+    if mode == PGBOUNCER_MODE and is_asyncpg:
+        # Transaction pooling hands each transaction a different server connection,
+        # so named prepared statements must be neither cached nor reused
+        url = make_url(url).update_query_dict({"prepared_statement_cache_size": "0"}).render_as_string(
+            hide_password=False
+        )
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    options["connect_args"] = connect_args
+    return url, options
+
+
+def build_engine(url: Optional[str] = None, mode: Optional[str] = None) -> AsyncEngine:
+    """Create an instrumented engine for a URL and mode (defaults from settings)."""
+    url, options = engine_options(url or settings.DATABASE_URL, mode or settings.DB_ENGINE_MODE)
+    engine = create_async_engine(url, **options)
+    if url.startswith("sqlite"):
+        enable_sqlite_foreign_keys(engine)
+    instrument_pool(engine)
+    instrument_statements(engine)
+    return engine
+
+
 def get_engine():
     global _engine
     if _engine is None:
-        # For serverless environments, use NullPool to avoid connection issues
-        _engine = create_async_engine(
-            settings.DATABASE_URL,
-            echo=settings.DEBUG,
-            poolclass=NullPool,  # Use NullPool for serverless environments
-            connect_args={
-                "server_settings": {
-                    "application_name": "ai-book-platform-vercel",
-                },
-            },
-        )
+        _engine = build_engine()
     return _engine
 
 
+def enable_sqlite_foreign_keys(engine: AsyncEngine):
+    """SQLite (benchmarks, tests) only enforces ON DELETE CASCADE with this pragma."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def instrument_statements(engine: AsyncEngine):
+    """Add statement execution time to the current request's "db" span."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_timing() is not None:
+            context._statement_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_statement_started", None)
+        timing = current_timing()
+        if started is not None and timing is not None:
+            timing.record("db", time.perf_counter() - started)
+
+
+def instrument_pool(engine: AsyncEngine):
+    """
+    Record how long each DB connection is checked out of the pool.
+
+    db_connection_hold_seconds is the time from checkout to checkin, i.e. how
+    long a request keeps a connection away from everyone else.
+    """
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        metrics.add_gauge("db_connections_checked_out", 1)
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            metrics.add_gauge("db_connections_checked_out", -1)
+            metrics.observe("db_connection_hold_seconds", time.perf_counter() - started)
+
+
 def get_async_session_maker():
     global _async_session_maker
     if _async_session_maker is None:
@@ -49,15 +161,29 @@ Base = declarative_base()
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
+    started = time.perf_counter()
+    metrics.add_gauge("db_sessions_inflight", 1)
     async with get_async_session_maker()() as session:
         try:
             yield session
-            await session.commit()
+            with span("db_commit"):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+            metrics.add_gauge("db_sessions_inflight", -1)
+            metrics.observe("db_session_seconds", time.perf_counter() - started)
+
+
+async def close_db():
+    """Dispose of the engine's pooled connections (pooled mode keeps them open)."""
+    global _engine, _async_session_maker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _async_session_maker = None
 
 
 async def init_db():
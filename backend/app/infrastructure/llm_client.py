@@ -0,0 +1,83 @@
+"""
+Factory for OpenAI-compatible LLM clients.
+Every client shares the adaptive upstream limiter and the provider pool
+(hedging, failover) through its HTTP transport. The OpenAI SDK is imported
+on first use so importing the app (cold start, /health) doesn't pay for it.
+"""
+import os
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.infrastructure.llm_limiter import LimitedTransport
+from app.infrastructure.llm_providers import HedgingTransport, get_provider_pair
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+_clients: Dict[Tuple[str, str], "AsyncOpenAI"] = {}
+
+
+def _resolve_provider(provider: Optional[str]) -> str:
+    """Use OpenRouter when selected and configured, otherwise direct OpenAI."""
+    if provider:
+        return provider
+    if settings.LLM_PROVIDER == "openrouter" and settings.OPENROUTER_API_KEY:
+        return "openrouter"
+    return "openai"
+
+
+def get_llm_model(provider: Optional[str] = None) -> str:
+    """Model name for a provider (defaults to LLM_PROVIDER), without building a client."""
+    if _resolve_provider(provider) == "openrouter":
+        return settings.OPENROUTER_MODEL
+    return settings.OPENAI_MODEL
+
+
+def get_llm_client(service: str, provider: Optional[str] = None) -> Tuple["AsyncOpenAI", str]:
+    """
+    Get the shared LLM client and model name for a service.
+
+    Args:
+        service: Caller name, used for limiter priority and metrics labels
+        provider: Force "openrouter" or "openai"; defaults to LLM_PROVIDER
+
+    Returns:
+        Tuple of (client, model)
+    """
+    provider = _resolve_provider(provider)
+    model = get_llm_model(provider)
+
+    key = (service, provider)
+    if key not in _clients:
+        from openai import AsyncOpenAI
+
+        # Hedge to the other provider when it is configured, else talk to this one directly
+        primary, secondary = get_provider_pair(provider)
+        upstream = HedgingTransport(primary, secondary) if secondary else primary.transport
+        http_client = httpx.AsyncClient(transport=LimitedTransport(service, transport=upstream))
+        if provider == "openrouter":
+            _clients[key] = AsyncOpenAI(
+                api_key=settings.OPENROUTER_API_KEY,
+                base_url=settings.OPENROUTER_BASE_URL,
+                default_headers={
+                    "HTTP-Referer": os.getenv("OPENROUTER_REFERER", "http://localhost:3000"),
+                    "X-Title": os.getenv("OPENROUTER_APP_TITLE", "AI Book Assistant"),
+                },
+                http_client=http_client,
+            )
+        else:
+            _clients[key] = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+
+    return _clients[key], model
+
+
+def __getattr__(name: str):
+    # Lets routes write `except llm_client.RateLimitError` without importing openai
+    # up front; the except clause only evaluates this once an exception reaches it
+    if name == "RateLimitError":
+        from openai import RateLimitError
+
+        return RateLimitError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
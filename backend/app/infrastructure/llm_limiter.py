@@ -0,0 +1,236 @@
+"""
+Adaptive concurrency limiter for upstream LLM calls.
+AIMD: the limit grows by one per window of fast successes and is cut
+multiplicatively on 429s or slow responses. Waiters queue by priority.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.timing import record_span
+
+# Lower number wins: interactive chat ahead of personalization ahead of bulk translation
+PRIORITY_CHAT = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BULK = 2
+
+SERVICE_PRIORITIES = {
+    "agent": PRIORITY_CHAT,
+    "RAGService": PRIORITY_CHAT,
+    "PersonalizationService": PRIORITY_INTERACTIVE,
+    "TranslationService": PRIORITY_BULK,
+    "SummaryService": PRIORITY_BULK,
+}
+
+# Retry-After on the synthetic 429 the OpenAI client sees when the wait queue is full
+QUEUE_FULL_RETRY_AFTER_SECONDS = 1
+# Retry-After the API returns to browsers once the client has given up retrying
+UPSTREAM_BUSY_RETRY_AFTER_SECONDS = 5
+
+
+class LimiterQueueFull(Exception):
+    """Raised when the limiter's wait queue is at capacity."""
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter with a bounded priority wait queue."""
+
+    def __init__(
+        self,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        max_queue: int,
+        latency_target: float,
+        backoff: float = 0.5,
+        slow_backoff: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.max_queue = max_queue
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.slow_backoff = slow_backoff
+        self.inflight = 0
+        self.queued = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._publish()
+
+    async def acquire(self, priority: int = PRIORITY_CHAT, service: str = "unknown"):
+        """Wait for a slot. Raises LimiterQueueFull if the queue is at capacity."""
+        if not self._waiters and self.inflight < int(self.limit):
+            self.inflight += 1
+            self._publish()
+            return
+
+        if self.queued >= self.max_queue:
+            metrics.inc("llm_limiter_rejected_total", service=service)
+            raise LimiterQueueFull(f"LLM wait queue full ({self.max_queue} waiting)")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.queued += 1
+        self._publish()
+        started = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted as we were cancelled: hand it on
+                self.inflight -= 1
+                self._wake()
+            else:
+                self.queued -= 1
+                self._publish()
+            raise
+        metrics.observe("llm_limiter_wait_seconds", time.perf_counter() - started, service=service)
+
+    def release(self, latency: float, throttled: bool = False, error: bool = False):
+        """Return a slot and adapt the limit to what the upstream just told us."""
+        self.inflight -= 1
+        if throttled:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            metrics.inc("llm_limiter_throttled_total")
+        elif error:
+            pass  # Connection errors say nothing about upstream capacity
+        elif latency > self.latency_target:
+            self.limit = max(self.min_limit, self.limit * self.slow_backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.inflight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # Cancelled while waiting
+            self.queued -= 1
+            self.inflight += 1
+            future.set_result(None)
+        self._publish()
+
+    def _publish(self):
+        metrics.set_gauge("llm_limiter_limit", self.limit)
+        metrics.set_gauge("llm_limiter_inflight", self.inflight)
+        metrics.set_gauge("llm_limiter_queue_depth", self.queued)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that frees the limiter slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class LimitedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that runs every request through the shared limiter."""
+
+    def __init__(
+        self,
+        service: str,
+        limiter: Optional[AdaptiveLimiter] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.service = service
+        self.priority = SERVICE_PRIORITIES.get(service, PRIORITY_INTERACTIVE)
+        self._limiter = limiter
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        return self._limiter or get_llm_limiter()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self.limiter
+        try:
+            await limiter.acquire(self.priority, self.service)
+        except LimiterQueueFull as e:
+            # Shaped like an upstream 429 so the OpenAI client backs off and retries
+            return httpx.Response(
+                429,
+                headers={"retry-after": str(QUEUE_FULL_RETRY_AFTER_SECONDS)},
+                json={"error": {"message": str(e), "type": "rate_limit_exceeded"}},
+                request=request,
+            )
+
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            duration = time.perf_counter() - started
+            limiter.release(duration, error=True)
+            record_span("llm_completion", duration)
+            metrics.observe(
+                "upstream_request_seconds",
+                duration,
+                upstream="llm_completion",
+                service=self.service,
+                outcome="error",
+            )
+            raise
+
+        latency = time.perf_counter() - started
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                limiter.release(latency, throttled=response.status_code == 429)
+                # Through the end of the body, unlike the time-to-headers the limiter adapts on
+                duration = time.perf_counter() - started
+                record_span("llm_completion", duration)
+                metrics.observe(
+                    "upstream_request_seconds",
+                    duration,
+                    upstream="llm_completion",
+                    service=self.service,
+                    outcome="ok" if response.status_code < 400 else "error",
+                )
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+_limiter: Optional[AdaptiveLimiter] = None
+
+
+def get_llm_limiter() -> AdaptiveLimiter:
+    """Get the process-wide LLM limiter."""
+    global _limiter
+    if _limiter is None:
+        _limiter = AdaptiveLimiter(
+            initial_limit=settings.LLM_INITIAL_CONCURRENCY,
+            min_limit=settings.LLM_MIN_CONCURRENCY,
+            max_limit=settings.LLM_MAX_CONCURRENCY,
+            max_queue=settings.LLM_MAX_QUEUE,
+            latency_target=settings.LLM_LATENCY_TARGET_SECONDS,
+        )
+    return _limiter
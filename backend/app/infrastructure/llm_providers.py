@@ -0,0 +1,303 @@
+"""
+LLM provider pool with hedged requests and circuit-breaker failover.
+Chat completions go to the primary provider. If it is slower than its own
+recent p95, a duplicate goes to the secondary and the first good answer wins.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple, Union
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# Recent latencies kept per provider for the p95 estimate
+LATENCY_WINDOW = 200
+# Samples needed before the observed p95 replaces the default hedge delay
+MIN_LATENCY_SAMPLES = 20
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker; half-open after the reset timeout."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a request may be sent to this provider now."""
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+        return self.state != self.OPEN
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        # A failed trial while half-open re-opens immediately
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class Provider:
+    """An OpenAI-compatible upstream with its own connection pool and health state."""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: str,
+        model: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        accepts_cache_control: bool = False,
+    ):
+        self.name = name
+        self.base_url = httpx.URL(base_url.rstrip("/") + "/")
+        self.api_key = api_key
+        self.model = model
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.breaker = breaker or CircuitBreaker(
+            settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            settings.LLM_CIRCUIT_RESET_SECONDS,
+        )
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        # Only OpenRouter understands Anthropic cache_control breakpoints in content parts
+        self.accepts_cache_control = accepts_cache_control
+
+    def p95(self) -> Optional[float]:
+        """95th percentile of recent successful latencies, if enough were seen."""
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def record(self, latency: Optional[float], ok: bool):
+        if ok:
+            self.latencies.append(latency)
+            self.breaker.record_success()
+            metrics.observe("llm_provider_latency_seconds", latency, provider=self.name)
+        else:
+            self.breaker.record_failure()
+        metrics.inc("llm_provider_requests_total", provider=self.name, outcome="ok" if ok else "error")
+        metrics.set_gauge(
+            "llm_provider_circuit_open",
+            0 if self.breaker.state == CircuitBreaker.CLOSED else 1,
+            provider=self.name,
+        )
+
+    async def open_connection(self):
+        """Open a pooled connection to the provider (startup warm-up; no completion is made)."""
+        response = await self.transport.handle_async_request(httpx.Request("HEAD", self.base_url))
+        try:
+            await response.aread()  # Any status will do; reading the body returns the connection to the pool
+        finally:
+            await response.aclose()
+
+    def rewrite(self, request: httpx.Request, origin: "Provider") -> httpx.Request:
+        """Re-target a request built for origin at this provider."""
+        if origin is self:
+            return request
+        path, base_path = request.url.path, origin.base_url.path
+        suffix = path[len(base_path):] if path.startswith(base_path) else path.lstrip("/")
+        body = json.loads(request.content or b"{}")
+        body["model"] = self.model
+        if not self.accepts_cache_control:
+            _strip_cache_control(body)
+        headers = {
+            k: v for k, v in request.headers.items()
+            if k.lower() not in ("host", "content-length", "authorization")
+        }
+        headers["authorization"] = f"Bearer {self.api_key}"
+        return httpx.Request(
+            request.method,
+            self.base_url.join(suffix),
+            headers=headers,
+            content=json.dumps(body).encode(),
+            extensions=request.extensions,
+        )
+
+
+def _strip_cache_control(body: dict):
+    """Drop cache_control from content parts (and system/tools) for providers that reject it."""
+    for item in body.get("messages", []) + body.get("tools", []):
+        item.pop("cache_control", None)
+        if isinstance(item.get("content"), list):
+            for part in item["content"]:
+                if isinstance(part, dict):
+                    part.pop("cache_control", None)
+
+
+def _is_healthy(response: httpx.Response) -> bool:
+    """Provider health for the circuit breaker: a 4xx is the request's fault, not the provider's."""
+    return response.status_code < 500 and response.status_code != 429
+
+
+def _is_success(response: httpx.Response) -> bool:
+    """Only a 2xx can win the race."""
+    return 200 <= response.status_code < 300
+
+
+Outcome = Union[httpx.Response, BaseException]
+
+
+class HedgingTransport(httpx.AsyncBaseTransport):
+    """
+    Sends chat completions to the primary provider, hedging to the secondary.
+
+    - Primary slower than its p95 (or the default delay): duplicate to secondary
+    - Primary fails (5xx, 429, connection error): fail over to secondary at once
+    - First 2xx response wins, the other request is cancelled; a non-2xx
+      answer only counts once no other request is still in flight
+    - Providers with an open circuit are skipped
+    """
+
+    def __init__(
+        self,
+        primary: Provider,
+        secondary: Provider,
+        default_delay: Optional[float] = None,
+        min_delay: Optional[float] = None,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.default_delay = default_delay if default_delay is not None else settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        self.min_delay = min_delay if min_delay is not None else settings.LLM_HEDGE_MIN_DELAY_SECONDS
+
+    def hedge_delay(self, provider: Provider) -> float:
+        p95 = provider.p95()
+        return max(self.min_delay, p95 if p95 is not None else self.default_delay)
+
+    async def _send(self, provider: Provider, request: httpx.Request) -> httpx.Response:
+        outgoing = provider.rewrite(request, self.primary)
+        started = time.perf_counter()
+        try:
+            response = await provider.transport.handle_async_request(outgoing)
+        except asyncio.CancelledError:
+            raise  # Lost the race; says nothing about provider health
+        except Exception:
+            provider.record(None, ok=False)
+            raise
+        provider.record(time.perf_counter() - started, ok=_is_healthy(response))
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "POST" or not request.url.path.endswith("/chat/completions"):
+            return await self.primary.transport.handle_async_request(request)
+
+        await request.aread()
+        candidates = [p for p in (self.primary, self.secondary) if p.breaker.allow()]
+        if not candidates:
+            candidates = [self.primary]  # Everything is open: still try rather than fail fast
+        first, backup = candidates[0], (candidates[1] if len(candidates) > 1 else None)
+        if first is not self.primary:
+            metrics.inc("llm_provider_failovers_total", reason="circuit_open")
+
+        tasks = {asyncio.create_task(self._send(first, request)): first}
+        delay = self.hedge_delay(first)
+        last_failure: Optional[Outcome] = None
+
+        try:
+            while tasks:
+                wait_for = delay if backup else None
+                done, _ = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # First provider is slow: hedge to the backup
+                    metrics.inc("llm_hedges_total", provider=backup.name)
+                    tasks[asyncio.create_task(self._send(backup, request))] = backup
+                    backup = None
+                    continue
+
+                for task in done:
+                    provider = tasks.pop(task)
+                    outcome: Outcome = task.exception() or task.result()
+                    if isinstance(outcome, httpx.Response) and _is_success(outcome):
+                        if provider is not first:
+                            metrics.inc("llm_hedge_wins_total", provider=provider.name)
+                        if isinstance(last_failure, httpx.Response):
+                            await last_failure.aclose()
+                        return outcome
+
+                    if isinstance(last_failure, httpx.Response):
+                        await last_failure.aclose()
+                    last_failure = outcome
+
+                    if isinstance(outcome, httpx.Response) and _is_healthy(outcome) and not tasks:
+                        # A 4xx with nothing left in flight is the answer (failing over would repeat it)
+                        return outcome
+
+                if backup:
+                    # First provider failed outright: fail over without waiting
+                    metrics.inc("llm_provider_failovers_total", reason="error")
+                    tasks[asyncio.create_task(self._send(backup, request))] = backup
+                    backup = None
+        finally:
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                try:
+                    loser = await task
+                except BaseException:
+                    continue
+                await loser.aclose()
+
+        if isinstance(last_failure, BaseException):
+            raise last_failure
+        return last_failure
+
+    async def aclose(self):
+        await self.primary.transport.aclose()
+        await self.secondary.transport.aclose()
+
+
+_providers: dict = {}
+
+
+def _build_provider(name: str) -> Provider:
+    if name == "openrouter":
+        return Provider(
+            "openrouter",
+            settings.OPENROUTER_BASE_URL,
+            settings.OPENROUTER_API_KEY,
+            settings.OPENROUTER_MODEL,
+            accepts_cache_control=True,
+        )
+    return Provider("openai", "https://api.openai.com/v1", settings.OPENAI_API_KEY, settings.OPENAI_MODEL)
+
+
+def get_provider_pair(primary: str) -> Tuple[Provider, Optional[Provider]]:
+    """
+    Get the shared (primary, secondary) providers for a primary provider name.
+
+    The secondary is None when hedging is disabled or the other provider has no key.
+    """
+    secondary = "openai" if primary == "openrouter" else "openrouter"
+    for name in (primary, secondary):
+        if name not in _providers:
+            _providers[name] = _build_provider(name)
+
+    secondary_key = settings.OPENAI_API_KEY if secondary == "openai" else settings.OPENROUTER_API_KEY
+    if not settings.LLM_HEDGING_ENABLED or not secondary_key:
+        return _providers[primary], None
+    return _providers[primary], _providers[secondary]
+
+
+async def open_provider_connections() -> List[str]:
+    """Open a pooled connection to every provider in use that has a key; returns their names."""
+    providers = [p for p in _providers.values() if p.api_key]
+    await asyncio.gather(*(p.open_connection() for p in providers))
+    return [p.name for p in providers]
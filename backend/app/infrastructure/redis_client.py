@@ -0,0 +1,26 @@
+"""
+Shared Redis client (optional).
+Everything that uses Redis must keep working, in a degraded single-worker
+form, when REDIS_URL is not configured.
+"""
+from app.core.config import settings
+
+_redis = None
+
+
+def get_redis():
+    """Get the shared redis.asyncio client, or None when REDIS_URL is unset."""
+    global _redis
+    if _redis is None and settings.REDIS_URL:
+        import redis.asyncio as redis
+
+        _redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+async def close_redis():
+    """Close the shared client's connections."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -1,34 +1,41 @@
 """
 Vector store implementation using Qdrant.
+qdrant_client is imported on first use; it dominates the app's import time.
 """
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 import uuid
 
-from qdrant_client import AsyncQdrantClient
-from qdrant_client.models import (
-    VectorParams,
-    Distance,
-    PointStruct,
-    Filter,
-    FieldCondition,
-    MatchValue,
-)
-
 from app.core.config import settings
+from app.core.metrics import upstream_call
+
+
+def chapter_filter(chapter_id: str):
+    """Qdrant filter matching one chapter's points."""
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+    return Filter(must=[FieldCondition(key="chapter_id", match=MatchValue(value=chapter_id))])
 
 
 class VectorStore:
     """Qdrant vector store wrapper."""
 
     def __init__(self):
-        self.client = AsyncQdrantClient(
+        self.collection_name = settings.QDRANT_COLLECTION
+
+    @cached_property
+    def client(self):
+        from qdrant_client import AsyncQdrantClient
+
+        return AsyncQdrantClient(
             url=settings.QDRANT_URL,
             api_key=settings.QDRANT_API_KEY if settings.QDRANT_API_KEY else None,
         )
-        self.collection_name = settings.QDRANT_COLLECTION
 
     async def ensure_collection(self, vector_size: int = 1536):
         """Ensure the collection exists."""
+        from qdrant_client.models import Distance, VectorParams
+
         collections = await self.client.get_collections()
         exists = any(c.name == self.collection_name for c in collections.collections)
 
@@ -46,8 +53,11 @@ class VectorStore:
         vectors: List[List[float]],
         payloads: List[Dict[str, Any]],
         ids: Optional[List[str]] = None,
+        service: str = "unknown",
     ):
-        """Insert or update vectors."""
+        """Insert or update vectors (service labels the upstream metrics)."""
+        from qdrant_client.models import PointStruct
+
         if ids is None:
             ids = [str(uuid.uuid4()) for _ in vectors]
 
@@ -56,35 +66,29 @@ class VectorStore:
             for id, vector, payload in zip(ids, vectors, payloads)
         ]
 
-        await self.client.upsert(
-            collection_name=self.collection_name,
-            points=points,
-        )
+        with upstream_call("qdrant_upsert", service):
+            await self.client.upsert(
+                collection_name=self.collection_name,
+                points=points,
+            )
 
     async def search(
         self,
         query_vector: List[float],
         limit: int = 5,
         filter_chapter: Optional[str] = None,
+        service: str = "unknown",
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors."""
-        query_filter = None
-        if filter_chapter:
-            query_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="chapter_id",
-                        match=MatchValue(value=filter_chapter),
-                    )
-                ]
-            )
+        """Search for similar vectors (service labels the upstream metrics)."""
+        query_filter = chapter_filter(filter_chapter) if filter_chapter else None
 
-        results = await self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_vector,
-            limit=limit,
-            query_filter=query_filter,
-        )
+        with upstream_call("qdrant_search", service):
+            results = await self.client.search(
+                collection_name=self.collection_name,
+                query_vector=query_vector,
+                limit=limit,
+                query_filter=query_filter,
+            )
 
         return [
             {
@@ -99,14 +103,7 @@ class VectorStore:
         """Delete all vectors for a chapter."""
         await self.client.delete(
             collection_name=self.collection_name,
-            points_selector=Filter(
-                must=[
-                    FieldCondition(
-                        key="chapter_id",
-                        match=MatchValue(value=chapter_id),
-                    )
-                ]
-            ),
+            points_selector=chapter_filter(chapter_id),
         )
 
 
@@ -3,13 +3,26 @@ AI-Powered Book Platform - FastAPI Backend
 Optimized for Vercel serverless deployment
 """
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.routes import auth, chat, content
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics, render_prometheus
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.responses import ORJSONResponse
+from app.core.security import password_hasher
+from app.core.timing import ServerTimingMiddleware
+from app.core.user_cache import listen_for_invalidations
+from app.core.warmup import run_warmup, warmup_state
+from app.infrastructure.database import close_db
+from app.infrastructure.redis_client import close_redis
 
 
 # Initialize database connection globally to reuse between requests
@@ -21,11 +34,23 @@ async def lifespan(app: FastAPI):
     
     # Initialize any required resources here
     # Note: In serverless environment, we minimize startup operations
-    
+
+    # Cross-worker user cache invalidation (no-op without REDIS_URL)
+    invalidation_listener = asyncio.create_task(listen_for_invalidations())
+
+    # Long-running deployments warm clients and pools in the background; /ready waits for it
+    warmup = asyncio.create_task(run_warmup()) if settings.WARMUP_ENABLED else None
+
     yield
-    
+
     # Shutdown
     print("Shutting down AI Book Platform API...")
+    invalidation_listener.cancel()
+    if warmup is not None:
+        warmup.cancel()
+    password_hasher.shutdown()
+    await close_redis()
+    await close_db()
 
 
 app = FastAPI(
@@ -35,6 +60,18 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Rate limiting sits inside CORS so browsers can read the 429 and its Retry-After
+app.add_middleware(RateLimitMiddleware)
+
+# Per-route latency and in-flight requests for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Server-Timing breakdown (embedding, search, LLM, tools, DB) on chat/content responses
+app.add_middleware(ServerTimingMiddleware)
+
+# Brotli/gzip for large bodies (session histories, translated chapters)
+app.add_middleware(CompressionMiddleware)
+
 # CORS middleware - configured for Vercel deployment
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +79,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "Server-Timing", "ETag"],
 )
 
 # Include routers
@@ -63,10 +101,27 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (liveness)."""
     return {"status": "healthy", "deployment": "vercel"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 until the startup warm-up (WARMUP_ENABLED) has finished."""
+    return ORJSONResponse(warmup_state.report(), status_code=200 if warmup_state.ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(authorization: Optional[str] = Header(default=None)):
+    """Prometheus scrape endpoint for this worker's metrics."""
+    if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(
+        render_prometheus(metrics.snapshot()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # Add exception handlers for better serverless error reporting
 @app.exception_handler(500)
 async def internal_exception_handler(request, exc):
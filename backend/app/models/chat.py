@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 
@@ -23,14 +23,30 @@ class ChatSession(Base):
     __tablename__ = "chat_sessions"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
     title = Column(String, default="New Chat")  # Auto-generated from first message
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    message_count = Column(Integer, nullable=False, default=0)  # Maintained on every message insert
+    last_message_at = Column(DateTime, nullable=True)
+    summary = Column(Text, nullable=True)  # Rolling summary of turns older than the recent window
+    summarized_until = Column(DateTime, nullable=True)  # created_at of the last message in the summary
 
     # Relationships
     user = relationship("User", backref="chat_sessions")
-    messages = relationship("ChatMessage", back_populates="session", order_by="ChatMessage.created_at", cascade="all, delete-orphan")
+    # passive_deletes: the database's ON DELETE CASCADE removes messages, the ORM never loads them to delete
+    messages = relationship(
+        "ChatMessage",
+        back_populates="session",
+        order_by="ChatMessage.created_at",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # Keyset pagination of a user's sessions by (updated_at, id)
+        Index('idx_chat_sessions_user_updated', 'user_id', 'updated_at', 'id'),
+    )
 
 
 class ChatMessage(Base):
@@ -39,7 +55,7 @@ class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    session_id = Column(String, ForeignKey("chat_sessions.id"), nullable=False, index=True)
+    session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
     role = Column(SQLEnum(MessageRole), nullable=False)
     content = Column(Text, nullable=False)
     model = Column(String, nullable=True)  # Which AI model was used
@@ -47,3 +63,8 @@ class ChatMessage(Base):
 
     # Relationship
     session = relationship("ChatSession", back_populates="messages")
+
+    __table_args__ = (
+        # Serves "latest N messages of a session" without a sort; also covers session_id lookups
+        Index('idx_chat_messages_session_created', 'session_id', 'created_at', 'id'),
+    )
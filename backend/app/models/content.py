@@ -17,7 +17,7 @@ class CachedContent(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, nullable=True, index=True)
     chapter_id = Column(String, nullable=False, index=True)
-    content_type = Column(String, nullable=False)  # "personalized" or "translated_ur"
+    content_type = Column(String, nullable=False)  # "personalized", "translated_ur" or "translated_ur:<source hash>" (shared)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     expires_at = Column(DateTime, nullable=True)
@@ -4,7 +4,7 @@ Chat schemas.
 from typing import Optional, List
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Citation(BaseModel):
@@ -28,6 +28,7 @@ class ChatRequest(BaseModel):
     chapter_id: Optional[str] = None
     session_id: Optional[str] = None  # For persistent chat
     conversation_history: Optional[List[ChatMessage]] = None  # Previous messages for memory
+    include_trace: bool = False  # Return the agent's per-run trace (LLM turns, tool timings)
 
 
 class ChatResponse(BaseModel):
@@ -42,6 +43,11 @@ class ChatSessionCreate(BaseModel):
     title: Optional[str] = "New Chat"
 
 
+class ChatSessionBulkDelete(BaseModel):
+    """Delete several chat sessions at once."""
+    session_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
 class ChatMessageResponse(BaseModel):
     """Response for a single message."""
     id: str
@@ -61,18 +67,32 @@ class ChatSessionResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     message_count: int = 0
+    last_message_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class ChatSessionPage(BaseModel):
+    """A page of sessions, most recently updated first, with the cursor for the next page."""
+    sessions: List[ChatSessionResponse] = []
+    next_cursor: Optional[str] = None
+
+
 class ChatSessionDetail(BaseModel):
-    """Detailed chat session with messages."""
+    """Detailed chat session with its most recent messages."""
     id: str
     title: str
     created_at: datetime
     updated_at: datetime
     messages: List[ChatMessageResponse] = []
+    next_cursor: Optional[str] = None  # Pass to /messages to load older messages
 
     class Config:
         from_attributes = True
+
+
+class ChatMessagePage(BaseModel):
+    """A page of messages, oldest first, with the cursor for the page before it."""
+    messages: List[ChatMessageResponse] = []
+    next_cursor: Optional[str] = None
@@ -1,11 +1,19 @@
-from app.services.rag_service import RAGService
-from app.services.personalization_service import PersonalizationService
-from app.services.translation_service import TranslationService
-from app.services.embedding_service import EmbeddingService
-
-__all__ = [
-    "RAGService",
-    "PersonalizationService",
-    "TranslationService",
-    "EmbeddingService",
-]
+import importlib
+
+# Exported lazily so importing one service doesn't import (and build) all of them
+_EXPORTS = {
+    "RAGService": "app.services.rag_service",
+    "PersonalizationService": "app.services.personalization_service",
+    "TranslationService": "app.services.translation_service",
+    "EmbeddingService": "app.services.embedding_service",
+    "ChatHistoryService": "app.services.chat_history_service",
+    "SummaryService": "app.services.summary_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
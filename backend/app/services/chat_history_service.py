@@ -0,0 +1,79 @@
+"""
+Chat history service for loading stored conversation context.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.chat import ChatMessage, ChatSession
+
+
+class ChatHistoryService:
+    """Service for storing messages and reading bounded slices of a session's history."""
+
+    async def append_messages(self, db: AsyncSession, session_id: str, *messages: ChatMessage):
+        """
+        Add messages to a session and bump its counters in the same transaction.
+
+        The counter update is a single relative UPDATE, so concurrent turns on
+        the same session don't lose increments. Messages are stamped with
+        strictly increasing created_at values, so a turn's question always
+        sorts before its answer. The caller commits.
+
+        Args:
+            db: Database session
+            session_id: Chat session ID
+            messages: New ChatMessage rows for the session
+        """
+        now = datetime.utcnow()
+        for offset, message in enumerate(messages):
+            message.created_at = now + timedelta(microseconds=offset)
+        db.add_all(messages)
+        await db.execute(
+            update(ChatSession)
+            .where(ChatSession.id == session_id)
+            .values(
+                message_count=ChatSession.message_count + len(messages),
+                last_message_at=messages[-1].created_at if messages else now,
+                updated_at=now,
+            )
+        )
+
+    async def recent_messages(
+        self,
+        db: AsyncSession,
+        session_id: str,
+        limit: Optional[int] = None,
+        after: Optional[datetime] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Get the most recent messages of a session, oldest first.
+
+        Reads only the newest `limit` rows through the (session_id, created_at)
+        index, so the cost does not grow with the length of the session.
+
+        Args:
+            db: Database session
+            session_id: Chat session ID
+            limit: Maximum number of messages (defaults to CHAT_HISTORY_MESSAGES)
+            after: Only messages newer than this (e.g. ChatSession.summarized_until)
+
+        Returns:
+            List of {"role", "content"} dicts
+        """
+        limit = limit or settings.CHAT_HISTORY_MESSAGES
+        query = select(ChatMessage.role, ChatMessage.content).where(ChatMessage.session_id == session_id)
+        if after is not None:
+            query = query.where(ChatMessage.created_at > after)
+        result = await db.execute(
+            query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit)
+        )
+        rows = result.all()
+        return [{"role": row.role.value, "content": row.content} for row in reversed(rows)]
+
+
+# Global instance
+chat_history_service = ChatHistoryService()
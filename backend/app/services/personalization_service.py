@@ -1,14 +1,15 @@
 """
 Content personalization service.
 """
+from functools import cached_property
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
-from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.config import settings
+from app.core.metrics import completion_usage, metrics, record_llm_usage
+from app.infrastructure.llm_client import get_llm_client, get_llm_model
 from app.models.content import CachedContent
 
 
@@ -16,17 +17,12 @@ class PersonalizationService:
     """Service for personalizing book content."""
 
     def __init__(self):
-        # Use OpenRouter or OpenAI based on LLM_PROVIDER setting
-        if settings.LLM_PROVIDER == "openrouter" and settings.OPENROUTER_API_KEY:
-            self.client = AsyncOpenAI(
-                api_key=settings.OPENROUTER_API_KEY,
-                base_url=settings.OPENROUTER_BASE_URL,
-            )
-            self.model = settings.OPENROUTER_MODEL
-        else:
-            # Fallback to direct OpenAI
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            self.model = settings.OPENAI_MODEL
+        self.model = get_llm_model()
+
+    @cached_property
+    def client(self):
+        # Use OpenRouter or OpenAI based on LLM_PROVIDER setting (shared upstream limiter)
+        return get_llm_client("PersonalizationService")[0]
 
     async def personalize_content(
         self,
@@ -51,9 +47,13 @@ class PersonalizationService:
 
         # Check cache first
         cached = await self._get_cached(db, user_id, chapter_id, "personalized")
+        metrics.inc("content_cache_requests_total", service="PersonalizationService", result="hit" if cached else "miss")
         if cached:
             return cached
 
+        # Release the connection while the LLM call runs; the cache write opens a new transaction
+        await db.commit()
+
         # Generate personalized content
         prompt = self._build_personalization_prompt(content, user_profile)
 
@@ -80,6 +80,7 @@ Rules:
         )
 
         personalized = response.choices[0].message.content
+        record_llm_usage("PersonalizationService", completion_usage(response))
 
         # Cache the result
         await self._cache_content(
@@ -136,8 +137,11 @@ Personalized Content:"""
                 CachedContent.chapter_id == chapter_id,
                 CachedContent.content_type == content_type,
             )
+            # Concurrent misses can each insert a row; the first one written wins
+            .order_by(CachedContent.created_at)
+            .limit(1)
         )
-        cached = result.scalar_one_or_none()
+        cached = result.scalars().first()
 
         if cached:
             if cached.expires_at and cached.expires_at < datetime.utcnow():
@@ -1,30 +1,42 @@
 """
 RAG (Retrieval-Augmented Generation) service.
 """
+from functools import cached_property
 from typing import Optional, Dict, Any, List
 
-from openai import AsyncOpenAI
-
-from app.core.config import settings
-from app.services.embedding_service import embedding_service
+from app.core.metrics import completion_usage, record_llm_usage
+from app.core.token_budget import TokenBudget, truncate_to_tokens
+from app.infrastructure.llm_client import get_llm_client, get_llm_model
 from app.infrastructure.vector_store import vector_store
+from app.services.embedding_service import embedding_service
+
+
+# Static instructions shared byte-for-byte by every RAG request
+RAG_SYSTEM_PROMPT = """You are a helpful AI assistant for an educational book about AI development.
+
+Answer questions based on the context from the book provided with each question. If the answer isn't in the context, say "I don't have information about that in the book."
+
+When citing information, reference the source numbers in brackets like [1], [2], etc.
 
+Topics covered in the book:
+- Chapter 1: AI Foundations (history, types of AI, ML basics)
+- Chapter 2: LLM Fundamentals (transformers, tokenization, APIs)
+- Chapter 3: Prompt Engineering (CRAFT framework, few-shot, chain-of-thought)
+- Chapter 4: RAG Systems (embeddings, vector databases, retrieval)
+- Chapter 5: AI Agents (function calling, agent loops, orchestration)
+- Chapter 6: Building AI Apps (full-stack development, deployment)
+"""
 
 class RAGService:
     """RAG service for question answering."""
 
     def __init__(self):
-        # Use OpenRouter or OpenAI based on LLM_PROVIDER setting
-        if settings.LLM_PROVIDER == "openrouter" and settings.OPENROUTER_API_KEY:
-            self.client = AsyncOpenAI(
-                api_key=settings.OPENROUTER_API_KEY,
-                base_url=settings.OPENROUTER_BASE_URL,
-            )
-            self.model = settings.OPENROUTER_MODEL
-        else:
-            # Fallback to direct OpenAI
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            self.model = settings.OPENAI_MODEL
+        self.model = get_llm_model()
+
+    @cached_property
+    def client(self):
+        # Use OpenRouter or OpenAI based on LLM_PROVIDER setting (shared upstream limiter)
+        return get_llm_client("RAGService")[0]
 
     async def query(
         self,
@@ -45,33 +57,48 @@ class RAGService:
             top_k: Number of documents to retrieve
 
         Returns:
-            Dict with answer and citations
+            Dict with answer, citations, model and token usage
         """
+        budget = TokenBudget()
+
         # Build the query with selected text context
         full_query = query
         if selected_text:
-            full_query = f"Regarding this text: '{selected_text[:500]}'\n\nQuestion: {query}"
+            selected_share = int(budget.total_tokens * budget.shares["selected_text"])
+            full_query = f"Regarding this text: '{truncate_to_tokens(selected_text, selected_share)}'\n\nQuestion: {query}"
 
         # Get query embedding
-        query_embedding = await embedding_service.get_embedding(full_query)
+        query_embedding = await embedding_service.get_embedding(full_query, service="RAGService")
 
         # Search vector store
         results = await vector_store.search(
             query_vector=query_embedding,
             limit=top_k,
             filter_chapter=chapter_filter,
+            service="RAGService",
+        )
+
+        # Fit selected text and retrieved documents into the token budget
+        allocation = budget.allocate(
+            selected_text=selected_text,
+            retrieved=[
+                ((r.get("payload") or {}).get("text", ""), r.get("score", 0), r)
+                for r in results
+            ],
         )
 
         # Build context from retrieved documents
         context_parts = []
         citations = []
-        for i, result in enumerate(results):
-            payload = result.get("payload", {})
-            text = payload.get("text", "")
+        if allocation.selected_text:
+            context_parts.append(f"Text selected by the learner:\n\"{allocation.selected_text}\"")
+        for i, item in enumerate(allocation.retrieved):
+            result = item.payload
+            payload = result.get("payload") or {}
             chapter = payload.get("chapter_id", "unknown")
             source = payload.get("source", "Book Content")
 
-            context_parts.append(f"[{i + 1}] {text}")
+            context_parts.append(f"[{i + 1}] {item.text}")
             citations.append({
                 "id": i + 1,
                 "source": source,
@@ -81,58 +108,65 @@ class RAGService:
 
         context = "\n\n".join(context_parts)
 
-        # Build system prompt
-        system_prompt = self._build_system_prompt(context, user_profile)
-
-        # Generate response
+        # Static instructions first so every request shares a cacheable prefix;
+        # per-user profile, retrieved context and the question follow it
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": query},
+                {"role": "system", "content": self._build_system_prompt()},
+                {"role": "user", "content": self._build_user_prompt(query, context, user_profile)},
             ],
             temperature=0.7,
             max_tokens=1000,
         )
 
         answer = response.choices[0].message.content
+        usage = completion_usage(response)
+        record_llm_usage("RAGService", usage)
 
         return {
             "answer": answer,
             "citations": citations,
+            "model": self.model,
+            "usage": usage,
         }
 
-    def _build_system_prompt(
+    def _build_system_prompt(self):
+        """
+        Build the system prompt for the LLM.
+
+        Returns the same bytes for every request. Anthropic models behind
+        OpenRouter only cache prompts that carry an explicit breakpoint; at
+        about 200 tokens this prompt is under the 1024-token minimum prefix,
+        so the breakpoint only pays off if the prompt grows past it.
+        """
+        if self.model.startswith("anthropic/"):
+            return [{"type": "text", "text": RAG_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+        return RAG_SYSTEM_PROMPT
+
+    def _build_user_prompt(
         self,
+        query: str,
         context: str,
         user_profile: Optional[Dict[str, Any]] = None,
     ) -> str:
-        """Build the system prompt for the LLM."""
-        base_prompt = f"""You are a helpful AI assistant for an educational book about AI development.
-
-Answer questions based on the following context from the book. If the answer isn't in the context, say "I don't have information about that in the book."
-
-When citing information, reference the source numbers in brackets like [1], [2], etc.
-
-Context:
-{context}
-"""
+        """Build the per-request part of the prompt."""
+        parts = []
 
         # Add personalization if user profile exists
         if user_profile:
             level = user_profile.get("experience_level", "beginner")
             languages = user_profile.get("known_languages", [])
 
-            personalization = f"""
-
-Adjust your explanation for a {level} learner."""
-
+            personalization = f"Adjust your explanation for a {level} learner."
             if languages:
                 personalization += f" They are familiar with: {', '.join(languages)}."
+            parts.append(personalization)
 
-            base_prompt += personalization
+        parts.append(f"Context:\n{context}")
+        parts.append(f"Question: {query}")
 
-        return base_prompt
+        return "\n\n".join(parts)
 
 
 # Global instance
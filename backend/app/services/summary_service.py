@@ -0,0 +1,180 @@
+"""
+Conversation summary service for long chat sessions.
+Older turns are folded into a rolling summary stored on ChatSession, so the
+agent sees the summary plus the recent window instead of the full history.
+"""
+from functools import cached_property
+from typing import Any, Callable, List, Optional, Set
+
+from sqlalchemy import func, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import completion_usage, metrics, record_llm_usage
+from app.core.token_budget import truncate_to_tokens
+from app.infrastructure.database import get_async_session_maker
+from app.infrastructure.llm_client import get_llm_client, get_llm_model
+from app.models.chat import ChatMessage, ChatSession
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a tutoring conversation about an AI development book.
+
+Merge the new messages into the existing summary. Keep:
+- The learner's goals, level and preferences
+- Topics and chapters covered, with the key explanations given
+- Questions still open or promised follow-ups
+
+Write compact plain prose, third person, no preamble. Drop small talk and repetition."""
+
+# Each message is clipped before summarization so one huge answer can't crowd out the rest
+SUMMARY_MESSAGE_TOKEN_LIMIT = 300
+
+
+class SummaryService:
+    """Service for compacting old chat turns into a per-session summary."""
+
+    def __init__(self):
+        self.model = get_llm_model()
+        self._inflight: Set[str] = set()
+
+    @cached_property
+    def client(self):
+        # Bulk priority in the shared upstream limiter: never ahead of live chat
+        return get_llm_client("SummaryService")[0]
+
+    async def summarize(self, previous_summary: Optional[str], messages: List[Any]) -> str:
+        """
+        Fold messages into a previous summary.
+
+        Args:
+            previous_summary: Existing summary, if any
+            messages: Rows with role and content, oldest first
+
+        Returns:
+            The updated summary
+        """
+        transcript = "\n\n".join(
+            f"{row.role.value.upper()}: {truncate_to_tokens(row.content, SUMMARY_MESSAGE_TOKEN_LIMIT)}"
+            for row in messages
+        )
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Existing summary:\n{previous_summary or '(none)'}\n\n"
+                        f"New messages:\n{transcript}"
+                    ),
+                },
+            ],
+            temperature=0.2,
+            max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+        )
+        record_llm_usage("SummaryService", completion_usage(response))
+        return (response.choices[0].message.content or "").strip()
+
+    def history_limit(self) -> int:
+        """
+        Messages after the summary watermark loaded as history for a chat turn.
+
+        That is every unsummarized message: compaction keeps at most
+        CHAT_SUMMARY_TRIGGER_MESSAGES of them, so nothing falls between
+        the summary and the history the agent sees.
+        """
+        return max(settings.CHAT_HISTORY_MESSAGES, settings.CHAT_SUMMARY_TRIGGER_MESSAGES)
+
+    def needs_compaction(self, unsummarized: int) -> bool:
+        """Whether a session with this many unsummarized messages is due a compaction."""
+        return unsummarized > settings.CHAT_SUMMARY_TRIGGER_MESSAGES
+
+    async def compact_session(
+        self,
+        session_id: str,
+        session_maker: Optional[Callable[[], AsyncSession]] = None,
+    ) -> bool:
+        """
+        Compact a session's older turns into its summary if it has grown enough.
+
+        Meant to run as a background task after a chat turn that needs_compaction();
+        opens its own DB session. The newest CHAT_HISTORY_MESSAGES messages are always
+        left out of the summary.
+
+        Returns:
+            True if the summary was updated
+        """
+        if session_id in self._inflight:
+            return False
+        self._inflight.add(session_id)
+        try:
+            return await self._compact(session_id, session_maker or get_async_session_maker())
+        except Exception as e:
+            # A failed compaction only means the next turn retries it
+            print(f"Session summary error: {e}")
+            metrics.inc("chat_summary_compactions_total", outcome="error")
+            return False
+        finally:
+            self._inflight.discard(session_id)
+
+    async def _compact(self, session_id: str, session_maker: Callable[[], AsyncSession]) -> bool:
+        # Read, summarize, write: no connection is held during the LLM call
+        async with session_maker() as db:
+            result = await db.execute(
+                select(ChatSession.summary, ChatSession.summarized_until).where(ChatSession.id == session_id)
+            )
+            session = result.one_or_none()
+            if session is None:
+                return False
+
+            watermark = session.summarized_until
+            not_summarized = ChatMessage.created_at > watermark if watermark is not None else true()
+
+            pending = await db.scalar(
+                select(func.count())
+                .select_from(ChatMessage)
+                .where(ChatMessage.session_id == session_id, not_summarized)
+            )
+            if not self.needs_compaction(pending):
+                return False
+
+            fold = min(pending - settings.CHAT_HISTORY_MESSAGES, settings.CHAT_SUMMARY_BATCH_MESSAGES)
+            result = await db.execute(
+                select(ChatMessage.role, ChatMessage.content, ChatMessage.created_at)
+                .where(ChatMessage.session_id == session_id, not_summarized)
+                .order_by(ChatMessage.created_at.asc())
+                .limit(fold)
+            )
+            rows = result.all()
+
+        summary = await self.summarize(session.summary, rows)
+        if not summary:
+            return False
+
+        async with session_maker() as db:
+            # Guarded on the old watermark so concurrent workers can't fold the same turns twice;
+            # updated_at is kept so compaction doesn't reorder the session list
+            result = await db.execute(
+                update(ChatSession)
+                .where(ChatSession.id == session_id)
+                .where(
+                    ChatSession.summarized_until == watermark
+                    if watermark is not None
+                    else ChatSession.summarized_until.is_(None)
+                )
+                .values(
+                    summary=summary,
+                    summarized_until=rows[-1].created_at,
+                    updated_at=ChatSession.updated_at,
+                )
+            )
+            await db.commit()
+
+        updated = result.rowcount == 1
+        metrics.inc("chat_summary_compactions_total", outcome="ok" if updated else "conflict")
+        if updated:
+            metrics.inc("chat_summary_messages_folded_total", len(rows))
+        return updated
+
+
+# Global instance
+summary_service = SummaryService()
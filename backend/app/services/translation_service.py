@@ -2,32 +2,34 @@
 Translation service for Urdu support.
 """
 import re
+from functools import cached_property
 from typing import Optional
 from datetime import datetime, timedelta
 
-from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.config import settings
+from app.core.http_cache import content_hash
+from app.core.metrics import completion_usage, metrics, record_llm_usage
+from app.infrastructure.llm_client import get_llm_client, get_llm_model
 from app.models.content import CachedContent
 
 
+def shared_translation_key(content: str) -> str:
+    """CachedContent.content_type of the shared translation of this source text."""
+    return f"translated_ur:{content_hash(content)[:16]}"
+
+
 class TranslationService:
     """Service for translating book content to Urdu."""
 
     def __init__(self):
-        # Use OpenRouter or OpenAI based on LLM_PROVIDER setting
-        if settings.LLM_PROVIDER == "openrouter" and settings.OPENROUTER_API_KEY:
-            self.client = AsyncOpenAI(
-                api_key=settings.OPENROUTER_API_KEY,
-                base_url=settings.OPENROUTER_BASE_URL,
-            )
-            self.model = settings.OPENROUTER_MODEL
-        else:
-            # Fallback to direct OpenAI
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            self.model = settings.OPENAI_MODEL
+        self.model = get_llm_model()
+
+    @cached_property
+    def client(self):
+        # Use OpenRouter or OpenAI based on LLM_PROVIDER setting (shared upstream limiter)
+        return get_llm_client("TranslationService")[0]
 
     async def translate_to_urdu(
         self,
@@ -51,9 +53,53 @@ class TranslationService:
         # Check cache first
         if user_id:
             cached = await self._get_cached(db, user_id, chapter_id, "translated_ur")
+            metrics.inc("content_cache_requests_total", service="TranslationService", result="hit" if cached else "miss")
             if cached:
                 return cached
 
+        # Release the connection while the LLM call runs; the cache write opens a new transaction
+        await db.commit()
+        translated = await self._translate(content)
+
+        # Cache the result
+        if user_id:
+            await self._cache_content(
+                db,
+                user_id,
+                chapter_id,
+                "translated_ur",
+                translated
+            )
+
+        return translated
+
+    async def translate_shared(
+        self,
+        content: str,
+        chapter_id: str,
+        db: AsyncSession,
+    ) -> str:
+        """
+        Translate content to Urdu through a cache shared by all users.
+
+        Entries are keyed by a hash of the source text and never expire: a
+        given source always gets the same translation, so it can be served
+        with a strong ETag and cached by browsers and CDNs.
+        """
+        content_type = shared_translation_key(content)
+        cached = await self._get_cached(db, None, chapter_id, content_type)
+        metrics.inc("content_cache_requests_total", service="TranslationService", result="hit" if cached else "miss")
+        if cached:
+            return cached
+
+        # Release the connection while the LLM call runs
+        await db.commit()
+        translated = await self._translate(content)
+        await self._cache_content(db, None, chapter_id, content_type, translated, ttl_days=None)
+        return translated
+
+    async def _translate(self, content: str) -> str:
+        """Translate with the LLM, keeping code blocks out of the prompt."""
         # Extract and protect code blocks
         code_blocks = re.findall(r'```[\s\S]*?```', content)
         placeholders = [f"__CODE_BLOCK_{i}__" for i in range(len(code_blocks))]
@@ -89,39 +135,33 @@ Rules:
         )
 
         translated = response.choices[0].message.content
+        record_llm_usage("TranslationService", completion_usage(response))
 
         # Restore code blocks
         for placeholder, block in zip(placeholders, code_blocks):
             translated = translated.replace(placeholder, block)
 
-        # Cache the result
-        if user_id:
-            await self._cache_content(
-                db,
-                user_id,
-                chapter_id,
-                "translated_ur",
-                translated
-            )
-
         return translated
 
     async def _get_cached(
         self,
         db: AsyncSession,
-        user_id: str,
+        user_id: Optional[str],
         chapter_id: str,
         content_type: str,
     ) -> Optional[str]:
-        """Get cached content if exists and not expired."""
+        """Get cached content if exists and not expired (user_id None: the shared cache)."""
         result = await db.execute(
             select(CachedContent).where(
-                CachedContent.user_id == user_id,
+                CachedContent.user_id.is_(None) if user_id is None else CachedContent.user_id == user_id,
                 CachedContent.chapter_id == chapter_id,
                 CachedContent.content_type == content_type,
             )
+            # Concurrent misses can each insert a row; the first one written wins
+            .order_by(CachedContent.created_at)
+            .limit(1)
         )
-        cached = result.scalar_one_or_none()
+        cached = result.scalars().first()
 
         if cached:
             if cached.expires_at and cached.expires_at < datetime.utcnow():
@@ -135,11 +175,11 @@ Rules:
     async def _cache_content(
         self,
         db: AsyncSession,
-        user_id: str,
+        user_id: Optional[str],
         chapter_id: str,
         content_type: str,
         content: str,
-        ttl_days: int = 30,  # Longer cache for translations
+        ttl_days: Optional[int] = 30,  # Longer cache for translations; None never expires
     ):
         """Cache content with expiration."""
         cached = CachedContent(
@@ -147,7 +187,7 @@ Rules:
             chapter_id=chapter_id,
             content_type=content_type,
             content=content,
-            expires_at=datetime.utcnow() + timedelta(days=ttl_days),
+            expires_at=datetime.utcnow() + timedelta(days=ttl_days) if ttl_days is not None else None,
         )
         db.add(cached)
         await db.commit()
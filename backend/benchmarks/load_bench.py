@@ -0,0 +1,281 @@
+"""
+End-to-end load benchmark for the FastAPI app, fully offline.
+
+The app runs in-process behind httpx.ASGITransport. Upstream LLM calls go to
+the stub chat completions app (benchmarks.stubs), embeddings and vector search
+to in-memory stand-ins, and the database to a throwaway SQLite file.
+
+Usage (from backend/):
+    python -m benchmarks.load_bench --concurrency 16 --requests 200
+    python -m benchmarks.load_bench --scenarios chat_rag,chat_agent --llm-latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.stubs import (
+    FakeEmbeddingService,
+    InMemoryVectorStore,
+    create_stub_llm_app,
+    install_stubs,
+    seed_vector_store,
+)
+
+SIMPLE_QUESTIONS = [
+    "What is a large language model?",
+    "What is retrieval augmented generation?",
+    "Define prompt engineering",
+    "What are embeddings?",
+    "Explain what an AI agent is",
+]
+
+COMPLEX_QUESTIONS = [
+    "Compare RAG and fine-tuning for a documentation assistant",
+    "Give me a learning path from prompt engineering to building agents",
+    "Summarize chapter 4 and list its exercises",
+    "What is the difference between zero-shot and few-shot prompting?",
+]
+
+SCENARIOS = ["chat_rag", "chat_agent", "chat_session", "chat_legacy", "personalize", "translate", "signin", "me"]
+
+# Environment for the app under benchmark, applied by configure()
+BENCH_ENV = {
+    "OPENROUTER_API_KEY": "bench-key",
+    "OPENROUTER_BASE_URL": "http://llm-stub/v1",
+    "OPENAI_API_KEY": "",  # No second provider: no hedging
+    "COHERE_API_KEY": "bench-key",
+    "SECRET_KEY": "bench-secret",
+    "QDRANT_URL": "http://qdrant-stub",
+    "RATE_LIMIT_ENABLED": "false",  # Every simulated client shares one IP
+}
+
+
+def configure():
+    """Point the app at the stubs and a throwaway SQLite database; must run before app/ is imported."""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="book-bench-"), "bench.db")
+    os.environ.update({"DATABASE_URL": f"sqlite+aiosqlite:///{db_path}", **BENCH_ENV})
+
+
+@dataclass
+class Result:
+    """Latencies and outcomes collected for one scenario."""
+    latencies: List[float] = field(default_factory=list)
+    status_counts: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def setup_app(args):
+    """Create tables, install the stand-ins and wire the stub LLM into the provider pool."""
+    configure()
+    from app.core.config import settings
+    from app.infrastructure import llm_providers
+    from app.infrastructure.database import Base, get_engine
+    import app.models  # noqa: F401  (register tables)
+
+    stub = create_stub_llm_app(
+        latency=args.llm_latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        tool_call_rate=args.tool_call_rate,
+        seed=args.seed,
+    )
+    llm_providers._providers["openrouter"] = llm_providers.Provider(
+        "openrouter",
+        settings.OPENROUTER_BASE_URL,
+        settings.OPENROUTER_API_KEY,
+        settings.OPENROUTER_MODEL,
+        transport=httpx.ASGITransport(app=stub),
+    )
+
+    embedder = FakeEmbeddingService(latency=args.embed_latency)
+    store = InMemoryVectorStore(latency=args.search_latency)
+    chunks = await seed_vector_store(store, embedder)
+    install_stubs(embedder, store)
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    from app.main import app
+    return app, stub, chunks
+
+
+async def create_users(client_factory, count: int) -> List[dict]:
+    """Sign up benchmark users; each keeps its own cookie jar."""
+    users = []
+    for i in range(count):
+        credentials = {
+            "email": f"bench-{uuid.uuid4().hex[:8]}@example.com",
+            "password": "bench-password-123",
+            "name": f"Bench User {i}",
+        }
+        client = client_factory()
+        response = await client.post("/api/auth/signup", json=credentials)
+        response.raise_for_status()
+        users.append({"client": client, "credentials": credentials})
+    return users
+
+
+def build_scenarios(anonymous: httpx.AsyncClient, users: List[dict], rng: random.Random) -> Dict[str, Callable[[], Awaitable[httpx.Response]]]:
+    def user_client():
+        return rng.choice(users)["client"]
+
+    async def chat_rag():
+        return await anonymous.post("/api/chat/query", json={"query": rng.choice(SIMPLE_QUESTIONS)})
+
+    async def chat_agent():
+        return await anonymous.post("/api/chat/query", json={"query": rng.choice(COMPLEX_QUESTIONS)})
+
+    async def chat_session():
+        # Authenticated multi-turn chat: stored history, summaries, session writes
+        user = rng.choice(users)
+        question = rng.choice(SIMPLE_QUESTIONS + COMPLEX_QUESTIONS)
+        response = await user["client"].post("/api/chat/query", json={
+            "query": question,
+            "session_id": user.get("session_id"),
+        })
+        if response.status_code == 200:
+            user["session_id"] = response.json().get("session_id")
+        return response
+
+    async def chat_legacy():
+        return await anonymous.post("/api/chat/query/legacy", json={"query": rng.choice(SIMPLE_QUESTIONS)})
+
+    async def personalize():
+        chapter = f"chapter-{rng.randint(1, 6)}"
+        return await user_client().post("/api/content/personalize", json={"chapter_id": chapter})
+
+    async def translate():
+        chapter = f"chapter-{rng.randint(1, 6)}"
+        return await anonymous.post("/api/content/translate", json={"chapter_id": chapter})
+
+    async def signin():
+        user = rng.choice(users)
+        return await anonymous.post("/api/auth/signin", json={
+            "email": user["credentials"]["email"],
+            "password": user["credentials"]["password"],
+        })
+
+    async def me():
+        return await user_client().get("/api/auth/me")
+
+    return {
+        "chat_rag": chat_rag,
+        "chat_agent": chat_agent,
+        "chat_session": chat_session,
+        "chat_legacy": chat_legacy,
+        "personalize": personalize,
+        "translate": translate,
+        "signin": signin,
+        "me": me,
+    }
+
+
+async def run_scenario(call: Callable[[], Awaitable[httpx.Response]], total: int, concurrency: int) -> Result:
+    """Issue total requests with at most concurrency in flight."""
+    result = Result()
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await call()
+            except Exception:
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            result.status_counts[response.status_code] = result.status_counts.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def report(name: str, result: Result):
+    ok = sum(n for status, n in result.status_counts.items() if status < 400)
+    total = sum(result.status_counts.values()) + result.errors
+    statuses = ",".join(f"{s}:{n}" for s, n in sorted(result.status_counts.items()))
+    print(
+        f"{name:<12} {total:>6} {ok / result.elapsed if result.elapsed else 0:>9.1f} "
+        f"{percentile(result.latencies, 50) * 1000:>9.1f} "
+        f"{percentile(result.latencies, 95) * 1000:>9.1f} "
+        f"{percentile(result.latencies, 99) * 1000:>9.1f}  {statuses}"
+        + (f" exceptions:{result.errors}" if result.errors else "")
+    )
+
+
+async def main(args):
+    app, stub, chunks = await setup_app(args)
+    transport = httpx.ASGITransport(app=app)
+
+    def client_factory():
+        # https so the secure auth cookie is sent back
+        return httpx.AsyncClient(transport=transport, base_url="https://bench", timeout=args.timeout)
+
+    print(f"Seeded {chunks} book chunks; LLM stub latency {args.llm_latency}s, "
+          f"{args.tokens_per_second:.0f} tok/s, tool-call rate {args.tool_call_rate}")
+
+    anonymous = client_factory()
+    users = await create_users(client_factory, args.users)
+    scenarios = build_scenarios(anonymous, users, random.Random(args.seed))
+
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    print(f"\nconcurrency={args.concurrency} requests/scenario={args.requests}")
+    print(f"{'scenario':<12} {'reqs':>6} {'ok req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for name in selected:
+        result = await run_scenario(scenarios[name], args.requests, args.concurrency)
+        report(name, result)
+
+    print(f"\nStub LLM served {stub.state.stats['requests']} completions "
+          f"({stub.state.stats['tool_calls']} tool calls)")
+
+    from app.core.metrics import metrics
+    hold = metrics.snapshot()["histograms"].get("db_connection_hold_seconds", {}).get(())
+    if hold and hold["count"]:
+        print(f"DB connections: {hold['count']} checkouts, mean hold {hold['sum'] / hold['count'] * 1000:.1f} ms")
+
+    for user in users:
+        await user["client"].aclose()
+    await anonymous.aclose()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end load benchmark")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {SCENARIOS}")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    parser.add_argument("--users", type=int, default=10, help="Signed-up users for authenticated scenarios")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub time to first token, seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--tool-call-rate", type=float, default=0.5)
+    parser.add_argument("--embed-latency", type=float, default=0.0)
+    parser.add_argument("--search-latency", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
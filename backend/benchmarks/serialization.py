@@ -0,0 +1,184 @@
+"""
+Serialization CPU and bytes on the wire for the two largest responses:
+GET /api/chat/sessions/{id} (a long session) and POST /api/content/translate
+(a chapter-sized Urdu body).
+
+Part 1 times the JSON encoders on each endpoint's payload: the stdlib json
+module (Starlette's JSONResponse after jsonable_encoder), pydantic's dump_json
+(FastAPI's response_model fast path) and orjson (ORJSONResponse, which dict
+routes reach after jsonable_encoder).
+Part 2 runs the endpoints through the full app with compression off (before)
+and with gzip and brotli (after), reading raw bytes so the client never spends
+CPU on decompression.
+
+Usage (from backend/):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --messages 200 --requests 300
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from benchmarks.load_bench import create_users, parse_args as parse_load_bench_args, setup_app
+from benchmarks.stubs import load_book_chunks
+
+# Arabic-script letters standing in for a real Urdu translation: same word
+# shapes and byte mix (2-byte UTF-8) as the English it replaces
+URDU_LETTERS = "ابپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنوہھءیے"
+
+
+def urdu_like(text: str) -> str:
+    return "".join(
+        URDU_LETTERS[ord(ch.lower()) % len(URDU_LETTERS)] if ch.isalpha() else ch
+        for ch in text
+    )
+
+
+def chapter_body(chapter_id: str) -> str:
+    """A chapter's text rendered into Urdu-like script, code blocks kept."""
+    parts = []
+    for chunk in load_book_chunks():
+        if chunk["chapter_id"] == chapter_id:
+            text = chunk["text"]
+            parts.append(text if text.startswith("```") else urdu_like(text))
+    return "\n\n".join(parts)
+
+
+async def seed_session(user_id: str, messages: int, rng: random.Random) -> str:
+    """Insert a session of alternating questions and book-sized answers."""
+    from app.infrastructure.database import get_async_session_maker
+    from app.models.chat import ChatMessage, ChatSession, MessageRole
+
+    chunks = [c["text"] for c in load_book_chunks()]
+    started = datetime.utcnow() - timedelta(days=1)
+    async with get_async_session_maker()() as db:
+        session = ChatSession(user_id=user_id, title="Serialization benchmark")
+        db.add(session)
+        await db.flush()
+        for i in range(messages):
+            is_user = i % 2 == 0
+            db.add(ChatMessage(
+                session_id=session.id,
+                role=MessageRole.USER if is_user else MessageRole.ASSISTANT,
+                content=rng.choice(chunks)[:200] if is_user else rng.choice(chunks),
+                model=None if is_user else "stub-model",
+                created_at=started + timedelta(seconds=i),
+            ))
+        await db.commit()
+        return session.id
+
+
+def install_translation(body: str):
+    """Serve every translation from memory, like a warm translation cache."""
+    from app.services.translation_service import translation_service
+
+    async def translate_to_urdu(content, chapter_id, user_id, db):
+        return body
+
+    translation_service.translate_to_urdu = translate_to_urdu
+
+
+def time_encoders(payload: Any, schema: Any, repeats: int) -> List[Tuple[str, float, int]]:
+    """(encoder, ms per call, bytes) for one response payload."""
+    adapter = TypeAdapter(schema)
+    model = adapter.validate_python(payload)
+    encoders = [
+        ("stdlib json (JSONResponse)", lambda: json.dumps(
+            jsonable_encoder(model), ensure_ascii=False, separators=(",", ":")).encode()),
+        ("pydantic dump_json (response_model)", lambda: adapter.dump_json(adapter.validate_python(model))),
+        ("orjson (ORJSONResponse, dict routes)", lambda: orjson.dumps(jsonable_encoder(model))),
+    ]
+    results = []
+    for name, encode in encoders:
+        encode()
+        started = time.process_time()
+        for _ in range(repeats):
+            body = encode()
+        results.append((name, (time.process_time() - started) / repeats * 1000, len(body)))
+    return results
+
+
+async def time_endpoint(client: httpx.AsyncClient, request: Dict[str, Any], encoding: str, requests: int) -> Tuple[int, float]:
+    """(bytes on the wire, CPU ms per request) for sequential requests."""
+    headers = {"accept-encoding": encoding}
+    wire = 0
+    started = time.process_time()
+    for _ in range(requests):
+        async with client.stream(request["method"], request["url"], json=request.get("json"), headers=headers) as response:
+            response.raise_for_status()
+            wire = sum([len(chunk) async for chunk in response.aiter_raw()])
+    return wire, (time.process_time() - started) / requests * 1000
+
+
+async def main(args):
+    # setup_app configures the environment, so nothing under app/ is imported before it
+    app, _, _ = await setup_app(parse_load_bench_args([]))
+    from app.core.config import settings
+    from app.schemas.chat import ChatSessionDetail
+    from app.schemas.content import ContentResponse
+
+    transport = httpx.ASGITransport(app=app)
+
+    def client_factory():
+        return httpx.AsyncClient(transport=transport, base_url="https://bench", timeout=60)
+
+    user = (await create_users(client_factory, 1))[0]
+    client = user["client"]
+    me = (await client.get("/api/auth/me")).json()
+    session_id = await seed_session(me["id"], args.messages, random.Random(args.seed))
+    install_translation(chapter_body(args.chapter))
+
+    endpoints = {
+        "GET /api/chat/sessions/{id}": (
+            {"method": "GET", "url": f"/api/chat/sessions/{session_id}?limit={args.messages}"},
+            ChatSessionDetail,
+        ),
+        "POST /api/content/translate": (
+            {"method": "POST", "url": "/api/content/translate", "json": {"chapter_id": args.chapter}},
+            ContentResponse,
+        ),
+    }
+
+    print(f"Serialization CPU per response ({args.repeats} encodes each)")
+    print(f"{'endpoint':<30} {'encoder':<38} {'ms':>7} {'bytes':>9}")
+    for name, (request, schema) in endpoints.items():
+        payload = (await client.request(request["method"], request["url"], json=request.get("json"))).json()
+        for encoder, ms, size in time_encoders(payload, schema, args.repeats):
+            print(f"{name:<30} {encoder:<38} {ms:>7.3f} {size:>9}")
+
+    print(f"\nBytes on the wire and app CPU per request ({args.requests} sequential requests)")
+    print(f"{'endpoint':<30} {'response':<22} {'bytes':>9} {'ratio':>6} {'cpu ms':>8}")
+    for name, (request, _) in endpoints.items():
+        baseline = None
+        for label, enabled, encoding in (
+            ("before: uncompressed", False, "gzip, br"),
+            ("after: gzip", True, "gzip"),
+            ("after: br", True, "br, gzip"),
+        ):
+            settings.COMPRESSION_ENABLED = enabled
+            wire, cpu_ms = await time_endpoint(client, request, encoding, args.requests)
+            baseline = baseline or wire
+            print(f"{name:<30} {label:<22} {wire:>9} {wire / baseline:>6.2f} {cpu_ms:>8.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="Messages in the benchmarked session (max 200)")
+    parser.add_argument("--chapter", default="chapter-4", help="Chapter whose text stands in for the translation")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and encoding")
+    parser.add_argument("--repeats", type=int, default=500, help="Encodes per encoder")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,92 @@
+"""
+Chat latency while a burst of sign-ins hammers bcrypt.
+
+Runs the chat_rag scenario alone, then again alongside a signin storm.
+With --inline-hashing, bcrypt runs on the event loop (the old behaviour)
+so the two setups can be compared on the same machine.
+
+Usage (from backend/):
+    python -m benchmarks.signin_storm
+    python -m benchmarks.signin_storm --inline-hashing
+    python -m benchmarks.signin_storm --signin-concurrency 32 --requests 100
+"""
+import argparse
+import asyncio
+import random
+
+import httpx
+
+from benchmarks.load_bench import (
+    build_scenarios,
+    create_users,
+    parse_args as parse_load_bench_args,
+    report,
+    run_scenario,
+    setup_app,
+)
+
+
+def use_inline_hashing():
+    """Swap the hashing pool for synchronous bcrypt on the event loop."""
+    from app.core import security
+
+    async def run_inline(operation, fn, *args):
+        return fn(*args)
+
+    security.password_hasher._run = run_inline
+
+
+async def main(args):
+    # setup_app configures the environment, so nothing under app/ is imported before it
+    app, _, _ = await setup_app(args)
+    if args.inline_hashing:
+        use_inline_hashing()
+    transport = httpx.ASGITransport(app=app)
+
+    def client_factory():
+        return httpx.AsyncClient(transport=transport, base_url="https://bench", timeout=args.timeout)
+
+    anonymous = client_factory()
+    users = await create_users(client_factory, args.users)
+    scenarios = build_scenarios(anonymous, users, random.Random(args.seed))
+
+    print(f"bcrypt {'inline on the event loop' if args.inline_hashing else 'on the hashing pool'}; "
+          f"chat concurrency {args.concurrency}, signin concurrency {args.signin_concurrency}")
+    print(f"{'scenario':<12} {'reqs':>6} {'ok req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+
+    report("chat alone", await run_scenario(scenarios["chat_rag"], args.requests, args.concurrency))
+
+    chat, signin = await asyncio.gather(
+        run_scenario(scenarios["chat_rag"], args.requests, args.concurrency),
+        run_scenario(scenarios["signin"], args.signin_requests, args.signin_concurrency),
+    )
+    report("chat+storm", chat)
+    report("signin", signin)
+
+    from app.core.metrics import metrics
+    snapshot = metrics.snapshot()
+    wait = snapshot["histograms"].get("password_hash_wait_seconds", {}).get((("operation", "verify"),))
+    if wait and wait["count"]:
+        print(f"Hashing pool: {wait['count']} verifies, mean queue wait {wait['sum'] / wait['count'] * 1000:.1f} ms, "
+              f"rejected {sum(snapshot['counters'].get('password_hash_rejected_total', {}).values()):.0f}")
+
+    for user in users:
+        await user["client"].aclose()
+    await anonymous.aclose()
+
+
+def parse_args(argv=None):
+    # Everything not defined here is passed through to the load_bench options
+    parser = argparse.ArgumentParser(description="Chat latency during a signin storm")
+    parser.add_argument("--inline-hashing", action="store_true", help="Run bcrypt on the event loop")
+    parser.add_argument("--signin-concurrency", type=int, default=16)
+    parser.add_argument("--signin-requests", type=int, default=100)
+    args, rest = parser.parse_known_args(argv)
+    defaults = parse_load_bench_args(rest)
+    for key, value in vars(args).items():
+        setattr(defaults, key, value)
+    return defaults
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,171 @@
+"""
+Where cold-start milliseconds go.
+
+Each run starts a fresh interpreter (like a new serverless instance) and
+reports:
+  - `import app.main` under -X importtime, as self time per top-level package
+    and the slowest individual modules
+  - time to the first /health response, lifespan startup included
+  - the first-use cost of each lazily built client (LLM, Cohere, Qdrant, agent)
+
+Usage (from backend/):
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --runs 5 --top 15
+    python -m benchmarks.startup_profile --budget-ms 1800   # exit 1 if over budget
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Placeholder credentials so settings and clients can be built offline
+CHILD_ENV = {
+    "SECRET_KEY": "bench-secret",
+    "OPENROUTER_API_KEY": "bench-key",
+    "OPENAI_API_KEY": "bench-key",
+    "COHERE_API_KEY": "bench-key",
+    "DATABASE_URL": "sqlite+aiosqlite://",
+}
+
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    for key, value in CHILD_ENV.items():
+        env.setdefault(key, value)
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for each line of -X importtime output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def profile_imports() -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=child_env(), capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_first_use() -> Dict[str, float]:
+    """Run the phase timings in a fresh interpreter; milliseconds per phase."""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_profile", "--child"],
+        cwd=BACKEND_DIR, env=child_env(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child():
+    """Timed phases of a cold start, printed as one JSON line."""
+    import asyncio
+
+    phases: Dict[str, float] = {}
+
+    def timed(name, fn):
+        started = time.perf_counter()
+        value = fn()
+        phases[name] = (time.perf_counter() - started) * 1000
+        return value
+
+    app = timed("import app.main", lambda: __import__("app.main", fromlist=["app"]).app)
+
+    async def first_request():
+        import httpx
+
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://cold") as client:
+                response = await client.get("/health")
+                response.raise_for_status()
+
+    timed("lifespan + first /health", lambda: asyncio.run(first_request()))
+
+    from app.infrastructure.vector_store import vector_store
+    from app.services.embedding_service import embedding_service
+    from app.services.rag_service import rag_service
+
+    timed("first use: LLM client", lambda: rag_service.client)
+    timed("first use: Cohere client", lambda: embedding_service.client)
+    timed("first use: Qdrant client", lambda: vector_store.client)
+    timed("first use: agent (Agents SDK)", lambda: __import__("app.agents.book_agent"))
+    print(json.dumps(phases))
+
+
+def import_totals_ms(runs: List[List[Tuple[str, int, int]]]) -> List[float]:
+    return [next(cum for name, _, cum in modules if name == "app.main") / 1000 for modules in runs]
+
+
+def report_imports(runs: List[List[Tuple[str, int, int]]], top: int):
+    totals = import_totals_ms(runs)
+    print(f"import app.main: median {statistics.median(totals):.0f} ms "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}, {len(runs)} runs)")
+
+    # Self time is exclusive, so per-package sums add up to the total
+    by_package: Dict[str, List[float]] = defaultdict(list)
+    by_module: Dict[str, List[float]] = defaultdict(list)
+    for modules in runs:
+        package_ms: Dict[str, float] = defaultdict(float)
+        for name, self_us, _ in modules:
+            package_ms[name.split(".")[0]] += self_us / 1000
+            by_module[name].append(self_us / 1000)
+        for package, ms in package_ms.items():
+            by_package[package].append(ms)
+
+    print(f"\n{'package':<28} {'self ms':>8}")
+    ranked = sorted(by_package.items(), key=lambda item: -statistics.median(item[1]))
+    for package, values in ranked[:top]:
+        print(f"{package:<28} {statistics.median(values):>8.1f}")
+
+    print(f"\n{'module':<48} {'self ms':>8}")
+    ranked = sorted(by_module.items(), key=lambda item: -statistics.median(item[1]))
+    for module, values in ranked[:top]:
+        print(f"{module:<48} {statistics.median(values):>8.1f}")
+
+
+def report_phases(runs: List[Dict[str, float]]):
+    print(f"\n{'phase (fresh interpreter)':<36} {'median ms':>10}")
+    for phase in runs[0]:
+        print(f"{phase:<36} {statistics.median(run[phase] for run in runs):>10.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=12, help="Rows in the package and module tables")
+    # `import app.main` measures ~0.9 s on a dev machine; eagerly importing the SDKs took ~2.9 s
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median `import app.main` exceeds this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        child()
+        return
+    imports = [profile_imports() for _ in range(args.runs)]
+    report_imports(imports, args.top)
+    report_phases([measure_first_use() for _ in range(args.runs)])
+    if args.budget_ms is not None:
+        median_ms = statistics.median(import_totals_ms(imports))
+        if median_ms > args.budget_ms:
+            sys.exit(f"\nimport app.main: median {median_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
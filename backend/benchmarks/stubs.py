@@ -0,0 +1,219 @@
+"""
+Offline stand-ins for the backend's upstream services.
+
+- create_stub_llm_app: OpenAI-compatible /v1/chat/completions with configurable
+  latency and token rate, optionally answering with a search_book tool call
+- FakeEmbeddingService: deterministic hashed bag-of-words embeddings
+- InMemoryVectorStore: cosine search over book chunks, same interface as VectorStore
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+EMBEDDING_DIM = 256
+DOCS_DIR = Path(__file__).resolve().parent.parent.parent / "frontend" / "docs"
+
+
+def create_stub_llm_app(
+    latency: float = 0.3,
+    tokens_per_second: float = 200.0,
+    completion_tokens: int = 120,
+    tool_call_rate: float = 0.5,
+    seed: Optional[int] = None,
+) -> Starlette:
+    """
+    Build an OpenAI-compatible chat completions app.
+
+    Args:
+        latency: Seconds before the first token (queueing + prefill)
+        tokens_per_second: Generation speed used to pace completion_tokens
+        completion_tokens: Tokens in every generated answer
+        tool_call_rate: Share of first agent turns answered with a search_book call
+        seed: Random seed for reproducible tool-call decisions
+    """
+    rng = random.Random(seed)
+    stats = {"requests": 0, "tool_calls": 0}
+
+    async def completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        messages = body.get("messages", [])
+        prompt_tokens = sum(len(json.dumps(m)) for m in messages) // 4
+
+        wants_tool = (
+            body.get("tools")
+            and not any(m.get("role") == "tool" for m in messages)
+            and rng.random() < tool_call_rate
+        )
+        if wants_tool:
+            await asyncio.sleep(latency)
+            stats["tool_calls"] += 1
+            question = next(
+                (m.get("content") for m in reversed(messages) if m.get("role") == "user"),
+                "",
+            )
+            if isinstance(question, list):
+                question = " ".join(part.get("text", "") for part in question)
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                    "type": "function",
+                    "function": {
+                        "name": "search_book",
+                        "arguments": json.dumps({"query": str(question)[-200:]}),
+                    },
+                }],
+            }
+            finish_reason, generated = "tool_calls", 20
+        else:
+            await asyncio.sleep(latency + completion_tokens / tokens_per_second)
+            message = {"role": "assistant", "content": "Stub answer citing the book [1]. " * (completion_tokens // 8)}
+            finish_reason, generated = "stop", completion_tokens
+
+        return JSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub-model"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": generated,
+                "total_tokens": prompt_tokens + generated,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        })
+
+    async def models(request: Request):
+        return JSONResponse({"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+
+    app = Starlette(routes=[
+        Route("/v1/chat/completions", completions, methods=["POST"]),
+        Route("/v1/models", models, methods=["GET"]),
+    ])
+    app.state.stats = stats
+    return app
+
+
+def _hash_embedding(text: str) -> List[float]:
+    vector = [0.0] * EMBEDDING_DIM
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        digest = hashlib.blake2b(word.encode(), digest_size=4).digest()
+        vector[int.from_bytes(digest, "little") % EMBEDDING_DIM] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeEmbeddingService:
+    """Drop-in for EmbeddingService that never leaves the process."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.model = "fake-hash-embedder"
+
+    def embed(self, text: str) -> List[float]:
+        """Synchronous embedding, for the agent tools that run in worker threads."""
+        if self.latency:
+            time.sleep(self.latency)
+        return _hash_embedding(text)
+
+    async def get_embedding(self, text: str, service: str = "unknown") -> List[float]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return _hash_embedding(text)
+
+    async def get_embeddings(self, texts: List[str], input_type: str = "search_document", service: str = "unknown") -> List[List[float]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [_hash_embedding(t) for t in texts]
+
+
+class InMemoryVectorStore:
+    """Drop-in for VectorStore backed by a Python list."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.collection_name = "book_content"
+        self._points: List[Dict[str, Any]] = []
+
+    async def ensure_collection(self, vector_size: int = EMBEDDING_DIM):
+        return None
+
+    async def upsert(self, vectors, payloads, ids=None, service: str = "unknown"):
+        ids = ids or [str(uuid.uuid4()) for _ in vectors]
+        for id, vector, payload in zip(ids, vectors, payloads):
+            self._points.append({"id": id, "vector": vector, "payload": payload})
+
+    def search_sync(self, query_vector: List[float], limit: int = 5, filter_chapter: Optional[str] = None):
+        scored = []
+        for point in self._points:
+            if filter_chapter and point["payload"].get("chapter_id") != filter_chapter:
+                continue
+            score = sum(a * b for a, b in zip(query_vector, point["vector"]))
+            scored.append({"id": point["id"], "score": score, "payload": point["payload"]})
+        scored.sort(key=lambda hit: hit["score"], reverse=True)
+        return scored[:limit]
+
+    async def search(self, query_vector: List[float], limit: int = 5, filter_chapter: Optional[str] = None, service: str = "unknown"):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.search_sync(query_vector, limit, filter_chapter)
+
+    async def delete_by_chapter(self, chapter_id: str):
+        self._points = [p for p in self._points if p["payload"].get("chapter_id") != chapter_id]
+
+    def __len__(self):
+        return len(self._points)
+
+
+def load_book_chunks(docs_dir: Path = DOCS_DIR, chunk_chars: int = 800) -> List[Dict[str, Any]]:
+    """Split the Docusaurus chapters into paragraph-sized payloads."""
+    chunks = []
+    for path in sorted(docs_dir.glob("chapter-*/*.mdx")):
+        text = path.read_text(encoding="utf-8")
+        buffer = ""
+        for paragraph in re.split(r"\n\s*\n", text):
+            if len(buffer) + len(paragraph) > chunk_chars and buffer:
+                chunks.append({"text": buffer.strip(), "chapter_id": path.parent.name, "source": path.stem})
+                buffer = ""
+            buffer += paragraph + "\n\n"
+        if buffer.strip():
+            chunks.append({"text": buffer.strip(), "chapter_id": path.parent.name, "source": path.stem})
+    return chunks
+
+
+async def seed_vector_store(store: InMemoryVectorStore, embedder: FakeEmbeddingService) -> int:
+    """Embed every book chunk into the store. Returns the number of chunks."""
+    chunks = load_book_chunks()
+    vectors = await embedder.get_embeddings([c["text"] for c in chunks])
+    await store.upsert(vectors, chunks)
+    return len(chunks)
+
+
+def install_stubs(embedder: FakeEmbeddingService, store: InMemoryVectorStore):
+    """Point the app's embedding and vector search call sites at the stand-ins."""
+    from app.agents import tools
+    from app.services import rag_service
+
+    rag_service.embedding_service = embedder
+    rag_service.vector_store = store
+    tools.get_embedding = embedder.embed
+    tools._vector_search = lambda vector, chapter_filter, limit: [
+        SimpleNamespace(payload=hit["payload"], score=hit["score"])
+        for hit in store.search_sync(vector, limit, chapter_filter)
+    ]
@@ -0,0 +1,6 @@
+-- Composite index for "latest N messages of a session" (ChatHistoryService.recent_messages).
+-- Its session_id prefix also serves plain session_id lookups, so the old single-column index goes.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_session_created
+    ON chat_messages (session_id, created_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_chat_messages_session_id;
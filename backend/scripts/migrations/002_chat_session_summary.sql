@@ -0,0 +1,3 @@
+-- Rolling conversation summaries (SummaryService.compact_session).
+ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS summary TEXT;
+ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS summarized_until TIMESTAMP;
@@ -0,0 +1,9 @@
+-- Keyset pagination: sessions by (updated_at, id) per user, messages by (created_at, id) per session.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_sessions_user_updated
+    ON chat_sessions (user_id, updated_at, id);
+DROP INDEX CONCURRENTLY IF EXISTS ix_chat_sessions_user_id;
+
+-- Add id to the message index from 001 so ties on created_at page deterministically
+DROP INDEX CONCURRENTLY IF EXISTS idx_chat_messages_session_created;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_session_created
+    ON chat_messages (session_id, created_at, id);
@@ -0,0 +1,13 @@
+-- Denormalized per-session counters (ChatHistoryService.append_messages), backfilled from chat_messages.
+ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP;
+
+UPDATE chat_sessions AS s
+SET message_count = c.message_count,
+    last_message_at = c.last_message_at
+FROM (
+    SELECT session_id, COUNT(*) AS message_count, MAX(created_at) AS last_message_at
+    FROM chat_messages
+    GROUP BY session_id
+) AS c
+WHERE c.session_id = s.id;
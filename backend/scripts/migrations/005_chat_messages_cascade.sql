@@ -0,0 +1,5 @@
+-- Let the database delete a session's messages (ChatSession.messages uses passive_deletes).
+ALTER TABLE chat_messages DROP CONSTRAINT IF EXISTS chat_messages_session_id_fkey;
+ALTER TABLE chat_messages
+    ADD CONSTRAINT chat_messages_session_id_fkey
+    FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE;
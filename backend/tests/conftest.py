@@ -0,0 +1,65 @@
+"""
+Shared pytest configuration.
+Provides placeholder credentials so modules that build API clients can be imported offline,
+an in-memory SQLite database for tests that touch the models, and an HTTP client for the app.
+"""
+import os
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-openrouter-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
+os.environ.setdefault("COHERE_API_KEY", "test-cohere-key")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+
+@pytest_asyncio.fixture
+async def session_maker():
+    """Session factory bound to a fresh in-memory SQLite database with all tables."""
+    from app.infrastructure.database import Base, enable_sqlite_foreign_keys
+    import app.models  # noqa: F401  (register tables)
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    enable_sqlite_foreign_keys(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def current_user():
+    """User the client is signed in as; override or parametrize it (None leaves auth to the app)."""
+    return None
+
+
+@pytest.fixture
+def db_override(session_maker):
+    """get_db replacement for the client; override it to instrument the session."""
+    async def override_db():
+        async with session_maker() as db:
+            yield db
+
+    return override_db
+
+
+@pytest_asyncio.fixture
+async def client(db_override, current_user, monkeypatch):
+    """HTTP client for the app on the test database, with the rate limiter off."""
+    from app.core.deps import get_current_user
+    from app.infrastructure.database import get_db
+    from app.main import app
+
+    # The limiter's in-process buckets outlive a single test
+    monkeypatch.setattr("app.core.rate_limit.settings.RATE_LIMIT_ENABLED", False)
+    app.dependency_overrides[get_db] = db_override
+    if current_user is not None:
+        app.dependency_overrides[get_current_user] = lambda: current_user
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,87 @@
+"""
+Tests for the per-run agent trace.
+"""
+import pytest
+from agents.items import ModelResponse
+from agents.tool_context import ToolContext
+from agents.usage import Usage
+
+from app.agents import book_agent, router as query_router
+from app.agents.context import BookAgentContext
+from app.agents.hooks import AgentTraceHooks
+from app.agents.tools import search_book
+from app.core.metrics import metrics
+
+
+def _tool_context(call_id: str, arguments: str) -> ToolContext:
+    return ToolContext(
+        context=BookAgentContext(),
+        tool_name=search_book.name,
+        tool_call_id=call_id,
+        tool_arguments=arguments,
+    )
+
+
+@pytest.mark.asyncio
+async def test_hooks_trace_turns_tools_and_metrics():
+    metrics.reset()
+    hooks = AgentTraceHooks()
+    response = ModelResponse(output=[], usage=Usage(requests=1, input_tokens=120, output_tokens=30), response_id=None)
+
+    await hooks.on_llm_start(None, None, None, [])
+    await hooks.on_llm_end(None, None, response)
+    # Two parallel calls of the same tool are kept apart by call ID
+    await hooks.on_tool_start(_tool_context("c1", '{"query": "RAG"}'), None, search_book)
+    await hooks.on_tool_start(_tool_context("c2", '{"query": "embeddings"}'), None, search_book)
+    await hooks.on_tool_end(_tool_context("c2", ""), None, search_book, "é" * 10)
+    await hooks.on_tool_end(_tool_context("c1", ""), None, search_book, "hits")
+    await hooks.on_llm_start(None, None, None, [])
+    await hooks.on_llm_end(None, None, response)
+
+    trace = hooks.finish({"c2": 1}).to_dict()
+    assert trace["turns"] == 2
+    assert [t["prompt_tokens"] for t in trace["llm_turns"]] == [120, 120]
+    first, second = trace["tool_calls"]
+    assert (first["call_id"], first["turn"], first["arguments_bytes"], first["output_bytes"]) == ("c1", 1, 16, 4)
+    assert (second["output_bytes"], second["memo_hits"], second["status"]) == (20, 1, "completed")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["agent_run_turns"][()]["count"] == 1
+    assert snapshot["counters"]["agent_llm_turn_tokens_total"][(("kind", "prompt"), ("turn", "2"))] == 120
+    assert snapshot["counters"]["agent_tool_calls_total"][(("status", "completed"), ("tool", "search_book"))] == 2
+    assert snapshot["histograms"]["agent_tool_output_bytes"][(("tool", "search_book"),)]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_traced_with_unfinished_tools_as_errors(monkeypatch):
+    metrics.reset()
+
+    async def failing_run(agent, input, context, max_turns, run_config, hooks):
+        await hooks.on_llm_start(None, None, None, [])
+        await hooks.on_llm_end(None, None, ModelResponse(output=[], usage=Usage(), response_id=None))
+        await hooks.on_tool_start(_tool_context("c1", '{"query": "RAG"}'), None, search_book)
+        raise RuntimeError("provider unavailable")
+
+    monkeypatch.setattr(book_agent, "get_book_assistant", lambda: None)
+    monkeypatch.setattr(book_agent.Runner, "run", failing_run)
+    with pytest.raises(RuntimeError):
+        await book_agent.run_book_agent("What is RAG?")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["agent_run_turns"][()]["count"] == 1
+    assert snapshot["counters"]["agent_tool_calls_total"] == {(("status", "error"), ("tool", "search_book")): 1}
+
+
+@pytest.mark.asyncio
+async def test_trace_is_returned_only_when_requested(client, monkeypatch):
+    trace = {"turns": 1, "duration_ms": 5.0, "llm_turns": [], "tool_calls": []}
+
+    async def fake_answer_query(**kwargs):
+        return {"answer": "An answer", "model": "stub", "agent": "BookAssistant", "route": "agent", "trace": trace}
+
+    monkeypatch.setattr(query_router, "answer_query", fake_answer_query)
+    plain = await client.post("/api/chat/query", json={"query": "What is RAG?"})
+    traced = await client.post("/api/chat/query", json={"query": "What is RAG?", "include_trace": True})
+
+    assert plain.json()["trace"] is None
+    assert traced.json()["trace"] == trace
@@ -0,0 +1,59 @@
+"""
+Tests for the offline stand-ins used by the load benchmark.
+"""
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from benchmarks.stubs import (
+    FakeEmbeddingService,
+    InMemoryVectorStore,
+    create_stub_llm_app,
+    seed_vector_store,
+)
+
+
+@pytest.mark.asyncio
+async def test_stub_llm_is_openai_compatible():
+    stub = create_stub_llm_app(latency=0, tokens_per_second=1e6, tool_call_rate=0)
+    client = AsyncOpenAI(
+        api_key="k",
+        base_url="http://stub/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)),
+    )
+    response = await client.chat.completions.create(
+        model="stub-model",
+        messages=[{"role": "user", "content": "What is RAG?"}],
+    )
+    assert response.choices[0].message.content
+    assert response.usage.completion_tokens == 120
+    assert stub.state.stats["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stub_llm_emits_tool_calls_when_tools_are_offered():
+    stub = create_stub_llm_app(latency=0, tool_call_rate=1.0)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://stub") as client:
+        response = await client.post("/v1/chat/completions", json={
+            "model": "m",
+            "messages": [{"role": "user", "content": "Compare RAG and fine-tuning"}],
+            "tools": [{"type": "function", "function": {"name": "search_book"}}],
+        })
+    choice = response.json()["choices"][0]
+    assert choice["finish_reason"] == "tool_calls"
+    assert choice["message"]["tool_calls"][0]["function"]["name"] == "search_book"
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_ranks_matching_chunks_first():
+    embedder = FakeEmbeddingService()
+    store = InMemoryVectorStore()
+    assert await seed_vector_store(store, embedder) > 0
+
+    query = await embedder.get_embedding("retrieval augmented generation vector database")
+    hits = await store.search(query, limit=3)
+    assert len(hits) == 3
+    assert hits[0]["score"] >= hits[-1]["score"]
+
+    filtered = await store.search(query, limit=3, filter_chapter="chapter-2")
+    assert all(hit["payload"]["chapter_id"] == "chapter-2" for hit in filtered)
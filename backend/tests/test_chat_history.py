@@ -0,0 +1,96 @@
+"""
+Tests for bounded chat history retrieval.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from app.models.chat import ChatMessage, ChatSession, MessageRole
+from app.models.user import User
+from app.services.chat_history_service import chat_history_service
+
+
+@pytest_asyncio.fixture
+async def db(session_maker):
+    async with session_maker() as session:
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_recent_messages_returns_newest_in_order(db):
+    db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+    db.add(ChatSession(id="s1", user_id="u1"))
+    db.add(ChatSession(id="s2", user_id="u1"))
+    start = datetime(2024, 1, 1)
+    for i in range(50):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        db.add(ChatMessage(session_id="s1", role=role, content=f"m{i}", created_at=start + timedelta(seconds=i)))
+    db.add(ChatMessage(session_id="s2", role=MessageRole.USER, content="other", created_at=start))
+    await db.commit()
+
+    history = await chat_history_service.recent_messages(db, "s1", limit=6)
+
+    assert [m["content"] for m in history] == [f"m{i}" for i in range(44, 50)]
+    assert history[-1]["role"] == "assistant"
+
+
+def test_messages_have_session_created_index():
+    indexes = {tuple(c.name for c in ix.columns)[:2] for ix in ChatMessage.__table__.indexes}
+    assert ("session_id", "created_at") in indexes
+
+
+@pytest.mark.asyncio
+async def test_append_messages_maintains_session_counters(db):
+    db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+    db.add(ChatSession(id="s1", user_id="u1"))
+    await db.commit()
+
+    for turn in range(3):
+        await chat_history_service.append_messages(
+            db, "s1",
+            ChatMessage(session_id="s1", role=MessageRole.USER, content=f"q{turn}"),
+            ChatMessage(session_id="s1", role=MessageRole.ASSISTANT, content=f"a{turn}"),
+        )
+        await db.commit()
+
+    session = await db.get(ChatSession, "s1", populate_existing=True)
+    assert session.message_count == 6
+    assert session.last_message_at is not None
+    assert [m["content"] for m in await chat_history_service.recent_messages(db, "s1")] == [
+        "q0", "a0", "q1", "a1", "q2", "a2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_turn_keeps_question_before_answer_on_a_coarse_clock(db):
+    db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+    db.add(ChatSession(id="s1", user_id="u1"))
+    await db.commit()
+
+    frozen = datetime(2024, 1, 1)
+    with patch("app.services.chat_history_service.datetime") as clock:
+        clock.utcnow.return_value = frozen
+        # IDs sort against insertion order, so only created_at keeps the turn in order
+        question = ChatMessage(id="z", session_id="s1", role=MessageRole.USER, content="q")
+        answer = ChatMessage(id="a", session_id="s1", role=MessageRole.ASSISTANT, content="a")
+        await chat_history_service.append_messages(db, "s1", question, answer)
+        await db.commit()
+
+    assert frozen == question.created_at < answer.created_at
+    session = await db.get(ChatSession, "s1", populate_existing=True)
+    assert session.last_message_at == answer.created_at
+    assert [m["content"] for m in await chat_history_service.recent_messages(db, "s1")] == ["q", "a"]
+
+
+@pytest.mark.asyncio
+async def test_recent_messages_breaks_timestamp_ties_by_id(db):
+    db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+    db.add(ChatSession(id="s1", user_id="u1"))
+    start = datetime(2024, 1, 1)
+    for message_id in ["m3", "m1", "m2"]:
+        db.add(ChatMessage(id=message_id, session_id="s1", role=MessageRole.USER, content=message_id, created_at=start))
+    await db.commit()
+
+    assert [m["content"] for m in await chat_history_service.recent_messages(db, "s1", limit=2)] == ["m2", "m3"]
@@ -0,0 +1,102 @@
+"""
+Tests for response compression and the JSON response classes.
+"""
+import gzip
+
+import brotli
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.routing import APIRoute
+
+from app.api.routes import auth, chat, content
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.responses import ORJSONResponse
+
+LARGE = {"content": "اردو ترجمہ " * 500}
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0, br;q=0") is None
+
+
+def test_gzip_only_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/large", response_class=ORJSONResponse)
+    async def large():
+        return LARGE
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield b"a" * 4096
+            yield b"b" * 4096
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/precompressed")
+    async def precompressed():
+        return PlainTextResponse(gzip.compress(b"x" * 4096), headers={"content-encoding": "gzip"})
+
+    app.add_middleware(CompressionMiddleware)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_compressed():
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        br = await client.get("/large", headers={"accept-encoding": "br"})
+        gz = await client.get("/large", headers={"accept-encoding": "gzip"})
+        plain = await client.get("/large", headers={"accept-encoding": "identity"})
+
+    raw = plain.content
+    assert br.headers["content-encoding"] == "br" and br.headers["vary"] == "Accept-Encoding"
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    # httpx decodes both; the wire sizes are what shrank
+    assert br.json() == gz.json() == plain.json() == LARGE
+    assert int(br.headers["content-length"]) == len(brotli.compress(raw, quality=4)) < len(raw) // 10
+    assert int(gz.headers["content-length"]) < len(raw) // 10
+
+
+@pytest.mark.asyncio
+async def test_small_streamed_and_encoded_bodies_pass_through():
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers={"accept-encoding": "br, gzip"}) as client:
+        small = await client.get("/small")
+        stream = await client.get("/stream")
+        precompressed = await client.get("/precompressed")
+
+    assert "content-encoding" not in small.headers and small.json() == {"ok": True}
+    assert "content-encoding" not in stream.headers and len(stream.content) == 8192
+    assert precompressed.headers["content-encoding"] == "gzip" and precompressed.text == "x" * 4096
+
+
+def test_model_routes_keep_the_pydantic_fast_path():
+    # A custom response class would switch response_model routes off pydantic's dump_json
+    for router in (auth.router, chat.router, content.router):
+        for route in router.routes:
+            assert isinstance(route, APIRoute)
+            if route.response_model is not None:
+                assert isinstance(route.response_class, DefaultPlaceholder), route.path
+            else:
+                assert route.response_class is ORJSONResponse, route.path
@@ -0,0 +1,81 @@
+"""
+Tests that chat requests do not hold a DB connection across the LLM call.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.agents import router as query_router
+from app.core.metrics import metrics
+from app.infrastructure.database import instrument_pool
+from app.models.chat import ChatMessage, ChatSession
+from app.models.user import User
+
+
+def _checked_out() -> float:
+    return metrics.snapshot()["gauges"].get("db_connections_checked_out", {}).get((), 0)
+
+
+@pytest_asyncio.fixture
+async def current_user(session_maker):
+    metrics.reset()
+    instrument_pool(session_maker.kw["bind"])
+    async with session_maker() as db:
+        db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+        await db.commit()
+        return (await db.execute(
+            select(User).options(selectinload(User.profile)).where(User.id == "u1")
+        )).scalar_one()
+
+
+@pytest.fixture
+def db_override(session_maker):
+    async def override_db():
+        async with session_maker() as db:
+            # Touch the DB the way get_current_user does before the handler runs
+            await db.execute(select(User).where(User.id == "u1"))
+            yield db
+
+    return override_db
+
+
+@pytest.mark.asyncio
+async def test_no_connection_is_held_during_llm_call(client, session_maker, monkeypatch):
+    held_during_call = []
+
+    async def fake_answer_query(**kwargs):
+        held_during_call.append(_checked_out())
+        return {"answer": "An answer", "model": "stub", "agent": "BookAssistant", "route": "agent"}
+
+    monkeypatch.setattr(query_router, "answer_query", fake_answer_query)
+
+    first = await client.post("/api/chat/query", json={"query": "What is RAG?"})
+    assert first.status_code == 200
+    session_id = first.json()["session_id"]
+    second = await client.post("/api/chat/query", json={"query": "And agents?", "session_id": session_id})
+    assert second.status_code == 200
+
+    assert held_during_call == [0, 0]
+    hold = metrics.snapshot()["histograms"]["db_connection_hold_seconds"][()]
+    assert hold["count"] > 0
+
+    async with session_maker() as db:
+        session = await db.get(ChatSession, session_id)
+        assert session.message_count == 4
+        count = len((await db.execute(select(ChatMessage).where(ChatMessage.session_id == session_id))).all())
+        assert count == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_call_leaves_no_empty_session(client, session_maker, monkeypatch):
+    async def failing_answer_query(**kwargs):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(query_router, "answer_query", failing_answer_query)
+
+    response = await client.post("/api/chat/query", json={"query": "What is RAG?"})
+    assert response.status_code == 500
+
+    async with session_maker() as db:
+        assert (await db.execute(select(ChatSession))).first() is None
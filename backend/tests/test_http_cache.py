@@ -0,0 +1,105 @@
+"""
+Tests for ETag / Cache-Control / 304 handling on chapter and translation reads.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.api.routes import content
+from app.core.http_cache import etag_matches
+from app.models.content import CachedContent
+from app.services.translation_service import shared_translation_key, translation_service
+
+
+@pytest.fixture
+def translations(monkeypatch):
+    """Sources sent to the (fake) translator."""
+    translations = []
+
+    async def fake_translate(source):
+        translations.append(source)
+        return f"ترجمہ {len(translations)}: " + "اردو " * 400
+
+    monkeypatch.setattr(translation_service, "_translate", fake_translate)
+    return translations
+
+
+def test_etag_matching():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.asyncio
+async def test_chapter_revalidates_with_304(client):
+    first = await client.get("/api/content/chapter/chapter-1")
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and "max-age=" in first.headers["cache-control"]
+
+    not_modified = await client.get("/api/content/chapter/chapter-1", headers={"if-none-match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    other = await client.get("/api/content/chapter/chapter-2", headers={"if-none-match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_translation_is_shared_and_cacheable(client, translations, monkeypatch):
+    first = await client.get("/api/content/translate/chapter-1", headers={"accept-encoding": "identity"})
+    assert first.status_code == 200 and first.headers["cache-control"].startswith("public")
+    etag = first.headers["etag"]
+
+    again = await client.get("/api/content/translate/chapter-1", headers={"accept-encoding": "identity"})
+    assert again.headers["etag"] == etag and again.json() == first.json()
+    assert len(translations) == 1
+
+    # The compressed copy carries a weak ETag, which still revalidates
+    compressed = await client.get("/api/content/translate/chapter-1", headers={"accept-encoding": "br"})
+    assert compressed.headers["content-encoding"] == "br"
+    assert compressed.headers["etag"] == "W/" + etag
+    revalidated = await client.get(
+        "/api/content/translate/chapter-1",
+        headers={"accept-encoding": "br", "if-none-match": compressed.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+    # New source text, new translation and ETag
+    monkeypatch.setitem(content.CHAPTER_CONTENT, "chapter-1", "Revised chapter 1")
+    revised = await client.get("/api/content/translate/chapter-1", headers={"if-none-match": etag})
+    assert revised.status_code == 200 and revised.headers["etag"] != etag
+    assert len(translations) == 2
+
+    assert (await client.get("/api/content/translate/chapter-1?target_language=fr")).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_unknown_chapter_is_not_translated(client, translations, session_maker):
+    response = await client.get("/api/content/translate/no-such-chapter")
+
+    assert response.status_code == 404
+    assert translations == []
+    async with session_maker() as db:
+        assert (await db.execute(select(CachedContent))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_duplicate_shared_rows_serve_the_first(client, translations, session_maker):
+    key = shared_translation_key(content.CHAPTER_CONTENT["chapter-2"])
+    async with session_maker() as db:
+        for i, text in enumerate(["first", "second"]):
+            db.add(CachedContent(
+                user_id=None,
+                chapter_id="chapter-2",
+                content_type=key,
+                content=text,
+                created_at=datetime(2024, 1, 1) + timedelta(seconds=i),
+            ))
+        await db.commit()
+
+    response = await client.get("/api/content/translate/chapter-2")
+    assert response.json()["content"] == "first"
+    assert translations == []
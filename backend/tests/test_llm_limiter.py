@@ -0,0 +1,108 @@
+"""
+Tests for the adaptive upstream LLM limiter.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.llm_limiter import (
+    AdaptiveLimiter,
+    LimitedTransport,
+    LimiterQueueFull,
+    PRIORITY_BULK,
+    PRIORITY_CHAT,
+)
+
+
+def _limiter(**overrides):
+    options = dict(initial_limit=2, min_limit=1, max_limit=4, max_queue=2, latency_target=1.0)
+    options.update(overrides)
+    return AdaptiveLimiter(**options)
+
+
+@pytest.mark.asyncio
+async def test_limit_halves_on_429_and_grows_additively():
+    limiter = _limiter(initial_limit=4, max_limit=8)
+    await limiter.acquire()
+    limiter.release(0.1, throttled=True)
+    assert limiter.limit == 2
+
+    for _ in range(4):
+        await limiter.acquire()
+        limiter.release(0.1)
+    assert 3.0 <= limiter.limit < 4.0
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_shrink_the_limit():
+    limiter = _limiter(initial_limit=4)
+    await limiter.acquire()
+    limiter.release(5.0)
+    assert limiter.limit < 4
+
+
+@pytest.mark.asyncio
+async def test_chat_waiters_are_served_before_bulk():
+    limiter = _limiter(initial_limit=1, max_queue=4)
+    await limiter.acquire()
+    order = []
+
+    async def waiter(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+        limiter.release(0.1)
+
+    bulk = asyncio.create_task(waiter("translation", PRIORITY_BULK))
+    await asyncio.sleep(0)
+    chat = asyncio.create_task(waiter("chat", PRIORITY_CHAT))
+    await asyncio.sleep(0)
+
+    limiter.release(0.1)
+    await asyncio.gather(bulk, chat)
+    assert order == ["chat", "translation"]
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded():
+    limiter = _limiter(initial_limit=1, max_queue=1)
+    await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(LimiterQueueFull):
+        await limiter.acquire()
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_transport_releases_slot_and_backs_off_on_upstream_429():
+    limiter = _limiter(initial_limit=2)
+    upstream = httpx.MockTransport(lambda request: httpx.Response(429, json={"error": "slow down"}))
+    transport = LimitedTransport("RAGService", limiter=limiter, transport=upstream)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post("https://llm.test/v1/chat/completions", json={})
+
+    assert response.status_code == 429
+    assert limiter.inflight == 0
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_transport_answers_429_when_queue_is_full():
+    limiter = _limiter(initial_limit=1, max_queue=0)
+    await limiter.acquire()
+    upstream = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+    transport = LimitedTransport("TranslationService", limiter=limiter, transport=upstream)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post("https://llm.test/v1/chat/completions", json={})
+
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+    assert limiter.limit == 1  # Local rejections are not upstream congestion signals
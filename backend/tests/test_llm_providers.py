@@ -0,0 +1,190 @@
+"""
+Tests for hedged requests and provider failover, against in-process stub servers.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.infrastructure.llm_providers import CircuitBreaker, HedgingTransport, Provider
+
+
+class StubLLM:
+    """OpenAI-compatible chat endpoint with injectable latency and status."""
+
+    def __init__(self, name: str, latency: float = 0.0, status: int = 200):
+        self.name = name
+        self.latency = latency
+        self.status = status
+        self.requests = []
+        self.bodies = []
+        self.cancelled = 0
+        self.app = Starlette(routes=[Route("/v1/chat/completions", self.completions, methods=["POST"])])
+
+    async def completions(self, request: Request):
+        body = await request.json()
+        self.bodies.append(body)
+        self.requests.append({"model": body["model"], "auth": request.headers.get("authorization")})
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.status != 200:
+            return JSONResponse({"error": {"message": "upstream error"}}, status_code=self.status)
+        return JSONResponse({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"answer from {self.name}"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        }, status_code=200)
+
+
+def _provider(stub: StubLLM, model: str, threshold: int = 3, accepts_cache_control: bool = False) -> Provider:
+    return Provider(
+        stub.name,
+        f"http://{stub.name}.test/v1",
+        f"key-{stub.name}",
+        model,
+        transport=httpx.ASGITransport(app=stub.app),
+        breaker=CircuitBreaker(failure_threshold=threshold, reset_seconds=60),
+        accepts_cache_control=accepts_cache_control,
+    )
+
+
+def _client(transport: HedgingTransport) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key="key-primary",
+        base_url="http://primary.test/v1",
+        http_client=httpx.AsyncClient(transport=transport),
+        max_retries=0,
+    )
+
+
+async def _ask(client: AsyncOpenAI) -> str:
+    response = await client.chat.completions.create(
+        model="primary-model",
+        messages=[{"role": "user", "content": "What is RAG?"}],
+    )
+    return response.choices[0].message.content
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    primary, secondary = StubLLM("primary", latency=0.01), StubLLM("secondary")
+    transport = HedgingTransport(_provider(primary, "primary-model"), _provider(secondary, "gpt-4o"), default_delay=0.5, min_delay=0.05)
+
+    assert await _ask(_client(transport)) == "answer from primary"
+    assert secondary.requests == []
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled():
+    primary, secondary = StubLLM("primary", latency=2.0), StubLLM("secondary", latency=0.01)
+    transport = HedgingTransport(_provider(primary, "primary-model"), _provider(secondary, "gpt-4o"), default_delay=0.1, min_delay=0.05)
+
+    assert await _ask(_client(transport)) == "answer from secondary"
+    # The hedge is re-targeted at the secondary's model and credentials
+    assert secondary.requests == [{"model": "gpt-4o", "auth": "Bearer key-secondary"}]
+    await asyncio.sleep(0)
+    assert primary.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_tracks_observed_p95():
+    primary = _provider(StubLLM("primary"), "primary-model")
+    transport = HedgingTransport(primary, _provider(StubLLM("secondary"), "gpt-4o"), default_delay=5.0, min_delay=0.01)
+
+    assert transport.hedge_delay(primary) == 5.0
+    for latency in [0.1] * 95 + [0.4] * 5:
+        primary.latencies.append(latency)
+    assert transport.hedge_delay(primary) == 0.4
+
+
+@pytest.mark.asyncio
+async def test_errors_fail_over_and_trip_the_breaker():
+    primary, secondary = StubLLM("primary", status=500), StubLLM("secondary")
+    primary_provider = _provider(primary, "primary-model", threshold=2)
+    transport = HedgingTransport(primary_provider, _provider(secondary, "gpt-4o"), default_delay=5.0)
+    client = _client(transport)
+
+    for _ in range(2):
+        assert await _ask(client) == "answer from secondary"
+    assert primary_provider.breaker.state == CircuitBreaker.OPEN
+
+    # With the circuit open the primary is skipped entirely
+    assert await _ask(client) == "answer from secondary"
+    assert len(primary.requests) == 2
+    assert len(secondary.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_both_failing_returns_upstream_error():
+    transport = HedgingTransport(
+        _provider(StubLLM("primary", status=503), "primary-model"),
+        _provider(StubLLM("secondary", status=502), "gpt-4o"),
+        default_delay=5.0,
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post(
+            "http://primary.test/v1/chat/completions",
+            content=json.dumps({"model": "primary-model", "messages": []}),
+        )
+    assert response.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_fast_client_error_from_hedge_does_not_win():
+    primary, secondary = StubLLM("primary", latency=0.5), StubLLM("secondary", status=400)
+    secondary_provider = _provider(secondary, "gpt-4o")
+    transport = HedgingTransport(_provider(primary, "primary-model"), secondary_provider, default_delay=0.05, min_delay=0.01)
+
+    assert await _ask(_client(transport)) == "answer from primary"
+    assert len(secondary.requests) == 1
+    # A 4xx is not held against the provider's circuit
+    assert secondary_provider.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_client_error_from_primary_alone_is_returned():
+    primary, secondary = StubLLM("primary", status=400), StubLLM("secondary")
+    transport = HedgingTransport(_provider(primary, "primary-model"), _provider(secondary, "gpt-4o"), default_delay=5.0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post(
+            "http://primary.test/v1/chat/completions",
+            content=json.dumps({"model": "primary-model", "messages": []}),
+        )
+    assert response.status_code == 400
+    assert secondary.requests == []
+
+
+@pytest.mark.asyncio
+async def test_cache_control_is_stripped_for_providers_without_it():
+    primary, secondary = StubLLM("primary", latency=2.0), StubLLM("secondary")
+    transport = HedgingTransport(
+        _provider(primary, "anthropic/claude-3.5-sonnet", accepts_cache_control=True),
+        _provider(secondary, "gpt-4o"),
+        default_delay=0.05,
+        min_delay=0.01,
+    )
+    system = [{"type": "text", "text": "Static instructions", "cache_control": {"type": "ephemeral"}}]
+    response = await _client(transport).chat.completions.create(
+        model="anthropic/claude-3.5-sonnet",
+        messages=[{"role": "system", "content": system}, {"role": "user", "content": "What is RAG?"}],
+    )
+
+    assert response.choices[0].message.content == "answer from secondary"
+    assert primary.bodies[0]["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert secondary.bodies[0]["messages"][0]["content"] == [{"type": "text", "text": "Static instructions"}]
@@ -0,0 +1,52 @@
+"""
+Tests for the Prometheus /metrics endpoint and HTTP instrumentation.
+"""
+import httpx
+import pytest
+
+from app.core.metrics import metrics, render_prometheus, upstream_call
+from app.main import app
+
+
+def test_render_prometheus_histogram_is_cumulative():
+    metrics.reset()
+    metrics.inc("widgets_total", 2, kind='a"b')
+    metrics.observe("op_seconds", 0.02, buckets=(0.01, 0.1), route="/x")
+    metrics.observe("op_seconds", 5.0, buckets=(0.01, 0.1), route="/x")
+
+    text = render_prometheus(metrics.snapshot())
+    assert "# TYPE widgets_total counter" in text
+    assert 'widgets_total{kind="a\\"b"} 2' in text
+    assert 'op_seconds_bucket{route="/x",le="0.01"} 0' in text
+    assert 'op_seconds_bucket{route="/x",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{route="/x",le="+Inf"} 2' in text
+    assert 'op_seconds_count{route="/x"} 2' in text
+
+
+def test_upstream_call_records_errors():
+    metrics.reset()
+    with pytest.raises(RuntimeError):
+        with upstream_call("qdrant_search", "RAGService"):
+            raise RuntimeError("down")
+
+    series = metrics.snapshot()["histograms"]["upstream_request_seconds"]
+    assert (("outcome", "error"), ("service", "RAGService"), ("upstream", "qdrant_search")) in series
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_templates(monkeypatch):
+    metrics.reset()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/health")).status_code == 200
+        await client.get("/api/content/chapter/chapter-1")
+
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'route="/health"' in response.text
+        assert 'route="/api/content/chapter/{chapter_id}"' in response.text
+        assert "http_requests_inflight" in response.text
+
+        monkeypatch.setattr("app.main.settings.METRICS_TOKEN", "s3cret")
+        assert (await client.get("/metrics")).status_code == 401
+        assert (await client.get("/metrics", headers={"Authorization": "Bearer s3cret"})).status_code == 200
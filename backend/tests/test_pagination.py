@@ -0,0 +1,88 @@
+"""
+Tests for keyset pagination of chat sessions and messages.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.models.chat import ChatMessage, ChatSession, MessageRole
+from app.models.user import User
+
+START = datetime(2024, 1, 1)
+
+
+@pytest_asyncio.fixture
+async def current_user(session_maker):
+    async with session_maker() as db:
+        user = User(id="u1", email="a@example.com", hashed_password="x")
+        db.add(user)
+        db.add(User(id="u2", email="b@example.com", hashed_password="x"))
+        for i in range(25):
+            # Pairs of sessions share updated_at so ties must be broken by id
+            db.add(ChatSession(
+                id=f"s{i:02d}", user_id="u1", title=f"t{i}",
+                updated_at=START + timedelta(minutes=i // 2),
+                message_count=120 if i == 0 else 0,
+            ))
+        db.add(ChatSession(id="other", user_id="u2", updated_at=START))
+        for i in range(120):
+            db.add(ChatMessage(
+                id=f"m{i:03d}",
+                session_id="s00",
+                role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                content=f"message {i}",
+                created_at=START + timedelta(seconds=i // 3),
+            ))
+        await db.commit()
+    return user
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(START, "abc")
+    assert decode_cursor(cursor) == (START, "abc")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_sessions_page_by_updated_at_and_id(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/chat/sessions", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(page["sessions"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    ids = [s["id"] for s in seen]
+    assert ids == sorted(ids, reverse=True)  # ids follow updated_at here
+    assert len(ids) == 25 and "other" not in ids
+    assert seen[-1]["message_count"] == 120
+
+
+@pytest.mark.asyncio
+async def test_messages_page_backwards_from_session(client):
+    response = await client.get("/api/chat/sessions/s00", params={"limit": 50})
+    detail = response.json()
+    assert [m["id"] for m in detail["messages"]] == [f"m{i:03d}" for i in range(70, 120)]
+
+    collected, cursor = detail["messages"], detail["next_cursor"]
+    while cursor:
+        page = (await client.get("/api/chat/sessions/s00/messages", params={"limit": 30, "cursor": cursor})).json()
+        collected = page["messages"] + collected
+        cursor = page["next_cursor"]
+
+    assert [m["id"] for m in collected] == [f"m{i:03d}" for i in range(120)]
+
+
+@pytest.mark.asyncio
+async def test_bad_cursor_and_foreign_session(client):
+    response = await client.get("/api/chat/sessions", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    response = await client.get("/api/chat/sessions/other/messages")
+    assert response.status_code == 404
@@ -0,0 +1,64 @@
+"""
+Tests for the password hashing pool.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.metrics import metrics
+from app.core.security import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip_off_the_event_loop():
+    hasher = PasswordHasher(workers=2, max_queue=4)
+    try:
+        hashed = await hasher.hash("correct horse")
+        assert await hasher.verify("correct horse", hashed)
+        assert not await hasher.verify("wrong horse", hashed)
+
+        # The loop keeps ticking while bcrypt runs
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(hasher.verify("correct horse", hashed) for _ in range(4)))
+        task.cancel()
+        assert ticks > 3
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    metrics.reset()
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+        return "done"
+
+    try:
+        running = asyncio.create_task(hasher._run("hash", blocking))
+        waiting = asyncio.create_task(hasher._run("hash", blocking))
+        await asyncio.sleep(0)
+        assert hasher.pending == 2
+        assert metrics.snapshot()["gauges"]["password_hash_queue_depth"][()] == 1
+
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("x")
+
+        release.set()
+        assert await asyncio.gather(running, waiting) == ["done", "done"]
+        assert hasher.pending == 0
+        assert metrics.snapshot()["counters"]["password_hash_rejected_total"][(("operation", "hash"),)] == 1
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -0,0 +1,98 @@
+"""
+Tests for cache-friendly prompt layout and prompt-cache telemetry.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+from agents.models.chatcmpl_converter import Converter
+
+from app.agents.book_agent import book_assistant_instructions, get_book_assistant
+from app.agents.prompt_cache import PromptCacheClient
+from app.core.metrics import completion_usage, metrics, record_llm_usage
+from app.core.token_budget import count_tokens
+from app.services.rag_service import RAGService, RAG_SYSTEM_PROMPT
+
+
+def test_rag_system_prompt_is_identical_across_requests():
+    service = RAGService()
+    service.model = "openai/gpt-4o"
+
+    first = service._build_system_prompt()
+    second = service._build_system_prompt()
+    assert first == second == RAG_SYSTEM_PROMPT
+
+    user_prompt = service._build_user_prompt(
+        "What is RAG?",
+        "[1] Retrieval-augmented generation...",
+        {"experience_level": "advanced", "known_languages": ["Python"]},
+    )
+    assert "advanced" in user_prompt
+    assert user_prompt.endswith("Question: What is RAG?")
+    assert "advanced" not in RAG_SYSTEM_PROMPT
+
+
+def test_anthropic_models_get_cache_breakpoint():
+    service = RAGService()
+    service.model = "anthropic/claude-3.5-sonnet"
+
+    prompt = service._build_system_prompt()
+    assert prompt[0]["text"] == RAG_SYSTEM_PROMPT
+    assert prompt[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_cached_tokens_are_recorded():
+    metrics.reset()
+    response = SimpleNamespace(usage=SimpleNamespace(
+        prompt_tokens=1200,
+        completion_tokens=80,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    ))
+
+    usage = completion_usage(response)
+    record_llm_usage("RAGService", usage)
+
+    counters = metrics.snapshot()["counters"]
+    key = (("service", "RAGService"),)
+    assert usage["cached_tokens"] == 1024
+    assert counters["llm_cached_prompt_tokens_total"][key] == 1024
+    assert counters["llm_prompt_cache_requests_total"][(("result", "hit"), ("service", "RAGService"))] == 1
+
+
+def _agent_static_prefix(agent) -> bytes:
+    """What precedes the per-session messages: tool schemas and the system instructions."""
+    tools = [Converter.tool_to_openai(tool) for tool in agent.tools]
+    return json.dumps({"tools": tools, "system": agent.instructions}, ensure_ascii=False).encode()
+
+
+def test_agent_static_prefix_is_identical_across_requests():
+    first = get_book_assistant()
+    second = get_book_assistant()
+
+    assert _agent_static_prefix(first) == _agent_static_prefix(second)
+    # Long enough for the providers' 1024-token minimum cacheable prefix
+    assert count_tokens(_agent_static_prefix(first).decode()) > 1024
+
+
+@pytest.mark.asyncio
+async def test_agent_cache_breakpoint_ends_the_static_prefix():
+    sent = []
+
+    class Completions:
+        async def create(self, **kwargs):
+            sent.append(kwargs)
+
+    client = PromptCacheClient(SimpleNamespace(chat=SimpleNamespace(completions=Completions())))
+    instructions = book_assistant_instructions()
+    messages = [
+        {"role": "system", "content": instructions},
+        {"role": "system", "content": "Summary of the earlier conversation:\n..."},
+        {"role": "user", "content": "What is RAG?"},
+    ]
+    await client.chat.completions.create(model="anthropic/claude-3.5-sonnet", messages=messages)
+
+    system = sent[0]["messages"][0]["content"]
+    assert system == [{"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}}]
+    # Per-session messages stay after the breakpoint, untouched
+    assert sent[0]["messages"][1:] == messages[1:]
+    assert messages[0]["content"] == instructions
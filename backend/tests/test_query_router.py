@@ -0,0 +1,45 @@
+"""
+Tests for the chat query router.
+"""
+import pytest
+
+from app.agents.router import classify_query, AGENT_ROUTE, RAG_ROUTE
+from app.core.config import settings
+
+
+@pytest.mark.parametrize("query", [
+    "What is RAG?",
+    "What are embeddings",
+    "Define tokenization",
+    "What does CRAFT stand for?",
+    "Regarding this text: \"Transformers use attention.\"\n\nWhat is attention?",
+])
+def test_simple_lookups_take_fast_path(query):
+    assert classify_query(query) == RAG_ROUTE
+
+
+@pytest.mark.parametrize("query", [
+    "Give me a learning path for AI agents",
+    "Compare RAG and fine-tuning",
+    "What is the difference between RAG and fine-tuning?",
+    "List all chapters",
+    "Write a Python function that calls the OpenAI API",
+    "What is RAG? How do I build one?",
+    "How should I approach studying this book if I only have weekends free and know some JavaScript already but no Python at all yet",
+])
+def test_complex_requests_use_agent(query):
+    assert classify_query(query) == AGENT_ROUTE
+
+
+def test_follow_up_with_history_uses_agent():
+    history = [
+        {"role": "user", "content": "What is RAG?"},
+        {"role": "assistant", "content": "RAG is retrieval-augmented generation."},
+    ]
+    assert classify_query("What is it used for?", history) == AGENT_ROUTE
+    assert classify_query("What is it used for?") == RAG_ROUTE
+
+
+def test_router_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_ROUTER_ENABLED", False)
+    assert classify_query("What is RAG?") == AGENT_ROUTE
@@ -0,0 +1,70 @@
+"""
+Tests for the token bucket rate limiter.
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.rate_limit import MemoryBucketBackend, RateLimitMiddleware, client_key
+from app.core.security import create_access_token
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.rate_limit.time.monotonic", lambda: now[0])
+    backend = MemoryBucketBackend()
+
+    assert await backend.take("k", 2, capacity=4, rate=1) == 0
+    assert await backend.take("k", 2, capacity=4, rate=1) == 0
+    assert await backend.take("k", 2, capacity=4, rate=1) == pytest.approx(2.0)
+    assert await backend.take("other", 2, capacity=4, rate=1) == 0
+
+    now[0] += 1.5
+    assert await backend.take("k", 1, capacity=4, rate=1) == 0
+    assert await backend.take("k", 1, capacity=4, rate=1) == pytest.approx(0.5)
+
+
+def test_client_key_prefers_the_signed_in_user():
+    token = create_access_token({"sub": "u1"})
+    with_cookie = {"headers": [(b"cookie", f"theme=dark; access_token={token}".encode())], "client": ("10.0.0.1", 1)}
+    assert client_key(with_cookie) == "user:u1"
+    assert client_key({"headers": [(b"cookie", b"access_token=garbage")], "client": ("10.0.0.1", 1)}) == "ip:10.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_before_the_handler(monkeypatch):
+    monkeypatch.setattr("app.core.rate_limit.settings.RATE_LIMIT_BURST", 3.0)
+    monkeypatch.setattr("app.core.rate_limit.settings.RATE_LIMIT_REFILL_PER_SECOND", 0.01)
+    calls = []
+    app = FastAPI()
+
+    @app.post("/api/content/translate")
+    async def translate():
+        calls.append(1)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, backend=MemoryBucketBackend())
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.post("/api/content/translate")).status_code == 200
+        limited = await client.post("/api/content/translate")
+        assert limited.status_code == 429
+        assert limited.headers["retry-after"] == "100"
+        assert len(calls) == 1
+
+        # Unlisted routes are never limited
+        for _ in range(5):
+            assert (await client.get("/health")).status_code == 200
+
+
+def test_templated_route_costs():
+    middleware = RateLimitMiddleware(None, backend=MemoryBucketBackend())
+
+    assert middleware.route_cost("GET", "/api/content/translate/chapter-1") == (2.0, "/api/content/translate/{chapter_id}")
+    assert middleware.route_cost("POST", "/api/content/translate") == (2.0, "/api/content/translate")
+    assert middleware.route_cost("GET", "/api/content/translate/chapter-1/extra")[0] is None
+    assert middleware.route_cost("GET", "/api/content/chapter/chapter-1")[0] is None
@@ -0,0 +1,72 @@
+"""
+Tests for the request-scoped Server-Timing breakdown.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.core.metrics import upstream_call
+from app.core.timing import ServerTimingMiddleware, current_timing, record_span, span
+from app.infrastructure.database import instrument_statements
+
+
+def _parse(header: str) -> dict:
+    spans = {}
+    for part in header.split(", "):
+        name, *params = part.split(";")
+        spans[name] = dict(p.split("=", 1) for p in params)
+    return spans
+
+
+async def _app(scope, receive, send):
+    with upstream_call("cohere_embed", "RAGService"):
+        await asyncio.sleep(0.01)
+    # Sync agent tools run in worker threads and still land in the request
+    await asyncio.to_thread(record_span, "tool_search_book", 0.02)
+    await asyncio.to_thread(record_span, "tool_search_book", 0.03)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.mark.asyncio
+async def test_header_and_log_line_for_timed_paths(capsys):
+    transport = httpx.ASGITransport(app=ServerTimingMiddleware(_app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/chat/query")
+        untimed = await client.get("/health")
+
+    spans = _parse(response.headers["server-timing"])
+    assert float(spans["cohere_embed"]["dur"]) >= 10
+    assert spans["tool_search_book"] == {"desc": '"2x"', "dur": "50.0"}
+    assert "total" in spans
+    assert "server-timing" not in untimed.headers
+
+    line = json.loads([l for l in capsys.readouterr().out.splitlines() if "request_timing" in l][0])
+    assert line["path"] == "/api/chat/query" and line["status"] == 200
+    assert line["spans"]["tool_search_book"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_db_statements_are_timed_only_inside_requests(session_maker):
+    assert current_timing() is None
+    with span("anything"):
+        record_span("db", 1.0)
+
+    # DB statements feed the "db" span only while a request is being timed
+    instrument_statements(session_maker.kw["bind"])
+    recorded = {}
+
+    async def handler(scope, receive, send):
+        async with session_maker() as db:
+            await db.execute(text("SELECT 1"))
+        recorded.update(current_timing().spans())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    transport = httpx.ASGITransport(app=ServerTimingMiddleware(handler))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/content/chapter/chapter-1")
+    assert recorded["db"][1] == 1
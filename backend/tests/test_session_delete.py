@@ -0,0 +1,68 @@
+"""
+Tests for set-based chat session deletes.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+
+from app.models.chat import ChatMessage, ChatSession, MessageRole
+from app.models.user import User
+
+START = datetime(2024, 1, 1)
+
+
+@pytest_asyncio.fixture
+async def current_user(session_maker):
+    async with session_maker() as db:
+        user = User(id="u1", email="a@example.com", hashed_password="x")
+        db.add(user)
+        db.add(User(id="u2", email="b@example.com", hashed_password="x"))
+        for session_id, owner in [("s1", "u1"), ("s2", "u1"), ("s3", "u1"), ("theirs", "u2")]:
+            db.add(ChatSession(id=session_id, user_id=owner))
+            for i in range(200):
+                db.add(ChatMessage(
+                    session_id=session_id,
+                    role=MessageRole.USER,
+                    content=f"{session_id}-{i}",
+                    created_at=START + timedelta(seconds=i),
+                ))
+        await db.commit()
+    return user
+
+
+async def _remaining(session_maker):
+    async with session_maker() as db:
+        sessions = set((await db.execute(select(ChatSession.id))).scalars())
+        messages = await db.scalar(select(func.count()).select_from(ChatMessage))
+    return sessions, messages
+
+
+@pytest.mark.asyncio
+async def test_delete_session_is_one_statement(client, session_maker):
+    statements = []
+    engine = session_maker.kw["bind"].sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = await client.delete("/api/chat/sessions/s1")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    # No SELECT of the session or its messages, no per-row DELETEs
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("DELETE FROM CHAT_SESSIONS")
+    assert await _remaining(session_maker) == ({"s2", "s3", "theirs"}, 600)
+
+    assert (await client.delete("/api/chat/sessions/s1")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_only_touches_own_sessions(client, session_maker):
+    response = await client.post("/api/chat/sessions/delete", json={"session_ids": ["s2", "s3", "theirs", "missing"]})
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 2
+    assert await _remaining(session_maker) == ({"s1", "theirs"}, 400)
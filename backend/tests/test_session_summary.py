@@ -0,0 +1,93 @@
+"""
+Tests for rolling conversation summaries.
+"""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from sqlalchemy import select
+
+from app.models.chat import ChatMessage, ChatSession, MessageRole
+from app.models.user import User
+from app.services.chat_history_service import chat_history_service
+from app.services.summary_service import SummaryService
+from benchmarks.stubs import create_stub_llm_app
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def service():
+    stub = create_stub_llm_app(latency=0, tokens_per_second=1e6, completion_tokens=40)
+    service = SummaryService()
+    service.client = AsyncOpenAI(
+        api_key="k",
+        base_url="http://stub/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)),
+    )
+    service.stub = stub
+    return service
+
+
+async def _seed(session_maker, messages: int):
+    async with session_maker() as db:
+        db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+        db.add(ChatSession(id="s1", user_id="u1", updated_at=START))
+        for i in range(messages):
+            role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+            db.add(ChatMessage(session_id="s1", role=role, content=f"m{i}", created_at=START + timedelta(seconds=i)))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_short_sessions_are_left_alone(session_maker, service):
+    await _seed(session_maker, 12)
+
+    assert await service.compact_session("s1", session_maker) is False
+    assert service.stub.state.stats["requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_older_turns_are_folded_into_summary(session_maker, service):
+    await _seed(session_maker, 30)
+
+    assert await service.compact_session("s1", session_maker) is True
+
+    async with session_maker() as db:
+        session = (await db.execute(select(ChatSession).where(ChatSession.id == "s1"))).scalar_one()
+        assert session.summary
+        # Everything but the recent window (10 messages) is summarized
+        assert session.summarized_until == START + timedelta(seconds=19)
+        assert session.updated_at == START
+
+        history = await chat_history_service.recent_messages(db, "s1", after=session.summarized_until)
+        assert [m["content"] for m in history] == [f"m{i}" for i in range(20, 30)]
+
+    # Nothing new to fold until the session grows again
+    assert await service.compact_session("s1", session_maker) is False
+    assert service.stub.state.stats["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_history_covers_everything_after_the_summary(session_maker, service):
+    await _seed(session_maker, 30)
+    assert await service.compact_session("s1", session_maker) is True
+
+    # Five more turns: still short of the trigger, so no compaction is scheduled
+    async with session_maker() as db:
+        for i in range(30, 40):
+            role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+            db.add(ChatMessage(session_id="s1", role=role, content=f"m{i}", created_at=START + timedelta(seconds=i)))
+        await db.commit()
+
+        session = (await db.execute(select(ChatSession).where(ChatSession.id == "s1"))).scalar_one()
+        history = await chat_history_service.recent_messages(
+            db, "s1", limit=service.history_limit(), after=session.summarized_until
+        )
+
+    # Summary ends at m19 and the history starts at m20: no gap between them
+    assert [m["content"] for m in history] == [f"m{i}" for i in range(20, 40)]
+    assert not service.needs_compaction(len(history))
+    # The next turn (two more messages) schedules one
+    assert service.needs_compaction(len(history) + 2)
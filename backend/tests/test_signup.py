@@ -0,0 +1,66 @@
+"""
+Tests for single-statement signup.
+"""
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
+from app.api.routes import auth
+from app.models.user import User, UserProfile
+
+
+@pytest.mark.asyncio
+async def test_signup_inserts_user_and_profile_without_reads(client, session_maker):
+    statements = []
+    engine = session_maker.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+
+    response = await client.post("/api/auth/signup", json={
+        "email": "new@example.com", "password": "password-123", "name": "New",
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["email"] == "new@example.com"
+    assert body["profile"]["experience_level"] == "beginner"
+    assert body["profile"]["known_languages"] == []
+    assert not [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+    async with session_maker() as db:
+        profile = (await db.execute(select(UserProfile).where(UserProfile.user_id == body["id"]))).scalar_one()
+        assert profile.hardware_tier.value == "medium"
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_is_rejected_by_the_constraint(client, session_maker):
+    credentials = {"email": "dup@example.com", "password": "password-123"}
+    assert (await client.post("/api/auth/signup", json=credentials)).status_code == 200
+
+    response = await client.post("/api/auth/signup", json=credentials)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+    async with session_maker() as db:
+        users = (await db.execute(select(User).where(User.email == "dup@example.com"))).scalars().all()
+        assert len(users) == 1
+
+
+@pytest.mark.asyncio
+async def test_postgres_signup_is_one_statement():
+    executed = []
+
+    class FakeSession:
+        bind = type("Bind", (), {"dialect": postgresql.asyncpg.dialect()})()
+
+        async def execute(self, statement):
+            executed.append(statement)
+            return type("Result", (), {"scalar_one": lambda self: "u1"})()
+
+    user = User(id="u1", email="a@example.com", hashed_password="h", name=None)
+    user.profile = UserProfile(id="p1", user_id="u1", known_languages=[], goals=[])
+    await auth._insert_user_with_profile(FakeSession(), user)
+
+    assert len(executed) == 1
+    sql = str(executed[0].compile(dialect=postgresql.asyncpg.dialect()))
+    assert sql.startswith("WITH new_user AS")
+    assert "INSERT INTO users" in sql and "INSERT INTO user_profiles" in sql
+    assert "FROM new_user RETURNING" in sql
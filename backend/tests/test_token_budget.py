@@ -0,0 +1,64 @@
+"""
+Tests for prompt token budget allocation.
+"""
+from app.core.token_budget import TokenBudget, count_tokens, truncate_to_tokens
+
+SHARES = {"history": 0.3, "selected_text": 0.2, "retrieved": 0.5}
+
+
+def _chunk(tokens: int, label: str = "x") -> str:
+    return label * (tokens * 4)
+
+
+def test_count_and_truncate():
+    assert count_tokens("") == 0
+    assert count_tokens("abcd" * 10) == 10
+    assert count_tokens(truncate_to_tokens("a" * 1000, 50)) <= 50
+    assert truncate_to_tokens("short", 50) == "short"
+
+
+def test_lowest_scoring_chunks_are_dropped_first():
+    budget = TokenBudget(total_tokens=100, shares=SHARES)
+    allocation = budget.allocate(retrieved=[
+        (_chunk(40, "a"), 0.9, "a"),
+        (_chunk(40, "b"), 0.2, "b"),
+        (_chunk(40, "c"), 0.7, "c"),
+    ])
+
+    assert [item.payload for item in allocation.retrieved] == ["a", "c"]
+    assert allocation.dropped == 1
+    assert allocation.tokens_used <= 100
+
+
+def test_unused_shares_flow_to_other_sections():
+    budget = TokenBudget(total_tokens=100, shares=SHARES)
+    history = [{"role": "user", "content": _chunk(20)} for _ in range(4)]
+
+    allocation = budget.allocate(history=history)
+
+    # History share is 30 tokens, but with nothing else to fit it gets the rest
+    assert len(allocation.history) == 4
+
+
+def test_recent_history_outranks_older_history():
+    budget = TokenBudget(total_tokens=100, shares=SHARES)
+    history = [{"role": "user", "content": _chunk(20, str(i))} for i in range(6)]
+    allocation = budget.allocate(
+        history=history,
+        selected_text=_chunk(20),
+        retrieved=[(_chunk(50), 0.8, None)],
+    )
+
+    kept = [item.position for item in allocation.history]
+    assert kept == sorted(kept)
+    assert kept[-1] == 5
+    assert 0 not in kept
+    assert allocation.tokens_used <= 100
+
+
+def test_oversized_selected_text_is_truncated_not_dropped():
+    budget = TokenBudget(total_tokens=100, shares=SHARES)
+    allocation = budget.allocate(selected_text=_chunk(500))
+
+    assert allocation.selected_text
+    assert count_tokens(allocation.selected_text) <= 20
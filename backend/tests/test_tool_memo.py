@@ -0,0 +1,66 @@
+"""
+Tests for run-scoped tool result memoization.
+"""
+import json
+
+import pytest
+from agents.tool_context import ToolContext
+
+from app.agents import tools
+from app.agents.context import BookAgentContext, ToolMemo
+
+
+def test_memo_normalizes_string_arguments():
+    memo = ToolMemo()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "result"
+
+    assert memo.get_or_compute("search_book", {"query": "What is RAG"}, compute) == "result"
+    assert memo.get_or_compute("search_book", {"query": "  what   is rag "}, compute, call_id="c2") == "result"
+    assert len(calls) == 1
+    assert memo.hits == 1
+    assert memo.misses == 1
+    assert memo.hits_by_call == {"c2": 1}
+
+
+async def _invoke(tool, run_context, call_id, args):
+    ctx = ToolContext(
+        context=run_context,
+        tool_name=tool.name,
+        tool_call_id=call_id,
+        tool_arguments=json.dumps(args),
+    )
+    return await tool.on_invoke_tool(ctx, json.dumps(args))
+
+
+@pytest.mark.asyncio
+async def test_nested_search_reuses_direct_search(monkeypatch):
+    searches = []
+
+    def fake_search(query, chapter_filter, context_window):
+        searches.append(query)
+        return f"hits for {query}"
+
+    monkeypatch.setattr(tools, "_search_book", fake_search)
+    run_context = BookAgentContext()
+
+    await _invoke(tools.search_book, run_context, "call_1", {"query": "Embeddings"})
+    explanation = await _invoke(tools.explain_concept, run_context, "call_2", {"concept": "embeddings"})
+
+    assert searches == ["Embeddings"]
+    assert "hits for Embeddings" in explanation
+    assert run_context.memo.hits_by_call == {"call_2": 1}
+
+
+@pytest.mark.asyncio
+async def test_separate_runs_do_not_share_results(monkeypatch):
+    searches = []
+    monkeypatch.setattr(tools, "_search_book", lambda q, c, w: searches.append(q) or "hits")
+
+    await _invoke(tools.search_book, BookAgentContext(), "call_1", {"query": "RAG"})
+    await _invoke(tools.search_book, BookAgentContext(), "call_1", {"query": "RAG"})
+
+    assert len(searches) == 2
@@ -0,0 +1,80 @@
+"""
+Tests for the authenticated-user cache.
+"""
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.core.deps import get_current_user
+from app.core.security import create_access_token
+from app.core.user_cache import UserCache, invalidate_user, user_cache
+from app.models.user import ExperienceLevel, User, UserProfile
+
+
+def _user() -> User:
+    user = User(id="u1", email="a@example.com", hashed_password="secret-hash", name="A")
+    user.profile = UserProfile(id="p1", user_id="u1", experience_level=ExperienceLevel.ADVANCED, known_languages=["Python"])
+    return user
+
+
+def test_hit_returns_detached_copy_with_profile():
+    cache = UserCache(ttl_seconds=60, max_users=10)
+    cache.set("u1", "token-a", _user())
+
+    first, second = cache.get("u1", "token-a"), cache.get("u1", "token-a")
+    assert first is not second
+    assert first.email == "a@example.com"
+    assert first.profile.experience_level == ExperienceLevel.ADVANCED
+    assert first.profile.known_languages == ["Python"]
+    assert first.hashed_password is None
+    assert cache.get("u1", "token-b") is None
+
+
+def test_expiry_invalidation_and_lru():
+    cache = UserCache(ttl_seconds=0.05, max_users=2)
+    cache.set("u1", "t", _user())
+    time.sleep(0.06)
+    assert cache.get("u1", "t") is None
+
+    cache.ttl_seconds = 60
+    cache.set("u1", "t", _user())
+    cache.invalidate("u1")
+    assert cache.get("u1", "t") is None
+
+    for user_id in ("u1", "u2", "u3"):
+        cache.set(user_id, "t", _user())
+    assert cache.get("u1", "t") is None  # Least recently used user evicted
+    assert cache.get("u3", "t") is not None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_skips_db_on_hit(session_maker):
+    user_cache.clear()
+    async with session_maker() as db:
+        db.add(User(id="u1", email="a@example.com", hashed_password="x"))
+        db.add(UserProfile(user_id="u1"))
+        await db.commit()
+
+    token = create_access_token({"sub": "u1"})
+    statements = []
+    engine = session_maker.kw["bind"].sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        async with session_maker() as db:
+            assert (await get_current_user(db, token)).id == "u1"
+        queries_on_miss = len(statements)
+
+        async with session_maker() as db:
+            cached = await get_current_user(db, token)
+        assert cached.profile is not None
+        assert len(statements) == queries_on_miss  # No new round trips
+
+        await invalidate_user("u1")
+        async with session_maker() as db:
+            await get_current_user(db, token)
+        assert len(statements) > queries_on_miss
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+        user_cache.clear()
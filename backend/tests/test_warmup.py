@@ -0,0 +1,67 @@
+"""
+Tests for the startup warm-up and the readiness endpoint.
+"""
+import httpx
+import pytest
+
+from app.core import warmup
+from app.core.warmup import WarmupState, run_warmup, warm_db_pool
+from app.infrastructure.database import POOLED_MODE, build_engine
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_ready_only_once_warm_and_probe_passes(monkeypatch):
+    monkeypatch.setattr(warmup.settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(warmup.settings, "WARMUP_PROBE_RETRY_SECONDS", 0)
+    state = WarmupState()
+    monkeypatch.setattr("app.main.warmup_state", state)
+
+    async def ok():
+        return "warmed"
+
+    async def broken():
+        raise ConnectionError("qdrant unreachable")
+
+    probes = []
+
+    async def flaky_probe():
+        probes.append(1)
+        if len(probes) == 1:
+            raise ConnectionError("db not up yet")
+
+    monkeypatch.setattr(warmup, "WARMUP_STEPS", [("ok", ok), ("broken", broken)])
+    monkeypatch.setattr(warmup, "health_probe", flaky_probe)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/ready")).status_code == 503
+        assert (await client.get("/health")).status_code == 200
+
+        await run_warmup(state)
+        ready = await client.get("/ready")
+
+    assert ready.status_code == 200
+    body = ready.json()
+    assert body["status"] == "ready"
+    # A failed step is reported but only the health probe gates readiness
+    assert body["steps"]["ok"]["detail"] == "warmed"
+    assert body["steps"]["broken"]["ok"] is False
+    assert body["steps"]["broken"]["error"] == "ConnectionError: qdrant unreachable"
+    assert len(probes) == 2
+
+
+@pytest.mark.asyncio
+async def test_db_warmup_fills_the_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(warmup.settings, "DB_ENGINE_MODE", POOLED_MODE)
+    monkeypatch.setattr(warmup.settings, "DB_POOL_SIZE", 3)
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}", POOLED_MODE)
+    monkeypatch.setattr(warmup, "get_engine", lambda: engine)
+
+    assert await warm_db_pool() == "3 connections"
+    assert engine.sync_engine.pool.checkedin() == 3
+    await engine.dispose()
+
+
+def test_readiness_without_warmup(monkeypatch):
+    monkeypatch.setattr(warmup.settings, "WARMUP_ENABLED", False)
+    assert WarmupState().ready
@@ -42,22 +42,21 @@ export default function ChapterActions({ chapterId }: ChapterActionsProps): JSX.
   };
 
   const handleTranslate = async () => {
+    // Switching back shows the original chapter; no request needed
+    if (isUrdu) {
+      setIsUrdu(false);
+      return;
+    }
+
     setIsTranslating(true);
     try {
-      const response = await fetch(`${getApiBaseUrl()}/api/content/translate`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        credentials: 'include',
-        body: JSON.stringify({
-          chapter_id: chapterId,
-          target_language: isUrdu ? 'en' : 'ur'
-        }),
-      });
+      // Shared, cacheable GET: repeats are served by the browser/CDN cache or revalidated with the ETag
+      const response = await fetch(
+        `${getApiBaseUrl()}/api/content/translate/${encodeURIComponent(chapterId)}?target_language=ur`
+      );
 
       if (response.ok) {
-        setIsUrdu(!isUrdu);
+        setIsUrdu(true);
         // In a real implementation, this would update the page content
       }
     } catch (error) {
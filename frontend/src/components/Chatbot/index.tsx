@@ -53,13 +53,22 @@ export default function Chatbot(): JSX.Element {
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [selectedText, setSelectedText] = useState('');
+  // Cursor for the page of messages before the oldest one shown (null: nothing older)
+  const [olderCursor, setOlderCursor] = useState<string | null>(null);
+  const [isLoadingOlder, setIsLoadingOlder] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const keepScrollRef = useRef(false);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
 
   useEffect(() => {
+    // Prepending older messages must not jump to the bottom
+    if (keepScrollRef.current) {
+      keepScrollRef.current = false;
+      return;
+    }
     scrollToBottom();
   }, [messages]);
 
@@ -93,13 +102,20 @@ export default function Chatbot(): JSX.Element {
       });
       if (response.ok) {
         const data = await response.json();
-        setSessions(data);
+        setSessions(data.sessions);
       }
     } catch (error) {
       console.error('Failed to load sessions:', error);
     }
   };
 
+  const toMessages = (rows: any[]): Message[] => rows.map((m: any) => ({
+    role: m.role,
+    content: m.content,
+    model: m.model
+  }));
+
+  // The session endpoint returns only the latest page; older ones come from /messages
   const loadSession = async (sessionId: string) => {
     try {
       const response = await fetch(`${getApiBaseUrl()}/api/chat/sessions/${sessionId}`, {
@@ -108,11 +124,8 @@ export default function Chatbot(): JSX.Element {
       if (response.ok) {
         const data = await response.json();
         setCurrentSessionId(sessionId);
-        setMessages(data.messages.map((m: any) => ({
-          role: m.role,
-          content: m.content,
-          model: m.model
-        })));
+        setMessages(toMessages(data.messages));
+        setOlderCursor(data.next_cursor || null);
         setShowSidebar(false);
       }
     } catch (error) {
@@ -120,8 +133,30 @@ export default function Chatbot(): JSX.Element {
     }
   };
 
+  const loadOlderMessages = async () => {
+    if (!currentSessionId || !olderCursor) return;
+    setIsLoadingOlder(true);
+    try {
+      const response = await fetch(
+        `${getApiBaseUrl()}/api/chat/sessions/${currentSessionId}/messages?cursor=${encodeURIComponent(olderCursor)}`,
+        { credentials: 'include' }
+      );
+      if (response.ok) {
+        const data = await response.json();
+        keepScrollRef.current = true;
+        setMessages(prev => [...toMessages(data.messages), ...prev]);
+        setOlderCursor(data.next_cursor || null);
+      }
+    } catch (error) {
+      console.error('Failed to load older messages:', error);
+    } finally {
+      setIsLoadingOlder(false);
+    }
+  };
+
   const startNewChat = () => {
     setCurrentSessionId(null);
+    setOlderCursor(null);
     setMessages([{
       role: 'assistant',
       content: 'Hello! I\'m your AI learning assistant. Ask me anything about the book content!'
@@ -303,6 +338,15 @@ export default function Chatbot(): JSX.Element {
                 <button onClick={() => setShowAuth(true)}>Login / Sign Up</button>
               </div>
             )}
+            {olderCursor && (
+              <button
+                className={styles.loadOlderBtn}
+                onClick={loadOlderMessages}
+                disabled={isLoadingOlder}
+              >
+                {isLoadingOlder ? 'Loading...' : 'Load older messages'}
+              </button>
+            )}
             {messages.map((msg, idx) => (
               <div key={idx} className={`${styles.message} ${styles[msg.role]}`}>
                 <div className={styles.messageContent}>